@@ -0,0 +1,63 @@
+"""
+Cost of styling 1,000 status badges: per-label setStyleSheet (old) vs the app stylesheet
+plus a dynamic property (set_badge). Runs offscreen, no display needed.
+
+    python -m benchmarks.bench_badges
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget
+
+from utils.ui_helper import APP_STYLESHEET, set_badge
+
+ROWS = 1000
+
+# The literal CSS InventoryController used to apply per row
+OLD_STYLES = {
+    'out_of_stock': "background-color: #FEE2E2; color: #DC2626; border-radius: 12px; font-weight: bold;",
+    'low_stock': "background-color: #FEF3C7; color: #D97706; border-radius: 12px; font-weight: bold;",
+    'in_stock': "background-color: #ECFDF5; color: #059669; border-radius: 12px; font-weight: bold;",
+}
+STATES = list(OLD_STYLES)
+
+
+def make_rows(app):
+    page = QWidget()
+    layout = QVBoxLayout(page)
+    labels = []
+    for _ in range(ROWS):
+        label = QLabel("In Stock")
+        label.setObjectName('lbl_status')
+        layout.addWidget(label)
+        labels.append(label)
+    page.show()
+    app.processEvents()
+    return page, labels
+
+
+def run(app, apply):
+    page, labels = make_rows(app)
+    start = time.perf_counter()
+    for i, label in enumerate(labels):
+        apply(label, STATES[i % len(STATES)])
+    page.grab()  # force the polish + paint for every row
+    elapsed = time.perf_counter() - start
+    page.close()
+    return elapsed * 1000
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+
+    before = run(app, lambda label, state: label.setStyleSheet(OLD_STYLES[state]))
+
+    app.setStyleSheet(APP_STYLESHEET)
+    after = run(app, set_badge)
+
+    print(f"setStyleSheet per label : {before:8.1f} ms / {ROWS} rows")
+    print(f"set_badge (app sheet)   : {after:8.1f} ms / {ROWS} rows")
@@ -0,0 +1,65 @@
+"""
+Loading 100k SKUs into product objects: the old dict-backed classes built from dictionary
+cursor rows vs ProductRecord.from_row on plain tuple rows. Fake rows, no database needed.
+
+    python -m benchmarks.bench_products
+"""
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.entities import ProductRecord, PRODUCT_COLUMNS
+
+SKUS = 100_000
+
+
+class OldInventoryItem:
+    # the pre-ProductRecord entity, kept here for comparison
+    def __init__(self, id, name, category, stock, cost_price, selling_price, threshold, expiry_date=None):
+        self.id = id
+        self.name = name
+        self.category = category
+        self.stock = int(stock) if stock is not None else 0
+        self.cost_price = float(cost_price) if cost_price is not None else 0.0
+        self.selling_price = float(selling_price) if selling_price is not None else 0.0
+        self.threshold = int(threshold) if threshold is not None else 0
+        self.expiry_date = expiry_date
+
+
+def make_rows():
+    return [(i, f"Product {i:06d}", f"Category {i % 40}", i % 500, Decimal("12.50"), Decimal("19.99"),
+             10, date(2026, 1, 1 + i % 28), None, 0) for i in range(SKUS)]
+
+
+def load_old(rows):
+    # what a dictionary=True cursor hands back, then one keyword constructor per row
+    dict_rows = [dict(zip(PRODUCT_COLUMNS, row)) for row in rows]
+    return [OldInventoryItem(id=r['id'], name=r['name'], category=r['category'], stock=r['stock'],
+                             cost_price=r['cost_price'], selling_price=r['selling_price'],
+                             threshold=r['threshold'], expiry_date=r['expiry_date']) for r in dict_rows]
+
+
+def load_new(rows):
+    return [ProductRecord.from_row(row) for row in rows]
+
+
+def measure(loader, rows):
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = loader(rows)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1024 / 1024, len(items)
+
+
+if __name__ == "__main__":
+    rows = make_rows()
+    for label, loader in (("dict rows + dict-backed", load_old), ("tuple rows + __slots__", load_new)):
+        ms, peak_mb, count = measure(loader, rows)
+        print(f"{label:<26} {count} SKUs: {ms:8.1f} ms, peak {peak_mb:7.1f} MB")
@@ -0,0 +1,50 @@
+"""
+Receipts per second for 5, 50 and 500-line baskets (renders to memory, no viewer).
+
+    python -m benchmarks.bench_receipts
+"""
+import io
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.receipt_manager import ReceiptManager
+
+
+def make_transaction(lines):
+    items = [{'name': f"Product {i:04d}", 'qty': 1 + i % 3, 'price': 25.0 + i} for i in range(lines)]
+    subtotal = sum(item['qty'] * item['price'] for item in items)
+    vat = subtotal * 0.12
+    return {
+        'sale_id': 1,
+        'cashier': "Bench",
+        'items': items,
+        'subtotal': subtotal,
+        'vat': vat,
+        'total': subtotal + vat,
+        'payment': {'method': "Cash", 'tendered': subtotal + vat, 'change': 0.0},
+        'date': datetime.now(),
+    }
+
+
+def bench(lines, seconds=2.0):
+    mgr = ReceiptManager()
+    data = make_transaction(lines)
+    mgr.render(data, io.BytesIO())  # warm up (logo decode happens here, once)
+
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        mgr.render(data, io.BytesIO())
+        count += 1
+    elapsed = time.perf_counter() - start
+    return count / elapsed, elapsed / count * 1000
+
+
+if __name__ == "__main__":
+    for lines in (5, 50, 500):
+        rate, ms = bench(lines)
+        print(f"{lines:>4} lines: {rate:8.1f} receipts/s  ({ms:.2f} ms each)")
@@ -0,0 +1,86 @@
+"""
+Product search at 500k rows: FULLTEXT (search_products) vs the old substring match done in
+SQL (LIKE '%q%'). Needs the MySQL server from DatabaseManager; fills a separate
+inventory_bench table (same schema as inventory) the first time, real data is not touched.
+
+    python -m benchmarks.bench_search            # keep the table for the next run
+    python -m benchmarks.bench_search --drop     # remove it afterwards
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.database_manager import DatabaseManager
+from models.db_manager import INVENTORY_COLUMNS
+from models.entities import PRODUCT_SELECT
+from models.product_search import SEARCH_INDEXES, search_products
+
+TABLE = 'inventory_bench'
+ROWS = 500_000
+BATCH = 5_000
+QUERIES = ["coffee", "choco milk", "noodles beef", "sh", "zzzz"]
+
+WORDS = ["coffee", "milk", "choco", "rice", "noodles", "beef", "chicken", "soap", "shampoo",
+         "bread", "juice", "water", "soda", "candy", "sardines", "corned", "sugar", "salt"]
+CATEGORIES = ["Beverages", "Canned Goods", "Snacks", "Toiletries", "Bakery", "Dairy", "Pantry"]
+
+
+def fill(db):
+    db.ensure_columns('inventory', INVENTORY_COLUMNS)
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} LIKE inventory")
+    cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+    have = cursor.fetchone()[0]
+
+    rng = random.Random(42)
+    insert = (f"INSERT INTO {TABLE} (name, category, stock, cost_price, selling_price, threshold, expiry_date) "
+              "VALUES (%s, %s, %s, %s, %s, %s, %s)")
+    while have < ROWS:
+        rows = [(f"{' '.join(rng.sample(WORDS, 2)).title()} {have + i}", rng.choice(CATEGORIES),
+                 rng.randint(0, 200), 10.0, 15.0, 10, None) for i in range(min(BATCH, ROWS - have))]
+        cursor.executemany(insert, rows)
+        conn.commit()
+        have += len(rows)
+        print(f"  filled {have}/{ROWS}", end="\r")
+    conn.close()
+    db.ensure_indexes(TABLE, SEARCH_INDEXES)
+
+
+def substring_search(db, query, limit=50):
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT {PRODUCT_SELECT} FROM {TABLE} WHERE name LIKE %s ORDER BY name LIMIT %s",
+                       (f"%{query}%", limit))
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def timed(fn, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, len(result)
+
+
+if __name__ == "__main__":
+    db = DatabaseManager()
+    if not db.get_connection():
+        sys.exit("No database connection.")
+
+    fill(db)
+    print(f"{'query':<16}{'search_products':>20}{'LIKE %q%':>16}")
+    for query in QUERIES:
+        fts_ms, fts_n = timed(lambda: search_products(db, query, 50, 0, table=TABLE))
+        like_ms, like_n = timed(lambda: substring_search(db, query))
+        print(f"{query:<16}{fts_ms:>11.1f} ms ({fts_n:>3}){like_ms:>9.1f} ms ({like_n:>3})")
+
+    if '--drop' in sys.argv:
+        conn = db.get_connection()
+        conn.cursor().execute(f"DROP TABLE {TABLE}")
+        conn.close()
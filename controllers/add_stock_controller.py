@@ -84,7 +84,9 @@ class AddStockDialogController(QDialog):
 
             # 3. Save to Database
             if self.db:
-                success = self.db.add_product(name, category, stock, cost, price, 10, expiry_str) #10 is the threshold for expiry
+                user = getattr(self.main_controller, 'user', None)
+                user_name = getattr(user, 'name', None) if user else None  # who received the stock (ledger)
+                success = self.db.add_product(name, category, stock, cost, price, 10, expiry_str, user_name) #10 is the threshold for expiry
                 if success:
                     self.accept()  # Close dialog
 
@@ -8,7 +8,7 @@ from datetime import datetime  # <--- NEW IMPORT
 
 from utils.toast_notification import show_toast
 from controllers.payment_controller import PaymentController
-from utils.receipt_manager import ReceiptManager  # <--- NEW IMPORT
+from utils.receipt_queue import get_receipt_queue
 
 
 class Cart_Controller:
@@ -17,6 +17,7 @@ class Cart_Controller:
         self.scroll_area = scroll_area
         self.db = db
         self.cart_data = {}
+        self.last_sale_id = None
 
         # ui edits
         self.scroll_area.setVisible(True)
@@ -201,17 +202,17 @@ class Cart_Controller:
                 # when cashier confirms the pay
                 payment_info = dialog.payment_details
 
-                # save payments to DB
-                success = self.db.process_transaction(self.cart_data, grand_total, user_name, payment_info)
+                # save payments to DB (returns the new sale id)
+                sale_id = self.db.process_transaction(self.cart_data, grand_total, user_name, payment_info)
 
-                if success:
+                if sale_id:
+                    self.last_sale_id = sale_id
                     show_toast(self.parent, "Transaction Successful!", type="success")
 
-                    #this will pass data to generate receipt
+                    # hand the receipt to the background queue, the next customer doesnt wait for it
                     try:
-                        receipt_mgr = ReceiptManager()
                         receipt_data = {
-                            'sale_id': 'NEW',  # Ideally this comes from DB return
+                            'sale_id': sale_id,
                             'cashier': user_name,
                             'items': items_list,
                             'subtotal': subtotal,
@@ -220,7 +221,7 @@ class Cart_Controller:
                             'payment': payment_info,
                             'date': datetime.now()
                         }
-                        receipt_mgr.generate_receipt(receipt_data)
+                        get_receipt_queue().submit(receipt_data)
                     except Exception as e:
                         print(f"Receipt Error: {e}")
                         show_toast(self.parent, "Receipt Printing Failed", type="warning")
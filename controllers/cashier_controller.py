@@ -1,15 +1,22 @@
-from PyQt6.QtWidgets import QMainWindow, QLineEdit
-from PyQt6.QtGui import QAction, QIcon, QPixmap, QPainter, QColor
-from PyQt6.QtCore import pyqtSignal, Qt, QEvent
+from PyQt6.QtWidgets import QMainWindow, QLineEdit, QInputDialog, QButtonGroup, QPushButton
+from PyQt6.QtGui import QAction
+from PyQt6.QtCore import pyqtSignal, Qt, QEvent, QTimer
 from PyQt6 import uic, QtCore
 import os
+import threading
 
 from controllers.product_grid_controller import ProductGrid_Controller
 from controllers.cart_controller import Cart_Controller
+from utils.receipt_queue import get_receipt_queue
+from utils.toast_notification import show_toast
+from utils.ui_helper import cached_icon
+from utils.terminal_config import load_terminal_config
 
 
 class CashierController(QMainWindow):
     logout_request = pyqtSignal()
+    receipt_failed = pyqtSignal(object)  # emitted from the receipt worker thread, delivered on the GUI thread
+    catalog_changes = pyqtSignal(object, object)  # (cursor asked with, result) from the catalog poll thread
 
     def __init__(self, user, main_app):
         super().__init__()
@@ -29,7 +36,14 @@ class CashierController(QMainWindow):
         # Product Grid
         if hasattr(self, 'grid_products'):
             self.grid_controller = ProductGrid_Controller(self, self.grid_products, self.db)
-            self.grid_controller.refresh_products()
+            self.grid_controller.on_categories_changed = self.render_category_chips
+            # The change-feed cursor has to be taken before the catalog load (so nothing saved
+            # meanwhile is missed), on the poll thread: the load follows once it's in
+            self.catalog_since = None
+            self.catalog_loaded = False
+            self.catalog_polling = False
+            self.catalog_changes.connect(self.handle_catalog_changes)
+            self.poll_catalog_changes()
         else:
             print("Error: 'grid_products' widget not found in UI")
 
@@ -42,6 +56,17 @@ class CashierController(QMainWindow):
         self.setup_connections()
 
     def setup_ui(self):
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(16)  # ~one frame
+        self.resize_timer.timeout.connect(self.apply_columns)
+
+        # Price/stock changes from the back office and other tills (bulk updates, edits, sales)
+        self.catalog_timer = QTimer(self)
+        self.catalog_timer.setInterval(int(load_terminal_config().get('catalog_poll_seconds', 15)) * 1000)
+        self.catalog_timer.timeout.connect(self.poll_catalog_changes)
+        self.catalog_timer.start()
+
         #SVG icons man
         base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -50,7 +75,7 @@ class CashierController(QMainWindow):
             search_icon_path = os.path.join(base_path, 'assets', 'icons', 'search.svg')
             if os.path.exists(search_icon_path):
                 search_action = QAction(self)
-                search_action.setIcon(QIcon(search_icon_path))
+                search_action.setIcon(cached_icon(search_icon_path))
                 self.input_search.addAction(search_action, QLineEdit.ActionPosition.LeadingPosition)
 
         # Cart Icon
@@ -79,21 +104,9 @@ class CashierController(QMainWindow):
     def setup_text_icon_button(self, btn, icon_path, normal_color, hover_color):
         #icon no background but change color when hover
 
-        def paint_icon(path, color_hex):
-            original = QPixmap(path)
-            painted = QPixmap(original.size())
-            painted.fill(Qt.GlobalColor.transparent)
-            painter = QPainter(painted)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            painter.drawPixmap(0, 0, original)
-
-            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
-            painter.fillRect(painted.rect(), QColor(color_hex))
-            painter.end()
-            return QIcon(painted)
-
-        btn.icon_normal = paint_icon(icon_path, normal_color)
-        btn.icon_hover = paint_icon(icon_path, hover_color)
+        # Tinted variants come from the shared icon cache (no repaint per window/login)
+        btn.icon_normal = cached_icon(icon_path, 20, normal_color, btn)
+        btn.icon_hover = cached_icon(icon_path, 20, hover_color, btn)
         btn.setIcon(btn.icon_normal)
         btn.setIconSize(QtCore.QSize(20, 20))
         btn.setAttribute(Qt.WidgetAttribute.WA_Hover)
@@ -137,6 +150,13 @@ class CashierController(QMainWindow):
         if hasattr(self, 'btn_checkout'):
             self.btn_checkout.clicked.connect(self.handle_checkout)
 
+        # Receipts print in the background, failures land here
+        self.receipt_queue = get_receipt_queue()
+        self.receipt_queue.on_failed.append(self.receipt_failed.emit)
+        self.receipt_failed.connect(self.handle_receipt_failed)
+        if hasattr(self, 'btn_reprint'):
+            self.btn_reprint.clicked.connect(self.handle_reprint)
+
         #Exit Button
         if hasattr(self, 'btn_logout'):
             self.btn_logout.clicked.connect(self.handle_logout)
@@ -159,8 +179,78 @@ class CashierController(QMainWindow):
     def handle_logout(self):
         """Handles the exit button click."""
         print("Exit clicked. Logging out...")
+        self.hide()  # kept alive by the SessionManager for the next cashier
+        if hasattr(self, 'catalog_timer'):
+            self.catalog_timer.stop()
         self.logout_request.emit()  # Notify Main.py
-        self.close()  # Close this window
+
+    def set_user(self, user):
+        """Warm switch: hand this window to the next cashier without reloading the UI or the catalog."""
+        self.user = user
+        if hasattr(self, 'catalog_timer'):
+            self.poll_catalog_changes()  # catch up on what changed while logged out
+            self.catalog_timer.start()
+        if hasattr(self, 'cart_controller'):
+            self.cart_controller.cart_data = {}
+            if hasattr(self, 'grid_controller'):
+                self.cart_controller.render_cart(self.grid_controller.all_products)
+        if hasattr(self, 'input_search') and self.input_search.text():
+            self.input_search.clear()  # also resets the grid filter
+        if hasattr(self, 'grid_controller') and self.grid_controller.current_category is not None:
+            self.grid_controller.set_category(None)
+            self.render_category_chips(self.grid_controller.category_index.counts())
+
+    def handle_receipt_failed(self, job):
+        if self.isVisible():  # every open cashier window hears about it, only the active one toasts
+            show_toast(self, f"Receipt for {job.label} failed to print", type="error")
+        if hasattr(self, 'btn_reprint'):
+            self.btn_reprint.setText(f"Reprint ({len(self.receipt_queue.failed)})")
+            self.btn_reprint.setVisible(True)
+
+    def handle_reprint(self):
+        # Failed prints first, otherwise reprint any sale from the history
+        count = self.receipt_queue.reprint_failed()
+        if count:
+            if hasattr(self, 'btn_reprint'): self.btn_reprint.setText("Reprint")
+            show_toast(self, f"Reprinting {count} receipt(s)...", type="info")
+            return
+
+        last_id = getattr(getattr(self, 'cart_controller', None), 'last_sale_id', None) or 1
+        sale_id, ok = QInputDialog.getInt(self, "Reprint Receipt", "Sale #:", last_id, 1)
+        if ok:
+            self.receipt_queue.reprint_sale(sale_id, self.db)
+            show_toast(self, f"Reprinting Sale #{sale_id}...", type="info")
+
+    def render_category_chips(self, counts):
+        """Category chips above the grid: "All" + one per category, with product counts."""
+        if not hasattr(self, 'layout_categories'):
+            return
+
+        if not hasattr(self, 'chip_group'):
+            self.chip_group = QButtonGroup(self)
+            self.chip_group.setExclusive(True)
+        for btn in self.chip_group.buttons():
+            self.chip_group.removeButton(btn)
+            self.layout_categories.removeWidget(btn)
+            btn.deleteLater()
+
+        current = self.grid_controller.current_category
+        if current is not None and current not in counts:
+            current = None  # category emptied by a delta
+            self.grid_controller.current_category = None
+
+        chips = [(None, f"All ({sum(counts.values())})")]
+        chips += [(name, f"{name or 'Uncategorized'} ({count})") for name, count in counts.items()]
+        for i, (category, text) in enumerate(chips):
+            btn = QPushButton(text)
+            btn.setProperty('chip', True)  # styled by APP_STYLESHEET
+            btn.setCheckable(True)
+            btn.setChecked(category == current)
+            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+            btn.clicked.connect(lambda _, c=category: self.grid_controller.set_category(c))
+            self.chip_group.addButton(btn)
+            self.layout_categories.insertWidget(i, btn)  # before the trailing spacer
 
     def handle_add_product(self, product_id):
         if hasattr(self, 'cart_controller') and hasattr(self, 'grid_controller'):
@@ -170,12 +260,61 @@ class CashierController(QMainWindow):
         if hasattr(self, 'cart_controller') and hasattr(self, 'grid_controller'):
             user_name = self.user.get('name', 'Unknown') if isinstance(self.user, dict) else getattr(self.user, 'name',
                                                                                                      'Unknown')
+            sold_ids = list(self.cart_controller.cart_data)  # cart is cleared on success
             success = self.cart_controller.process_checkout(self.grid_controller.all_products, user_name)
             if success:
-                self.grid_controller.refresh_products()
+                # only the sold products changed: patch them in instead of reloading the catalog
+                self.grid_controller.apply_delta(self.db.get_products_by_ids(sold_ids))
+
+    def poll_catalog_changes(self):
+        # Off the GUI thread (connection, first-use schema checks); one poll at a time
+        if not hasattr(self, 'grid_controller') or self.catalog_polling:
+            return
+        self.catalog_polling = True
+        threading.Thread(target=self.fetch_catalog_changes, args=(self.catalog_since,),
+                         name="catalog-poll", daemon=True).start()
+
+    def fetch_catalog_changes(self, since):
+        # poll thread: only the DB call, the result goes back through the signal
+        try:
+            result = self.db.get_products_changed_since(since)
+        except Exception as e:
+            print(f"Catalog poll failed: {e}")
+            result = None
+        self.catalog_changes.emit(since, result)
+
+    def handle_catalog_changes(self, since, result):
+        self.catalog_polling = False
+        if result is None:
+            # DB unreachable: show whatever loads, the cursor is asked for again next tick
+            if not self.catalog_loaded:
+                self.load_catalog()
+            return
+
+        changed, removed, self.catalog_since = result
+        if since is None:
+            # first cursor, or one that only came after a failed start: full load from here on
+            self.load_catalog()
+            return
+        if changed or removed:
+            self.grid_controller.apply_delta(changed, removed)
+            if hasattr(self, 'cart_controller') and self.cart_controller.cart_data:
+                for pid in removed:
+                    self.cart_controller.cart_data.pop(pid, None)  # deleted in the back office, can't be sold
+                self.cart_controller.render_cart(self.grid_controller.all_products)  # new prices in the cart too
+
+    def load_catalog(self):
+        self.catalog_loaded = True
+        self.grid_controller.refresh_products()
 
     # --- RESPONS LOGIC ---
     def resizeEvent(self, event):
+        # Dragging the edge fires many resizes: only the last one per frame picks the columns
+        if hasattr(self, 'resize_timer'):
+            self.resize_timer.start()
+        super().resizeEvent(event)
+
+    def apply_columns(self):
         width = self.width()
         new_cols = 4
         if width > 1350:
@@ -186,5 +325,4 @@ class CashierController(QMainWindow):
             new_cols = 3
 
         if hasattr(self, 'grid_controller'):
-            self.grid_controller.set_columns(new_cols)
-        super().resizeEvent(event)
\ No newline at end of file
+            self.grid_controller.set_columns(new_cols)  # reflows existing cards
@@ -1,8 +1,9 @@
-from PyQt6 import uic, QtCore
+from PyQt6 import QtCore
 from PyQt6.QtCore import QTimer, QDateTime  # <--- Added these imports
 import os
 
 from utils.ui_helper import add_drop_shadow, set_icon, apply_hover_effect
+from utils.row_pool import row_pool
 
 
 class DashboardController(QtCore.QObject):
@@ -19,8 +20,9 @@ class DashboardController(QtCore.QObject):
         self.refresh_data()
         self.start_clock()  #Start clock
 
-    def setup_ui(self):
-        # GET USER
+    def load_user_name(self):
+        # GET USER (called again on a warm user switch)
+        self.current_user_name = "Manager"
         if hasattr(self.main_controller, 'user'):
             current_user = getattr(self.main_controller, 'user', None)
             if current_user:
@@ -30,6 +32,9 @@ class DashboardController(QtCore.QObject):
                 elif isinstance(current_user, dict):
                     self.current_user_name = current_user.get('name', 'Manager')
 
+    def setup_ui(self):
+        self.load_user_name()
+
         # Apply Hover Effectfor cards
         if hasattr(self.main_controller, 'card_revenue'):
             apply_hover_effect(self.main_controller.card_revenue)
@@ -86,11 +91,8 @@ class DashboardController(QtCore.QObject):
     def populate_sales_list(self):
         layout = self.main_controller.layout_sales_list
 
-        #Clear existing items
-        while layout.count() > 0:
-            child = layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        #Clear existing items (rows go back to the pool for the next refresh)
+        row_pool.release(layout)
 
         #Fetch Data
         sales = self.db.get_recent_sales()
@@ -106,7 +108,7 @@ class DashboardController(QtCore.QObject):
 
         for sale in sales:
             try:
-                widget = uic.loadUi(ui_path)
+                widget = row_pool.acquire(ui_path)
                 #FROM DB lahat
                 # TOTAL ITEMS 'items_count'
                 if hasattr(widget, 'lbl_items'):
@@ -126,11 +128,10 @@ class DashboardController(QtCore.QObject):
                 # TIME
                 if hasattr(widget, 'lbl_time'):
                     time_val = sale.get('sale_timestamp')
-                    if time_val:
-                        widget.lbl_time.setText(time_val.strftime("%b %d, %I:%M %p"))
+                    widget.lbl_time.setText(time_val.strftime("%b %d, %I:%M %p") if time_val else "")
 
                 # assert isinstance(widget, object)
-                layout.addWidget(widget)
+                row_pool.add(layout, widget)
 
             except Exception as e:
                 print(f"Error loading sale row: {e}")
\ No newline at end of file
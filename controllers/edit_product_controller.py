@@ -54,6 +54,15 @@ class EditProductDialogController(QDialog):
         self.setup_ui()
 
     def setup_ui(self):
+        self.load_product()
+        if hasattr(self, 'input_remove_qty'):
+            self.input_remove_qty.setValue(0)
+
+        # Connect Buttons
+        if hasattr(self, 'btn_save'): self.btn_save.clicked.connect(self.save_changes)
+        if hasattr(self, 'btn_cancel'): self.btn_cancel.clicked.connect(self.reject)
+
+    def load_product(self):
         # 1. Populate Fields
         if hasattr(self, 'input_name'): self.input_name.setText(self.product.name)
         if hasattr(self, 'input_category'): self.input_category.setText(self.product.category)
@@ -66,13 +75,8 @@ class EditProductDialogController(QDialog):
             self.lbl_current_stock_val.setText(str(self.product.stock))
 
         if hasattr(self, 'input_remove_qty'):
-            self.input_remove_qty.setValue(0)
             self.input_remove_qty.setMaximum(self.product.stock)
 
-        # Connect Buttons
-        if hasattr(self, 'btn_save'): self.btn_save.clicked.connect(self.save_changes)
-        if hasattr(self, 'btn_cancel'): self.btn_cancel.clicked.connect(self.reject)
-
     def save_changes(self):
         new_name = self.input_name.text().strip() if hasattr(self, 'input_name') else self.product.name
         new_category = self.input_category.text().strip() if hasattr(self, 'input_category') else self.product.category
@@ -83,9 +87,6 @@ class EditProductDialogController(QDialog):
         if hasattr(self, 'input_remove_qty'):
             qty_to_remove = self.input_remove_qty.value()
 
-        current_stock = self.product.stock
-        new_stock = current_stock - qty_to_remove
-
         reason = ""
         if hasattr(self, 'input_reason'):
             if hasattr(self.input_reason, 'toPlainText'):
@@ -102,27 +103,66 @@ class EditProductDialogController(QDialog):
                                 "You are removing stock. Please provide a reason (min 5 chars).")
             return
 
-        success = self.db.update_product(
-            self.product.id, new_name, new_category, new_stock,
-            new_cost, new_price, self.product.threshold, self.product.expiry_date
-        )
-
-        if success:
-            changes = []
-            if new_name != self.product.name: changes.append(f"Name: {self.product.name} -> {new_name}")
-            if new_price != self.product.selling_price: changes.append(
-                f"Price: {self.product.selling_price} -> {new_price}")
-            if new_cost != self.product.cost_price: changes.append(f"Cost: {self.product.cost_price} -> {new_cost}")
-
-            if changes:
-                log_details = ", ".join(changes)
-                if reason and qty_to_remove == 0: log_details += f". Note: {reason}"
-                self.db.log_audit(self.user_name, "Product Edit", log_details)
-
-            if qty_to_remove > 0:
-                self.db.log_audit(self.user_name, "Stock Shrinkage",
-                                  f"Removed {qty_to_remove}. Old: {current_stock}, New: {new_stock}. Reason: {reason}")
-
-            self.accept()
-        else:
+        # Only what was actually edited; stock goes as a removal (delta), not a new total
+        changes = {}
+        if new_name != self.product.name: changes['name'] = new_name
+        if new_category != self.product.category: changes['category'] = new_category
+        if new_cost != self.product.cost_price: changes['cost_price'] = new_cost
+        if new_price != self.product.selling_price: changes['selling_price'] = new_price
+
+        old = self.product
+        change_notes = []
+        if 'name' in changes: change_notes.append(f"Name: {old.name} -> {new_name}")
+        if 'selling_price' in changes: change_notes.append(f"Price: {old.selling_price} -> {new_price}")
+        if 'cost_price' in changes: change_notes.append(f"Cost: {old.cost_price} -> {new_cost}")
+
+        # Product row, ledger movement and audit entries: one connection, one commit
+        status, current = 'error', None
+        try:
+            with self.db.unit_of_work() as work:
+                status, current = self.db.update_product_fields(
+                    old.id, old.version, changes, -qty_to_remove,
+                    movement_kind="shrinkage" if qty_to_remove > 0 else "adjustment",
+                    user_name=self.user_name, note=reason, uow=work
+                )
+                if status == 'ok':
+                    if change_notes:
+                        log_details = ", ".join(change_notes)
+                        if reason and qty_to_remove == 0: log_details += f". Note: {reason}"
+                        self.db.log_audit(self.user_name, "Product Edit", log_details, uow=work)
+
+                    if qty_to_remove > 0:
+                        # Old/New from the row as saved, so sales made while editing are counted
+                        self.db.log_audit(self.user_name, "Stock Shrinkage",
+                                          f"Removed {qty_to_remove}. Old: {current.stock + qty_to_remove}, "
+                                          f"New: {current.stock}. Reason: {reason}", uow=work)
+            if status == 'ok' and not work.committed:
+                status = 'error'
+        except Exception as e:
+            print(f"Error saving product: {e}")
+            status = 'error'
+
+        if status == 'conflict':
+            # someone saved this product while the dialog was open: show theirs, keep the typed removal
+            self.product = current
+            self.load_product()
+            QMessageBox.warning(self, "Product Changed",
+                                "Someone else updated this product while you were editing.\n"
+                                "The latest details are loaded, please review and save again.")
+            return
+        if status == 'not_enough_stock':
+            self.product = current
+            self.load_product()
+            QMessageBox.warning(self, "Stock Changed",
+                                f"Only {current.stock} left now (sales happened meanwhile). Adjust the quantity to remove.")
+            return
+        if status == 'missing':
+            QMessageBox.critical(self, "Error", "This product was deleted.")
+            self.reject()
+            return
+        if status != 'ok':
             QMessageBox.critical(self, "Error", "Failed to update product.")
+            return
+
+        self.product = current
+        self.accept()
@@ -1,7 +1,10 @@
-from PyQt6 import uic
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QFileDialog, QMessageBox
 import os
-from utils.ui_helper import Overlay, add_drop_shadow, set_icon
+from utils.ui_helper import Overlay, add_drop_shadow, set_icon, set_badge
 from utils.toast_notification import show_toast
+from utils.row_pool import row_pool
+from models.catalog import STATUS_LOW, STATUS_OUT
 from controllers.add_stock_controller import AddStockDialogController
 from controllers.edit_product_controller import EditProductDialogController
 from controllers.audit_controller import AuditWindowController
@@ -31,6 +34,11 @@ class InventoryController:
             set_icon(self.view.btn_add_stock, 'plus.svg', size=18)
             self.view.btn_add_stock.setText(" Add Stock")
 
+        #Import Button
+        if hasattr(self.view, 'btn_import'):
+            set_icon(self.view.btn_import, 'upload.svg', size=18, color="#0891B2")
+            self.view.btn_import.setText(" Import")
+
         #View Logs Button
         if hasattr(self.view, 'btn_view_logs'):
             set_icon(self.view.btn_view_logs, 'clipboard.svg', size=18)
@@ -55,6 +63,7 @@ class InventoryController:
                 btn = getattr(self.view, btn_name)
                 btn.active_style = style_active
                 btn.default_style = style_default
+                btn.base_text = btn.text()  # count gets appended in update_filter_counts
                 # Reset to default
                 btn.setStyleSheet(style_default)
 
@@ -63,6 +72,9 @@ class InventoryController:
         if hasattr(self.view, 'btn_add_stock'):
             self.view.btn_add_stock.clicked.connect(self.open_add_stock_dialog)
 
+        if hasattr(self.view, 'btn_import'):
+            self.view.btn_import.clicked.connect(self.import_products)
+
         if hasattr(self.view, 'btn_view_logs'):
             self.view.btn_view_logs.clicked.connect(self.open_audit_logs)
 
@@ -106,38 +118,29 @@ class InventoryController:
 
         layout = self.view.layout_inventory_list
 
-        # Clear existing items
-        while layout.count() > 1:  # Keep the spacer
-            item = layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        #fetch data
-        products = self.db.get_inventory_items()
+        # Clear existing items (rows go back to the pool)
+        row_pool.release(layout, keep=1)  # Keep the spacer
+        #fetch data (cached columnar snapshot, already newest id first)
+        catalog = self.db.get_catalog_snapshot()
 
-        # fetch text
+        # 1. Status filter, vectorized over the whole catalog
+        if filter_type == "low":
+            products = catalog.select(catalog.status_mask(STATUS_LOW))
+        elif filter_type == "out":
+            products = catalog.select(catalog.status_mask(STATUS_OUT))
+        else:
+            products = catalog.records
+
+        # 2. Search Filter
         search_text = ""
         if hasattr(self.view, 'lineEdit_search'):
             search_text = self.view.lineEdit_search.text().lower().strip()
 
-        filtered_products = []
-
-        for p in products:
-            # 1. Search Filter
-            if search_text:
-                name_match = search_text in p.name.lower()
-                cat_match = search_text in p.category.lower()
-                if not (name_match or cat_match):
-                    continue
+        self.update_filter_counts()
 
-            if filter_type == "low":
-                if not (p.stock <= p.threshold and p.stock > 0): continue
-            elif filter_type == "out":
-                if p.stock != 0: continue
-
-            filtered_products.append(p)
-
-        # Sort
-        filtered_products.sort(key=lambda x: x.id, reverse=True)
+        filtered_products = [p for p in products
+                             if not search_text or search_text in p.name.lower()
+                             or search_text in (p.category or "").lower()]
 
         # === RENDER ROWS ===
         base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -145,7 +148,7 @@ class InventoryController:
 
         for product in filtered_products:
             try:
-                row_widget = uic.loadUi(row_ui_path)
+                row_widget = row_pool.acquire(row_ui_path)
 
                 # Set Data
                 if hasattr(row_widget, 'lbl_name'): row_widget.lbl_name.setText(product.name)
@@ -155,30 +158,46 @@ class InventoryController:
 
                 # Status Badge(THIS IS LOGIC BECAUSE IT IS CONDITIONS)
                 if hasattr(row_widget, 'lbl_status'):
+                    # colors live in APP_STYLESHEET, keyed by the badge property
                     if product.stock == 0:
                         row_widget.lbl_status.setText("Out of Stock")
-                        row_widget.lbl_status.setStyleSheet(
-                            "background-color: #FEE2E2; color: #DC2626; border-radius: 12px; font-weight: bold;")
+                        set_badge(row_widget.lbl_status, 'out_of_stock')
                     elif product.stock <= product.threshold:
                         row_widget.lbl_status.setText("Low Stock")
-                        row_widget.lbl_status.setStyleSheet(
-                            "background-color: #FEF3C7; color: #D97706; border-radius: 12px; font-weight: bold;")
+                        set_badge(row_widget.lbl_status, 'low_stock')
                     else:
                         row_widget.lbl_status.setText("In Stock")
-                        row_widget.lbl_status.setStyleSheet(
-                            "background-color: #ECFDF5; color: #059669; border-radius: 12px; font-weight: bold;")
+                        set_badge(row_widget.lbl_status, 'in_stock')
 
                 # Edit Button
                 if hasattr(row_widget, 'btn_edit'):
-                    row_widget.btn_edit.clicked.connect(lambda _, p=product: self.open_edit_dialog(p))
+                    row_pool.reconnect(row_widget.btn_edit.clicked, lambda _, p=product: self.open_edit_dialog(p))
 
                 # Insert row before the spacer
                 spacer_index = layout.count() - 1
-                layout.insertWidget(spacer_index, row_widget)
+                row_pool.add(layout, row_widget, spacer_index)
 
             except Exception as e:
                 print(f"Error loading row: {e}")
 
+    def update_filter_counts(self):
+        """Live counts on the filter buttons, from the cached facet query (one grouped SELECT per catalog version)."""
+        try:
+            facets = self.db.get_inventory_facets()
+        except Exception as e:
+            print(f"Error fetching filter counts: {e}")
+            return
+
+        counts = {
+            'btn_filter_all': facets['total']['count'],
+            'btn_filter_low': facets['status']['low'],
+            'btn_filter_out': facets['status']['out'],
+        }
+        for btn_name, count in counts.items():
+            btn = getattr(self.view, btn_name, None)
+            if btn is not None and hasattr(btn, 'base_text'):
+                btn.setText(f"{btn.base_text} ({count})")
+
     def handle_search(self, text):
         filter_mode = "all"
         if self.active_filter_button == getattr(self.view, 'btn_filter_low', None):
@@ -209,6 +228,33 @@ class InventoryController:
             except:
                 pass
 
+    def import_products(self):
+        # supplier price list -> one batched upsert (models/product_import.py)
+        path, _ = QFileDialog.getOpenFileName(self.view, "Import Products", "",
+                                              "Price lists (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)")
+        if not path:
+            return
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            report = self.db.import_products(path, self.get_current_username())
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        if report.committed:
+            show_toast(self.main_controller, f"Imported: {report.inserted} added, {report.updated} updated",
+                       type="success")
+            self.refresh_data("all")
+
+        if report.errors:
+            shown = "\n".join(f"Line {line}: {msg}" if line else msg for line, msg in report.errors[:20])
+            more = len(report.errors) - 20
+            if more > 0:
+                shown += f"\n... and {more} more"
+            QMessageBox.warning(self.view, "Import", f"{report.summary()}\n\n{shown}")
+        elif not report.committed:
+            QMessageBox.information(self.view, "Import", "No products found in the file.")
+
     def open_edit_dialog(self, product):
         try:
             overlay = Overlay(self.main_controller)
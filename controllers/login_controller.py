@@ -1,17 +1,23 @@
 from PyQt6 import  uic, QtCore
-from PyQt6.QtWidgets import QMainWindow, QLineEdit, QMessageBox, QApplication
+from PyQt6.QtWidgets import QMainWindow, QLineEdit, QMessageBox
 from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import pyqtSignal, QTimer
+from PyQt6.QtCore import pyqtSignal
 from utils.ui_helper import add_drop_shadow, center_window
+from utils.terminal_config import load_terminal_config
+from models.pin_auth import PinDirectory
 import os
+import threading
 
 
 class LoginController(QMainWindow):
     login_success = pyqtSignal(object)
+    auth_finished = pyqtSignal(object, str)  # (User or None, error text) from the auth thread
 
     def __init__(self, db_manager):
         super().__init__()
         self.db = db_manager
+        # PIN quick-unlock for cashiers bound to this terminal
+        self.pins = PinDirectory(self.db, load_terminal_config()['terminal_id'])
 
         base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         ui_path = os.path.join(base_path, 'views', 'login_window.ui')
@@ -22,6 +28,7 @@ class LoginController(QMainWindow):
 
         self.setup_ui()
         self.setup_connections()
+        self.login_btn_text = self.btn_login.text()
 
         # Start with default role
         self.set_role("Cashier")
@@ -55,6 +62,7 @@ class LoginController(QMainWindow):
         self.btn_forgot.clicked.connect(self.handle_forgot_password)
 
         self.btn_login.clicked.connect(self.handle_login)
+        self.auth_finished.connect(self.finish_auth)
         self.input_pass.returnPressed.connect(self.handle_login)
         self.input_user.returnPressed.connect(lambda: self.input_pass.setFocus())
 
@@ -85,6 +93,7 @@ class LoginController(QMainWindow):
             self.btn_role_manager.setChecked(True)
             add_drop_shadow(self.btn_role_manager, blur=15, y_offset=4, color_alpha=40, hex_color="#000000")
             self.btn_role_cashier.setGraphicsEffect(None)
+        self.input_pass.setPlaceholderText("Password or PIN" if role == "Cashier" else "Password")
         self.lbl_error.setText("")
         self.input_user.setFocus()
 
@@ -118,29 +127,58 @@ class LoginController(QMainWindow):
             self.shake_window()
             return
 
-        original_text = self.btn_login.text()
         self.btn_login.setText("Signing in...")
         self.btn_login.setEnabled(False)
         self.input_user.setEnabled(False)
         self.input_pass.setEnabled(False)
-        QApplication.processEvents()
 
-        QTimer.singleShot(500, lambda: self.process_auth(username, password, original_text))
-
-    def process_auth(self, username, password, original_btn_text):
-        user = self.db.authenticate_user(username, password)
+        # Hashing (bcrypt for passwords) runs off the GUI thread; result comes back via auth_finished
+        threading.Thread(target=self.process_auth, args=(username, password, self.current_role),
+                         name="login-auth", daemon=True).start()
+
+    def process_auth(self, username, secret, role):
+        """Runs on the auth thread: no widget access here."""
+        try:
+            pin_status = None
+            if role == "Cashier" and PinDirectory.looks_like_pin(secret):
+                user, pin_status = self.pins.authenticate(username, secret)
+                if pin_status == 'ok':
+                    self.auth_finished.emit(user, "")
+                    return
+                # 'invalid', 'no_pin' or 'locked': the digits may still be the password
+
+            user = self.db.authenticate_user(username, secret)
+            if user:
+                self.auth_finished.emit(user, "")
+            elif pin_status == 'locked':
+                self.auth_finished.emit(None, "Too many wrong PINs. Sign in with your password.")
+            elif pin_status == 'invalid':
+                self.auth_finished.emit(None, "Invalid PIN or password.")
+            else:
+                self.auth_finished.emit(None, "Invalid username or password.")
+        except Exception as e:
+            print(f"Auth Error: {e}")
+            self.auth_finished.emit(None, "Could not sign in. Please try again.")
 
+    def finish_auth(self, user, error):
         if user:
             if user.role.lower() == self.current_role.lower():
                 self.fade_out(user)
-            else:
-                self.lbl_error.setText(f"This account is not authorized as {self.current_role}")
-                self.shake_window()
-                self.reset_loading_state(original_btn_text)
-        else:
-            self.lbl_error.setText("Invalid username or password.")
-            self.shake_window()
-            self.reset_loading_state(original_btn_text)
+                return
+            error = f"This account is not authorized as {self.current_role}"
+
+        self.lbl_error.setText(error)
+        self.shake_window()
+        self.reset_loading_state(self.login_btn_text)
+
+    def prepare_for_next_login(self):
+        """Reuses this window after a logout instead of loading login_window.ui again."""
+        self.input_user.clear()
+        self.reset_loading_state(self.login_btn_text)
+        self.lbl_error.setText("")
+        self.input_user.setFocus()
+        self.setWindowOpacity(0.0)
+        self.fade_in()
 
     def reset_loading_state(self, original_text):
         self.btn_login.setText(original_text)
@@ -1,6 +1,5 @@
 from PyQt6 import QtWidgets, uic, QtGui, QtCore
 from PyQt6.QtWidgets import QMainWindow
-from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import pyqtSignal
 import os
 import sys
@@ -11,7 +10,17 @@ from controllers.inventory_controller import InventoryController
 from controllers.perishables_controller import PerishablesController
 from controllers.reports_controller import ReportsController
 from controllers.users_controller import UsersController
-from utils.ui_helper import center_window
+from utils.ui_helper import center_window, cached_icon
+from utils.startup_trace import trace
+
+# Stack index -> (ui file, page attribute, controller attribute, controller class)
+# Built on first visit, not at login
+LAZY_PAGES = {
+    1: ('inventory_window.ui', 'page_inventory', 'inventory_controller', InventoryController),
+    2: ('perishables_window.ui', 'page_perishables', 'perishables_controller', PerishablesController),
+    3: ('reports_window.ui', 'page_reports', 'reports_controller', ReportsController),
+    4: ('user_accounts_window.ui', 'page_users', 'users_controller', UsersController),
+}
 
 
 class MainController(QMainWindow):
@@ -23,9 +32,12 @@ class MainController(QMainWindow):
         self.db = db_manager
         self.user = user_data  # Store the logged-in user
         self.load_main_ui()
+        trace.mark("dashboard_window.ui")
         self.setup_sidebar()
+        trace.mark("sidebar")
         self.update_user_display()        # Display the user name
         self.init_pages()         # Initialize pages
+        trace.mark("dashboard page")
 
         # Connect Navig
         if hasattr(self, 'btn_nav_dashboard'):
@@ -47,6 +59,11 @@ class MainController(QMainWindow):
         center_window(self)
         self.fade_in()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        # first event-loop turn after show = the window is interactive
+        QtCore.QTimer.singleShot(0, lambda: (trace.mark("first paint"), trace.report("Manager login")))
+
     def update_user_display(self):
         #shows the logged in user
         if hasattr(self, 'lbl_user'):
@@ -76,8 +93,18 @@ class MainController(QMainWindow):
 
     def handle_logout(self):
         print("Logging out...")
+        self.hide()  # kept alive by the SessionManager, pages stay built
         self.logout_request.emit()
-        self.close()
+
+    def set_user(self, user):
+        """Warm switch: swap the logged-in manager and go back to the dashboard."""
+        self.user = user
+        self.update_user_display()
+        if hasattr(self, 'dashboard_controller'):
+            self.dashboard_controller.load_user_name()
+        if self.sidebar_buttons:
+            self.sidebar_buttons[0][0].setChecked(True)
+        self.switch_page(0)
 
     def load_main_ui(self):
         base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -146,7 +173,7 @@ class MainController(QMainWindow):
 
     def set_btn_icon(self, btn, path):
         if os.path.exists(path):
-            btn.setIcon(QIcon(path))
+            btn.setIcon(cached_icon(path))  # hover swaps hit the cache, not the disk
             btn.setIconSize(QtCore.QSize(20, 20))
 
     #Side bar hover effsss
@@ -170,6 +197,10 @@ class MainController(QMainWindow):
             else:
                 self.set_btn_icon(btn, btn.path_normal)
 
+        # Build the page on first visit (its controller loads the data itself)
+        if self.ensure_page(index):
+            return
+
         # Refresh Data when mag switch page (no more re-running yay)
         if index == 0:
             self.dashboard_controller.refresh_data()
@@ -183,26 +214,34 @@ class MainController(QMainWindow):
             self.users_controller.refresh_data()
 
     def init_pages(self):
-        # 1. Dashboard
+        # 1. Dashboard (the landing page, built now)
         self.dashboard_controller = DashboardController(self.page_dashboard, self)
 
-        # 2. Inventory
-        self.page_inventory = self.load_and_add_page('inventory_window.ui')
-        self.inventory_controller = InventoryController(self.page_inventory, self)
-
-        # 3. Perishables
-        self.page_perishables = self.load_and_add_page('perishables_window.ui')
-        self.perishables_controller = PerishablesController(self.page_perishables, self)
-
-        # 4. Reports
-        self.page_reports = self.load_and_add_page('reports_window.ui')
-        self.reports_controller = ReportsController(self.page_reports, self)
+        # 2-5. Empty placeholders so the stack indexes line up, real pages come on first visit
+        self.page_placeholders = {}
+        for index in sorted(LAZY_PAGES):
+            placeholder = QtWidgets.QWidget()
+            self.main_stack.insertWidget(index, placeholder)
+            self.page_placeholders[index] = placeholder
+
+    def ensure_page(self, index):
+        """Builds a lazy page if it's still a placeholder. Returns True if it was built just now."""
+        placeholder = self.page_placeholders.pop(index, None)
+        if placeholder is None:
+            return False
+
+        filename, page_attr, controller_attr, controller_cls = LAZY_PAGES[index]
+        widget = self.load_page(filename)
+        self.main_stack.insertWidget(index, widget)
+        self.main_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.main_stack.setCurrentIndex(index)
 
-        # 5. Users
-        self.page_users = self.load_and_add_page('user_accounts_window.ui')
-        self.users_controller = UsersController(self.page_users, self)
+        setattr(self, page_attr, widget)
+        setattr(self, controller_attr, controller_cls(widget, self))
+        return True
 
-    def load_and_add_page(self, filename):
+    def load_page(self, filename):
         base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         ui_path = os.path.join(base_path, 'views', filename)
 
@@ -216,7 +255,6 @@ class MainController(QMainWindow):
                 print(f"Error loading {filename}: {e}")
                 widget = QtWidgets.QWidget()
 
-        self.main_stack.addWidget(widget)
         return widget
 
     def open_add_stock_dialog(self):
@@ -5,6 +5,8 @@ import os
 
 # IMPORT THE HELPER CLASS
 from models.db_manager import ManagerDB
+from utils.row_pool import row_pool
+from utils.ui_helper import set_badge
 
 
 class PerishablesController:
@@ -38,10 +40,7 @@ class PerishablesController:
         if not self.layout:
             return
 
-        while self.layout.count() > 1:
-            item = self.layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        row_pool.release(self.layout, keep=1)
 
         filtered_items = self.db.get_expiring_products_in_stock(days_threshold=30)
 
@@ -59,7 +58,7 @@ class PerishablesController:
                 days_left = (exp - today).days
 
                 # Render Row
-                row = uic.loadUi(self.item_ui_path)
+                row = row_pool.acquire(self.item_ui_path)
 
                 if hasattr(row, 'lbl_name'):
                     row.lbl_name.setText(item.name)
@@ -72,19 +71,19 @@ class PerishablesController:
 
                 if days_left < 0:
                     status = f"EXPIRED ({abs(days_left)} days ago)"
-                    style = "background-color: #EF4444; color: white; font-weight: bold; border-radius: 13px;"
+                    badge = 'expired'
                 elif days_left <= 7:
                     status = f"DISCOUNT NOW ({days_left} days left)"
-                    style = "background-color: #FBBF24; color: #475569; font-weight: bold; border-radius: 13px;"
+                    badge = 'discount'
                 else:
                     status = "Stock Check"
-                    style = "background-color: #E2E8F0; color: #475569; font-weight: bold; border-radius: 13px;"
+                    badge = 'check'
 
                 if hasattr(row, 'lbl_action'):
                     row.lbl_action.setText(status)
-                    row.lbl_action.setStyleSheet(style)
+                    set_badge(row.lbl_action, badge)  # colors come from APP_STYLESHEET
 
-                self.layout.insertWidget(self.layout.count() - 1, row)
+                row_pool.add(self.layout, row, self.layout.count() - 1)
 
             except Exception as e:
                 print(f"Error adding perishable row: {e}")
\ No newline at end of file
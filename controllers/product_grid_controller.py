@@ -1,8 +1,10 @@
-from PyQt6.QtWidgets import QSpacerItem, QSizePolicy, QFrame, QLabel, QPushButton
+from PyQt6.QtWidgets import QSpacerItem, QSizePolicy, QLabel, QPushButton
 from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import Qt
-import os
-from views.product_card import ProductCard
+from PyQt6.QtCore import Qt, QTimer
+from views.product_card import ProductCard, THUMB_SIZE
+from utils.thumbnail_cache import get_thumbnail_cache
+from utils.ui_helper import set_badge
+from models.catalog import CategoryIndex
 
 
 class ProductGrid_Controller:
@@ -12,112 +14,238 @@ class ProductGrid_Controller:
         self.db = db
         self.all_products = []
         self.current_columns = 4
+        self.cards = []  # cards currently in the grid, in display order
+        self.card_by_id = {}  # every built card, shown or not (category/search only hide them)
+        self.category_index = CategoryIndex()
+        self.current_category = None
+        self.search_text = ""
+        self.on_categories_changed = None  # callback({category: count}) for the chip bar
+
+        # Thumbnails: only cards scrolled into view ask for their image
+        self.thumbnails = get_thumbnail_cache()
+        self.image_cards = []  # cards still waiting for a thumbnail
+        self.image_timer = QTimer()
+        self.image_timer.setSingleShot(True)
+        self.image_timer.setInterval(30)  # coalesce scroll/resize bursts
+        self.image_timer.timeout.connect(self.load_visible_images)
+        scroll_area = getattr(self.parent, 'scrollArea_products', None)
+        if scroll_area:
+            scroll_area.verticalScrollBar().valueChanged.connect(lambda _: self.image_timer.start())
 
     def refresh_products(self):
+        """Full catalog load: rebuilds the cards and the category index."""
         self.all_products = self.db.get_all_products()
+        self.category_index.rebuild(self.all_products)
         self.populate_grid(self.all_products)
+        if self.current_category or self.search_text:
+            self.apply_filters()
+        self.notify_categories()
+
+    def apply_delta(self, products, removed_ids=()):
+        """
+        Patches changed products (e.g. the ones just sold) into the grid without a reload:
+        existing cards are rebound, new products get a card, products deleted elsewhere
+        (removed_ids, from the change feed) lose theirs, the category index is updated in place.
+        """
+        removed = set(removed_ids)
+        if removed:
+            self.all_products = [p for p in self.all_products if p.id not in removed]
+            for pid in removed:
+                card = self.card_by_id.pop(pid, None)
+                if card:
+                    if card in self.image_cards:
+                        self.image_cards.remove(card)
+                    card.hide()
+                    card.deleteLater()  # apply_filters below drops it from self.cards
+            products = [p for p in products if p.id not in removed]
+
+        position = {p.id: i for i, p in enumerate(self.all_products)}
+        for product in products:
+            i = position.get(product.id)
+            if i is None:
+                self.all_products.append(product)
+                self.card_by_id[product.id] = self.build_card(product)
+            else:
+                self.all_products[i] = product
+                card = self.card_by_id.get(product.id)
+                if card:
+                    self.bind_card(card, product)
+
+        self.category_index.apply_delta(products, removed)
+        self.notify_categories()
+        self.apply_filters()
+
+    def set_category(self, category):
+        """Shows one category (None = all) by re-placing the existing cards."""
+        self.current_category = category
+        self.apply_filters()
+
+    def apply_filters(self):
+        """Picks the visible cards for the current category + search text and reflows them."""
+        ids = self.category_index.ids_for(self.current_category) if self.current_category else None
+        visible = []
+        for product in self.all_products:  # keeps the catalog order
+            if ids is not None and product.id not in ids:
+                continue
+            if self.search_text and self.search_text not in product.name.lower():
+                continue
+            card = self.card_by_id.get(product.id)
+            if card:
+                visible.append(card)
+
+        shown = set(visible)
+        for card in self.cards:
+            if card not in shown:
+                card.hide()
+        self.cards = visible
+        self.reflow()
+
+    def notify_categories(self):
+        if self.on_categories_changed:
+            self.on_categories_changed(self.category_index.counts())
 
     def set_columns(self, new_columns):
         if new_columns != self.current_columns:
             self.current_columns = new_columns
-            self.populate_grid(self.all_products)
+            self.reflow()
+
+    def reflow(self):
+        """Re-places the existing cards for the current column count (no widgets created or destroyed)."""
+        while self.layout.count():
+            self.layout.takeAt(0)  # widgets keep their parent, only the layout items go
+
+        for i, card in enumerate(self.cards):
+            self.layout.addWidget(card, i // self.current_columns, i % self.current_columns)
+            card.show()  # may have been hidden by a category/search filter
+        self.add_bottom_spacer(len(self.cards))
+
+        if self.image_cards:
+            self.image_timer.start()  # different cards may be on screen now
+
+    def add_bottom_spacer(self, count):
+        rows = (count + self.current_columns - 1) // self.current_columns
+        spacer = QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
+        self.layout.addItem(spacer, rows, 0, 1, self.current_columns)
 
     def populate_grid(self, products):
-        self.clear_layout(self.layout)
+        self.clear_cards()
+        self.cards = []
+        self.image_cards = []
         row, col = 0, 0
         max_cols = self.current_columns
 
         for product in products:
-            card = ProductCard(product)
-
-            #  1. SETUP & TRANSPARENCy
-            card.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
-            card.setStyleSheet("background-color: transparent; border: none;")
-
-            #  2. POPULATE DATA
-            # --- NAME ---
-            lbl_name = card.findChild(QLabel, 'lbl_name')
-            if lbl_name:
-                lbl_name.setText(str(product.name))
-                lbl_name.setWordWrap(True)
-
-            # --- PRICE ---
-            lbl_price = card.findChild(QLabel, 'lbl_price')
-            if lbl_price:
-                lbl_price.setText(f"₱{product.selling_price:,.2f}")
-
-            # --- IMAGE ---
-            lbl_image = card.findChild(QLabel, 'lbl_image')
-            # Fallback
-            if not lbl_image and hasattr(card, 'lbl_image'):
-                lbl_image = card.lbl_image
-
-            if lbl_image:
-                if product.image_path and os.path.exists(product.image_path):
-                    pixmap = QPixmap(product.image_path)
-                    lbl_image.setPixmap(pixmap.scaled(
-                        lbl_image.size(),
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    ))
-                else:
-                    lbl_image.setText("No Image")
-                    lbl_image.setStyleSheet("color: #94A3B8; font-size: 10px;")
-
-            #Click
-            card.add_to_cart_clicked.connect(self.parent.handle_add_product)
-
-
-            #  3. STOCK STATUS
-            # Find button only, para dili ma highlight ang card
-            btn_card = card.findChild(QPushButton, 'btn_card')
-            if btn_card:
-                btn_card.setFocusPolicy(Qt.FocusPolicy.NoFocus)
-
-            lbl_stock = card.findChild(QLabel, 'lbl_stock')
-            threshold = getattr(product, 'threshold', 10)
-
-            if product.stock == 0:
-                # === OUT OF STOCK ===
-                if lbl_stock:
-                    lbl_stock.setText("Out of Stock")
-                    # Style ONLY the label
-                    lbl_stock.setStyleSheet(
-                        "background-color: #FEE2E2; color: #DC2626; border-radius: 4px; font-weight: 700; font-size: 10px; padding: 2px; border: none;")
-
-            elif product.stock <= threshold:
-                # === LOW STOCK ===
-                if lbl_stock:
-                    lbl_stock.setText(f"{product.stock} left")
-                    # Style ONLY the label
-                    lbl_stock.setStyleSheet(
-                        "background-color: #FEF3C7; color: #D97706; border-radius: 4px; font-weight: 700; font-size: 10px; padding: 2px; border: none;")
-
-            else:
-                # === IN STOCK ===
-                if lbl_stock:
-                    lbl_stock.setText(f"{product.stock} left")
-                    # Standard Green Badge
-                    lbl_stock.setStyleSheet(
-                        "background-color: #ECFEFF; color: #0E7490; padding: 2px; border-radius: 4px; font-weight: 700; font-size: 10px; border: none;")
+            card = self.build_card(product)
+            self.card_by_id[product.id] = card
 
             self.layout.addWidget(card, row, col)
+            self.cards.append(card)
             col += 1
             if col >= max_cols:
                 col = 0
                 row += 1
 
-        spacer = QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
-        self.layout.addItem(spacer, row + 1, 0, 1, max_cols)
+        self.add_bottom_spacer(len(self.cards))
+        if self.image_cards:
+            self.image_timer.start()  # after layout, so visibility is known
+
+    def build_card(self, product):
+        card = ProductCard(product)
+
+        #  1. SETUP & TRANSPARENCy
+        card.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        # transparent background comes from APP_STYLESHEET (a per-card sheet would also override the badges)
+
+        # --- NAME ---
+        lbl_name = card.findChild(QLabel, 'lbl_name')
+        if lbl_name:
+            lbl_name.setWordWrap(True)
+
+        # --- IMAGE ---
+        lbl_image = card.findChild(QLabel, 'lbl_image')
+        # Fallback
+        if not lbl_image and hasattr(card, 'lbl_image'):
+            lbl_image = card.lbl_image
+
+        if lbl_image and product.image_path:
+            self.image_cards.append(card)
+
+        #Click
+        card.add_to_cart_clicked.connect(self.parent.handle_add_product)
+
+        # Find button only, para dili ma highlight ang card
+        btn_card = card.findChild(QPushButton, 'btn_card')
+        if btn_card:
+            btn_card.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+
+        self.bind_card(card, product)
+        return card
+
+    def bind_card(self, card, product):
+        """Writes product data onto a card (new card, or an existing one after a delta)."""
+        card.product = product
+
+        #  2. POPULATE DATA
+        lbl_name = card.findChild(QLabel, 'lbl_name')
+        if lbl_name:
+            lbl_name.setText(str(product.name))
+
+        # --- PRICE ---
+        lbl_price = card.findChild(QLabel, 'lbl_price')
+        if lbl_price:
+            lbl_price.setText(f"₱{product.selling_price:,.2f}")
+
+        #  3. STOCK STATUS
+        lbl_stock = card.findChild(QLabel, 'lbl_stock')
+        threshold = getattr(product, 'threshold', 10)
+
+        # Badge colors live in APP_STYLESHEET (utils/ui_helper.py)
+        if product.stock == 0:
+            # === OUT OF STOCK ===
+            if lbl_stock:
+                lbl_stock.setText("Out of Stock")
+                set_badge(lbl_stock, 'out_of_stock')
+
+        elif product.stock <= threshold:
+            # === LOW STOCK ===
+            if lbl_stock:
+                lbl_stock.setText(f"{product.stock} left")
+                set_badge(lbl_stock, 'low_stock')
+
+        else:
+            # === IN STOCK ===
+            if lbl_stock:
+                lbl_stock.setText(f"{product.stock} left")
+                set_badge(lbl_stock, 'in_stock')
+
+    def load_visible_images(self):
+        """Requests thumbnails for the cards currently on screen; the rest wait for a scroll."""
+        waiting = []
+        for card in self.image_cards:
+            if card.visibleRegion().isEmpty():
+                waiting.append(card)
+                continue
+
+            dpr = card.devicePixelRatioF()
+            label = card.lbl_image
+
+            def show(pixmap, label=label, dpr=dpr):
+                pixmap = QPixmap(pixmap)
+                pixmap.setDevicePixelRatio(dpr)
+                label.setPixmap(pixmap)
+
+            self.thumbnails.request(card.product.image_path, round(THUMB_SIZE * dpr), show)
+        self.image_cards = waiting
 
     def filter_products(self, search_text):
-        """Filters the currently loaded products."""
-        text = search_text.lower().strip()
-        filtered = [p for p in self.all_products if text in p.name.lower()]
-        self.populate_grid(filtered)
-
-    def clear_layout(self, layout):
-        while layout.count():
-            item = layout.takeAt(0)
-            widget = item.widget()
-            if widget: widget.deleteLater()
+        """Filters the currently loaded products (hides cards, builds none)."""
+        self.search_text = search_text.lower().strip()
+        self.apply_filters()
+
+    def clear_cards(self):
+        # Hidden (filtered out) cards are not in the layout, so delete from card_by_id too
+        while self.layout.count():
+            self.layout.takeAt(0)
+        for card in self.card_by_id.values():
+            card.deleteLater()
+        self.card_by_id = {}
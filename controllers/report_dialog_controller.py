@@ -2,9 +2,17 @@ from PyQt6.QtWidgets import QDialog, QFileDialog, QMessageBox
 from PyQt6.QtCore import QDate
 from PyQt6.uic import loadUi
 from datetime import datetime
+import os
 
 from models.database_manager import DatabaseManager
-from utils.pdf_generator import PDFReportGenerator
+from utils.report_builder import export_report
+
+# formatCombo text -> (format, extension, file dialog filter)
+EXPORT_FORMATS = {
+    "PDF": ('pdf', 'pdf', "PDF Files (*.pdf)"),
+    "CSV": ('csv', 'csv', "CSV Files (*.csv)"),
+    "Excel (XLSX)": ('xlsx', 'xlsx', "Excel Files (*.xlsx)"),
+}
 
 class ReportDialogController(QDialog):
     def __init__(self, parent=None):
@@ -23,6 +31,10 @@ class ReportDialogController(QDialog):
         self.endDateEdit.setDate(QDate.currentDate())
         self.reportTypeCombo.addItem("All Reports")
 
+        if hasattr(self, 'formatCombo'):
+            self.formatCombo.currentTextChanged.connect(
+                lambda text: self.exportBtn.setText(f"Export {text.split(' ')[0]}"))
+
         self.exportBtn.clicked.connect(self.handle_export)
         self.cancelBtn.clicked.connect(self.close)
 
@@ -30,49 +42,29 @@ class ReportDialogController(QDialog):
         rpt_type = self.reportTypeCombo.currentText()
         start = self.startDateEdit.date().toString("yyyy-MM-dd")
         end = self.endDateEdit.date().toString("yyyy-MM-dd")
+        fmt_text = self.formatCombo.currentText() if hasattr(self, 'formatCombo') else "PDF"
+        fmt, ext, file_filter = EXPORT_FORMATS.get(fmt_text, EXPORT_FORMATS["PDF"])
 
         # 1. DetermineFilename
-        filename = f"{rpt_type.replace(' ', '_')}_{end}.pdf"
+        filename = f"{rpt_type.replace(' ', '_')}_{end}.{ext}"
 
         # 2. Ask Where to Save
-        file_path, _ = QFileDialog.getSaveFileName(self, "Save Report", filename, "PDF Files (*.pdf)")
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Report", filename, file_filter)
 
         if not file_path:
             return  # User cancel
 
         try:
-            gen = PDFReportGenerator(file_path)
-
-            #GENERATE EVERYTHING
-            if rpt_type == "All Reports":
-                # 1. Sales
-                gen.add_sales_section(self.db.get_sales_report_data(start, end), start, end)
-                # 2. Inventory Valuation
-                gen.add_inventory_section(self.db.get_inventory_valuation_data(), "Valuation")
-                # 3. Low Stock
-                gen.add_inventory_section(self.db.get_low_stock_data(), "LowStock")
-                # 4. Audit Logs
-                gen.add_audit_section(self.db.get_audit_log_data(start, end), start, end)
-
-            #GENERATE INDIVIDUAL REPORTS
-            elif rpt_type == "Sales Report":
-                gen.add_sales_section(self.db.get_sales_report_data(start, end), start, end)
-
-            elif rpt_type == "Inventory Valuation":
-                gen.add_inventory_section(self.db.get_inventory_valuation_data(), "Valuation")
-
-            elif rpt_type == "Low Stock Alert":
-                gen.add_inventory_section(self.db.get_low_stock_data(), "LowStock")
-
-            elif rpt_type == "Audit Logs":
-                gen.add_audit_section(self.db.get_audit_log_data(start, end), start, end)
-
-            #Finalize and Write File
-            if gen.build():
-                QMessageBox.information(self, "Success", "Report Generated Successfully!")
+            # 3. Build (shared with the headless report_cli.py)
+            written = export_report(self.db, rpt_type, start, end, file_path, fmt)
+            if written:
+                # multi-section CSV writes one file per section, not the picked name
+                files = "\n".join(os.path.basename(path) for path in written)
+                QMessageBox.information(self, "Success",
+                                        f"Report Generated Successfully!\n\nSaved to {os.path.dirname(written[0]) or '.'}:\n{files}")
                 self.close()
             else:
-                QMessageBox.critical(self, "Error", "Failed to compile PDF file.")
+                QMessageBox.critical(self, "Error", f"Failed to write the {fmt.upper()} file.")
 
         except AttributeError as e:
             QMessageBox.critical(self, "Database Error",
@@ -3,7 +3,7 @@ import os
 
 from utils.ui_helper import set_icon, apply_hover_effect, Overlay
 from models.db_manager import ManagerDB
-from controllers.report_dialog_controller import ReportDialogController
+from utils.row_pool import row_pool
 
 class ReportsController(QtCore.QObject):
     def __init__(self, view, main_controller):
@@ -29,6 +29,9 @@ class ReportsController(QtCore.QObject):
     #open the dialog
     def open_report_dialog(self):
         try:
+            # imported here so ReportLab only loads when someone actually exports
+            from controllers.report_dialog_controller import ReportDialogController
+
             overlay = Overlay(self.main_controller)
             overlay.show() #blur effect again
             dialog = ReportDialogController(parent=self.view)
@@ -77,10 +80,8 @@ class ReportsController(QtCore.QObject):
         if not hasattr(self.view, 'layout_top_selling'): return
         layout = self.view.layout_top_selling
 
-        # Clear layout
-        while layout.count() > 0:
-            item = layout.takeAt(0)
-            if item.widget(): item.widget().deleteLater()
+        # Clear layout (rows are recycled, the spacer is dropped and re-added below)
+        row_pool.release(layout)
 
         # Fetch Items using
         items = []
@@ -104,7 +105,7 @@ class ReportsController(QtCore.QObject):
 
         for name, count in items:
             try:
-                row_widget = uic.loadUi(ui_path)
+                row_widget = row_pool.acquire(ui_path)
 
                 if hasattr(row_widget, 'lbl_name'): row_widget.lbl_name.setText(name)
                 if hasattr(row_widget, 'lbl_count'): row_widget.lbl_count.setText(f"{count} sold")
@@ -112,7 +113,7 @@ class ReportsController(QtCore.QObject):
                     percent = int((count / max_sold) * 100) if max_sold > 0 else 0
                     row_widget.progress_bar.setValue(percent)
 
-                layout.addWidget(row_widget)
+                row_pool.add(layout, row_widget)
             except Exception as e:
                 print(f"Error rendering report row: {e}")
 
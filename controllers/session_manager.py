@@ -0,0 +1,50 @@
+from controllers.main_controller import MainController
+from controllers.cashier_controller import CashierController
+
+
+class SessionManager:
+    """
+    Keeps one window per role alive between logins. Logging out only hides it; the next
+    login of the same role swaps the user in (set_user) instead of reloading the .ui,
+    the icons and the whole catalog.
+    """
+
+    def __init__(self, orchestrator):
+        self.orchestrator = orchestrator  # has .db, CashierController reads it from here
+        self.db = orchestrator.db
+        self.windows = {}  # role -> window
+        self.active = None
+        self.on_logout = None  # callback() when the active window logs out
+
+    def open_session(self, user):
+        window = self.windows.get(user.role)
+
+        if window is None:
+            window = self._create_window(user)
+            if window is None:
+                raise ValueError(f"No window for role: {user.role}")
+            window.logout_request.connect(self._handle_logout)
+            self.windows[user.role] = window
+        else:
+            window.set_user(user)
+            window.setWindowOpacity(1.0)
+
+        self.active = window
+        window.show()
+        window.raise_()
+        window.activateWindow()
+        return window
+
+    def _create_window(self, user):
+        if user.role == "Manager":
+            return MainController(self.db, user_data=user)
+        if user.role == "Cashier":
+            return CashierController(user, self.orchestrator)
+        return None
+
+    def _handle_logout(self):
+        if self.active:
+            self.active.hide()
+        self.active = None
+        if self.on_logout:
+            self.on_logout()
@@ -3,6 +3,7 @@ import os
 
 from utils.ui_helper import Overlay, add_drop_shadow, set_icon
 from utils.toast_notification import show_toast
+from utils.row_pool import row_pool
 
 
 class UsersController:
@@ -28,11 +29,8 @@ class UsersController:
     def refresh_data(self):
         layout = self.view.layout_users_list
 
-        # Clear existing items (Keeping > 1 preserves the bottom spacer if you have one)
-        while layout.count() > 1:
-            child = layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        # Clear existing items (Keeping 1 preserves the bottom spacer if you have one)
+        row_pool.release(layout, keep=1)
 
         # Fetch users
         users = []
@@ -50,7 +48,7 @@ class UsersController:
 
         for user in users:
             try:
-                row_widget = uic.loadUi(ui_path)
+                row_widget = row_pool.acquire(ui_path)
 
                 # Set Labels
                 if hasattr(row_widget, 'lbl_name'):
@@ -62,11 +60,12 @@ class UsersController:
                 # FIX: Capture 'uid' in the lambda so it doesn't default to the last loop item
                 btn_remove = row_widget.findChild(QtWidgets.QPushButton, 'btn_remove')
                 if btn_remove:
-                    btn_remove.clicked.connect(lambda checked, uid=user.id: self.delete_user_action(uid))
+                    row_pool.reconnect(btn_remove.clicked,
+                                       lambda checked, uid=user.id: self.delete_user_action(uid))
 
                 # Insert at top (index 0) to show new users first?
                 # Or use layout.addWidget(row_widget) if you want ID order.
-                layout.insertWidget(0, row_widget)
+                row_pool.add(layout, row_widget, 0)
 
             except Exception as e:
                 print(f"Error loading user row: {e}")
@@ -150,7 +149,10 @@ class UsersController:
         overlay.close()
 
         if reply == QtWidgets.QMessageBox.StandardButton.Yes:
-            success = self.db.delete_user(user_id)
+            # audit entry goes in with the delete (same transaction)
+            user = getattr(self.main_controller, 'user', None)
+            deleted_by = getattr(user, 'name', None) if user else None
+            success = self.db.delete_user(user_id, deleted_by)
 
             if success:
                 show_toast(self.main_controller, "User deleted successfully!", type="success")
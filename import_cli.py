@@ -0,0 +1,52 @@
+"""
+Headless bulk product import (no PyQt needed), for supplier price lists.
+
+    python -m import_cli pricelist.csv --user "Store Manager"
+    python -m import_cli pricelist.xlsx --dry-run     # validate only, nothing written
+
+Header row names the columns: name, category, stock (qty received), cost_price,
+selling_price, threshold, expiry_date (yyyy-mm-dd), barcode. See models/product_import.py
+for the accepted aliases. Existing products match on barcode, then name.
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.database_manager import DatabaseManager
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="import_cli", description="Bulk-import products from CSV/XLSX.")
+    parser.add_argument('path', help="CSV or XLSX file, header on the first row")
+    parser.add_argument('--user', default="System", help="name for the audit log (default: System)")
+    parser.add_argument('--dry-run', action='store_true', help="validate and report, write nothing")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.path):
+        parser.error(f"no such file: {args.path}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    main_db = DatabaseManager()
+    conn = main_db.get_connection()
+    if not conn:
+        print("Cannot reach the database, nothing imported.", file=sys.stderr)
+        return 2
+    conn.close()
+
+    report = main_db.import_products(args.path, args.user, dry_run=args.dry_run)
+    for line, message in report.errors:
+        print(f"line {line}: {message}" if line else message, file=sys.stderr)
+
+    print(("[dry run] " if args.dry_run else "") + report.summary())
+    if args.dry_run:
+        return 1 if report.errors else 0
+    return 0 if report.committed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,72 +1,79 @@
 import sys
 import os
+import threading
+import time
 import traceback
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from utils.startup_trace import trace  # first, so the trace starts at process start
+
 from PyQt6.QtWidgets import QApplication
 from models.database_manager import DatabaseManager
+from utils.terminal_config import load_terminal_config
+from utils.ui_helper import APP_STYLESHEET
 
 # Import Controllers
 from controllers.login_controller import LoginController
-from controllers.main_controller import MainController
-from controllers.cashier_controller import CashierController
+from controllers.session_manager import SessionManager
+
+
+trace.mark("imports")
 
 
 class AppOrchestrator:
     def __init__(self):
         self.app = QApplication(sys.argv)
+        self.app.setStyleSheet(APP_STYLESHEET)  # status badges etc., see utils/ui_helper.py
+        trace.mark("QApplication")
         # Initialize Database ONCE here, share it with everyone
         self.db = DatabaseManager()
+        trace.mark("DatabaseManager")
+        # Stock ledger checkpoint/compaction, off the GUI thread
+        threading.Thread(target=self.ledger_maintenance_loop, name="ledger-maintenance", daemon=True).start()
+        # Role windows stay alive (hidden) between logins
+        self.sessions = SessionManager(self)
+        self.sessions.on_logout = self.on_logout
+        self.login_window = None
         self.show_login()
 
+    def ledger_maintenance_loop(self):
+        # Tills stay open for days, so not only at start: check again every so often
+        # (no-op until a checkpoint is due)
+        minutes = float(load_terminal_config().get('ledger_check_minutes', 60))
+        while True:
+            try:
+                self.db.run_ledger_maintenance()
+            except Exception:
+                traceback.print_exc()
+            time.sleep(minutes * 60)
+
     def show_login(self):
-        self.login_window = LoginController(self.db)
-        self.login_window.login_success.connect(self.on_login_success)
+        if self.login_window is None:
+            self.login_window = LoginController(self.db)
+            self.login_window.login_success.connect(self.on_login_success)
+        else:
+            self.login_window.prepare_for_next_login()
         self.login_window.show()
+        trace.mark("login window shown")
+        trace.report("Startup")
 
     def on_login_success(self, user):
         print(f"Logged in as: {user.name} ({user.role})")
+        trace.mark("login accepted")
 
         try:
-            if user.role == "Manager":
-                # --- [FIX] Pass user to open_manager_window ---
-                self.open_manager_window(user)
-            elif user.role == "Cashier":
-                self.open_cashier_window(user)
+            self.sessions.open_session(user)
 
-            # Close login only if the new window launched successfully
-            self.login_window.close()
+            # Hide login only if the new window launched successfully (reused on logout)
+            self.login_window.hide()
 
         except Exception:
             print("guba:")
             traceback.print_exc()
 
-    def open_manager_window(self, user):
-        # --- [FIX] Pass the user object to MainController ---
-        self.main_window = MainController(self.db, user_data=user)
-        self.main_window.logout_request.connect(self.on_logout)
-        self.main_window.show()
-
-    def open_cashier_window(self, user):
-        # Pass user and self (orchestrator) which contains .db
-        self.cashier_window = CashierController(user, self)
-        self.cashier_window.logout_request.connect(self.on_logout)
-        self.cashier_window.show()
-
     def on_logout(self):
         print("Logout received. Returning to Login Screen.")
-
-        # Close Cashier Window if it exists and is open
-        if hasattr(self, 'cashier_window') and self.cashier_window:
-            self.cashier_window.close()
-            self.cashier_window = None  # Clear the reference
-
-        # Close Manager Window if it exists and is open
-        if hasattr(self, 'main_window') and self.main_window:
-            self.main_window.close()
-            self.main_window = None  # Clear the reference
-
         self.show_login()
 
     def run(self):
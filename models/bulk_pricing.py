@@ -0,0 +1,203 @@
+import math
+from decimal import Decimal
+
+from models.report_cache import report_cache
+from models import change_feed
+
+try:
+    import numpy as np
+except ImportError:  # optional, same as models/catalog.py
+    np = None
+
+ROUND_NEAREST = 'nearest'
+ROUND_UP = 'up'
+
+# Float slack so the preview rounds .5 / exact steps the same way MySQL does on DECIMALs
+_EPS = 1e-9
+
+
+class PriceRule:
+    """
+    What a bulk update does to each targeted product, applied in this order:
+    price x (1 + percent/100), + amount, rounded to a multiple of round_to (nearest or up),
+    never below 0. field picks selling_price or cost_price; threshold (if set) replaces the
+    low-stock threshold. Any part can be left out.
+    """
+
+    def __init__(self, percent=None, amount=None, round_to=None, round_mode=ROUND_NEAREST,
+                 threshold=None, field='selling_price'):
+        if field not in ('selling_price', 'cost_price'):
+            raise ValueError(f"Can't bulk-update {field}")
+        if round_to is not None and round_to <= 0:
+            raise ValueError("round_to must be positive")
+        if threshold is not None and threshold < 0:
+            raise ValueError("threshold can't be negative")
+        self.percent = percent
+        self.amount = amount
+        self.round_to = round_to
+        self.round_mode = round_mode
+        self.threshold = threshold
+        self.field = field
+
+    @property
+    def changes_price(self):
+        return bool(self.percent) or bool(self.amount) or self.round_to is not None
+
+    def describe(self):
+        parts = []
+        if self.percent:
+            parts.append(f"{self.percent:+g}%")
+        if self.amount:
+            parts.append(f"{self.amount:+.2f}")
+        if self.round_to is not None:
+            parts.append(f"round {self.round_mode} to {self.round_to:g}")
+        text = f"{self.field} {' '.join(parts)}" if parts else ""
+        if self.threshold is not None:
+            text = f"{text}, threshold = {self.threshold}" if text else f"threshold = {self.threshold}"
+        return text or "no change"
+
+    # --- the same rule twice: once as array math (preview), once as SQL (apply) ---
+
+    def apply_values(self, prices):
+        """New prices for a NumPy array (or list) of current prices."""
+        if np is not None:
+            new = np.asarray(prices, dtype=np.float64) * (1 + (self.percent or 0) / 100) + (self.amount or 0)
+            if self.round_to is not None:
+                steps = new / self.round_to
+                steps = np.ceil(steps - _EPS) if self.round_mode == ROUND_UP else np.floor(steps + 0.5 + _EPS)
+                new = steps * self.round_to
+            return np.round(np.maximum(new, 0.0) + _EPS, 2)
+
+        result = []
+        for price in prices:
+            new = price * (1 + (self.percent or 0) / 100) + (self.amount or 0)
+            if self.round_to is not None:
+                steps = new / self.round_to
+                steps = math.ceil(steps - _EPS) if self.round_mode == ROUND_UP else math.floor(steps + 0.5 + _EPS)
+                new = steps * self.round_to
+            result.append(round(max(new, 0.0) + _EPS, 2))
+        return result
+
+    def sql_expression(self):
+        """(SQL for the new price, params), same math as apply_values on the DECIMAL column."""
+        # Decimal params keep MySQL on exact DECIMAL math (floats would make it DOUBLE, other rounding)
+        expr, params = self.field, []
+        if self.percent:
+            expr = f"{expr} * (1 + %s / 100)"
+            params.append(Decimal(str(self.percent)))
+        if self.amount:
+            expr = f"{expr} + %s"
+            params.append(Decimal(str(self.amount)))
+        if self.round_to is not None:
+            func = "CEIL" if self.round_mode == ROUND_UP else "ROUND"
+            expr = f"{func}(({expr}) / %s) * %s"
+            params += [Decimal(str(self.round_to))] * 2
+        return f"ROUND(GREATEST({expr}, 0), 2)", params
+
+
+def _target_mask(snapshot, category=None, product_ids=None):
+    if product_ids is not None:
+        wanted = set(product_ids)
+        if np is not None:
+            return np.isin(snapshot.ids, list(wanted))
+        return [pid in wanted for pid in snapshot.ids]
+    if category is not None:
+        code = snapshot.categories.index(category) if category in snapshot.categories else -1
+        if np is not None:
+            return snapshot.category == code
+        return [c == code for c in snapshot.category]
+    return np.ones(len(snapshot), dtype=bool) if np is not None else [True] * len(snapshot)
+
+
+def preview(snapshot, rule, category=None, product_ids=None):
+    """
+    The diff a bulk update would make, computed on the CatalogSnapshot columns (no SQL).
+    Returns {'rows': [{id, name, category, old_price, new_price, old_threshold, new_threshold}],
+             'count', 'value_before', 'value_after'} for the rows that actually change.
+    """
+    mask = _target_mask(snapshot, category, product_ids)
+    column = snapshot.price if rule.field == 'selling_price' else snapshot.cost
+    records = snapshot.select(mask)
+
+    if np is not None:
+        old = column[mask]
+        stock = snapshot.stock[mask]
+        old_thresholds = snapshot.threshold[mask]
+        new = rule.apply_values(old) if rule.changes_price else old
+        new_thresholds = np.full_like(old_thresholds, rule.threshold) if rule.threshold is not None else old_thresholds
+        changed = (np.abs(new - old) > 0.001) | (new_thresholds != old_thresholds)
+        idx = np.flatnonzero(changed)
+        value_before = float((old[idx] * stock[idx]).sum())
+        value_after = float((new[idx] * stock[idx]).sum())
+        old, new = old.tolist(), new.tolist()
+        old_thresholds, new_thresholds = old_thresholds.tolist(), new_thresholds.tolist()
+        idx = idx.tolist()
+    else:
+        old = [v for v, keep in zip(column, mask) if keep]
+        stock = [s for s, keep in zip(snapshot.stock, mask) if keep]
+        old_thresholds = [t for t, keep in zip(snapshot.threshold, mask) if keep]
+        new = rule.apply_values(old) if rule.changes_price else old
+        new_thresholds = [rule.threshold] * len(old) if rule.threshold is not None else old_thresholds
+        idx = [i for i in range(len(old)) if abs(new[i] - old[i]) > 0.001 or new_thresholds[i] != old_thresholds[i]]
+        value_before = sum(old[i] * stock[i] for i in idx)
+        value_after = sum(new[i] * stock[i] for i in idx)
+
+    rows = [{'id': records[i].id, 'name': records[i].name, 'category': records[i].category,
+             'old_price': old[i], 'new_price': new[i],
+             'old_threshold': old_thresholds[i], 'new_threshold': new_thresholds[i]} for i in idx]
+    return {'rows': rows, 'count': len(rows), 'value_before': value_before, 'value_after': value_after}
+
+
+def apply(main_db, rule, category=None, product_ids=None, user_name=None, uow=None):
+    """
+    Runs the rule as one set-based UPDATE over the category / id list (all products if
+    neither), with one "Bulk Price Update" audit entry in the same transaction.
+    Returns the number of products changed, or None on failure.
+    """
+    sets, params = [], []
+    diffs, diff_params = [], []  # only rows that really change get a new version (like the preview)
+    if rule.changes_price:
+        expr, expr_params = rule.sql_expression()
+        sets.append(f"{rule.field} = {expr}")
+        params += expr_params
+        diffs.append(f"{rule.field} <> {expr}")
+        diff_params += expr_params
+    if rule.threshold is not None:
+        sets.append("threshold = %s")
+        params.append(rule.threshold)
+        diffs.append("threshold <> %s")
+        diff_params.append(rule.threshold)
+    if not sets:
+        return 0
+    sets.append("version = version + 1")
+    sets.append("change_seq = %s")  # taken inside the transaction, see below
+
+    where, target = [f"({' OR '.join(diffs)})"], "all products"
+    if product_ids is not None:
+        product_ids = list(product_ids)
+        if not product_ids:
+            return 0
+        where.append(f"id IN ({', '.join(['%s'] * len(product_ids))})")
+        diff_params += product_ids
+        target = f"{len(product_ids)} selected products"
+    elif category is not None:
+        where.append("COALESCE(category, '') = %s")
+        diff_params.append(category)
+        target = f"category '{category or 'Uncategorized'}'"
+
+    try:
+        with main_db.unit_of_work(uow) as work:
+            seq = change_feed.next_seq(work.cursor)
+            work.cursor.execute(f"UPDATE inventory SET {', '.join(sets)} WHERE {' AND '.join(where)}",
+                                params + [seq] + diff_params)
+            changed = work.cursor.rowcount
+            if changed:
+                work.audit(user_name or "System", "Bulk Price Update",
+                           f"{target}: {rule.describe()} -> {changed} products changed")
+                work.on_commit(report_cache.note_product_change)
+        if uow is None and not work.committed:
+            return None
+        return changed
+    except Exception as e:
+        print(f"Bulk update failed: {e}")
+        return None
@@ -0,0 +1,211 @@
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # optional: same API on plain lists, just slower on big catalogs
+    np = None
+
+# Stock status codes (same rules the inventory filters and the dashboard use)
+STATUS_OK = 'ok'    # stock > threshold
+STATUS_LOW = 'low'  # 0 < stock <= threshold
+STATUS_OUT = 'out'  # stock == 0
+
+NO_EXPIRY = 2 ** 31 - 1  # expiry ordinal for products that don't expire
+
+
+class CatalogSnapshot:
+    """
+    Columnar copy of the inventory: parallel arrays for id, stock, threshold, cost, price and
+    expiry (date ordinal), plus a category code per row. Filters return masks and aggregates
+    run over whole columns, so views and reports don't loop over objects or go back to SQL.
+    Masks are NumPy bool arrays when NumPy is installed, lists of bools otherwise.
+    `records` keeps the ProductRecords in the same order, select(mask) maps back to them.
+    """
+
+    def __init__(self, records):
+        self.records = list(records)
+        self.version = None  # catalog version it was built at (ManagerDB.get_catalog_snapshot)
+        self.categories = sorted({r.category or "" for r in self.records})
+        code_of = {name: i for i, name in enumerate(self.categories)}
+
+        ids = [r.id for r in self.records]
+        stock = [r.stock for r in self.records]
+        threshold = [r.threshold for r in self.records]
+        cost = [r.cost_price for r in self.records]
+        price = [r.selling_price for r in self.records]
+        expiry = [self._ordinal(r.expiry_date) for r in self.records]
+        category = [code_of[r.category or ""] for r in self.records]
+
+        if np is not None:
+            self.ids = np.array(ids, dtype=np.int64)
+            self.stock = np.array(stock, dtype=np.int64)
+            self.threshold = np.array(threshold, dtype=np.int64)
+            self.cost = np.array(cost, dtype=np.float64)
+            self.price = np.array(price, dtype=np.float64)
+            self.expiry = np.array(expiry, dtype=np.int64)
+            self.category = np.array(category, dtype=np.int32)
+        else:
+            self.ids, self.stock, self.threshold = ids, stock, threshold
+            self.cost, self.price, self.expiry, self.category = cost, price, expiry, category
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def nbytes(self):
+        # what the report cache charges for this entry
+        columns = (self.ids, self.stock, self.threshold, self.cost, self.price, self.expiry, self.category)
+        if np is not None:
+            arrays = sum(col.nbytes for col in columns)
+        else:
+            arrays = 8 * len(columns) * len(self.records)
+        return arrays + 200 * len(self.records)  # plus the records themselves, roughly
+
+    @staticmethod
+    def _ordinal(value):
+        if value is None:
+            return NO_EXPIRY
+        if isinstance(value, str):
+            value = date.fromisoformat(value[:10])
+        if hasattr(value, 'date') and callable(value.date):
+            value = value.date()
+        return value.toordinal()
+
+    # --- filters (masks) ---
+
+    def status_mask(self, status):
+        if np is not None:
+            if status == STATUS_OUT:
+                return self.stock == 0
+            if status == STATUS_LOW:
+                return (self.stock > 0) & (self.stock <= self.threshold)
+            return self.stock > self.threshold
+
+        pairs = zip(self.stock, self.threshold)
+        if status == STATUS_OUT:
+            return [s == 0 for s, _ in pairs]
+        if status == STATUS_LOW:
+            return [0 < s <= t for s, t in pairs]
+        return [s > t for s, t in pairs]
+
+    def days_to_expiry(self, today=None):
+        """Days left per row (negative = already expired, huge for no expiry)."""
+        today = (today or date.today()).toordinal()
+        if np is not None:
+            return self.expiry - today
+        return [e - today for e in self.expiry]
+
+    def expiring_mask(self, days=30, today=None, in_stock_only=True):
+        """Rows that expire within `days` (or already did)."""
+        left = self.days_to_expiry(today)
+        if np is not None:
+            mask = (self.expiry != NO_EXPIRY) & (left <= days)
+            return mask & (self.stock > 0) if in_stock_only else mask
+        return [e != NO_EXPIRY and d <= days and (s > 0 or not in_stock_only)
+                for e, d, s in zip(self.expiry, left, self.stock)]
+
+    @staticmethod
+    def combine(*masks):
+        """Logical AND of several masks."""
+        if np is not None:
+            result = masks[0]
+            for mask in masks[1:]:
+                result = result & mask
+            return result
+        return [all(flags) for flags in zip(*masks)]
+
+    def select(self, mask):
+        """ProductRecords where mask is true, in snapshot order."""
+        if np is not None:
+            return [self.records[i] for i in np.flatnonzero(mask)]
+        return [rec for rec, keep in zip(self.records, mask) if keep]
+
+    def count(self, mask):
+        if np is not None:
+            return int(np.count_nonzero(mask))
+        return sum(1 for keep in mask if keep)
+
+    # --- aggregates ---
+
+    def stock_value(self, at='price'):
+        """stock x selling price (or cost) per row."""
+        unit = self.price if at == 'price' else self.cost
+        if np is not None:
+            return self.stock * unit
+        return [s * u for s, u in zip(self.stock, unit)]
+
+    def value_by_category(self, at='price', mask=None):
+        """{category: sum of stock x price} over the (masked) rows."""
+        values = self.stock_value(at)
+        if np is not None:
+            weights = values if mask is None else np.where(mask, values, 0.0)
+            sums = np.bincount(self.category, weights=weights, minlength=len(self.categories))
+            return {name: float(total) for name, total in zip(self.categories, sums)}
+
+        sums = [0.0] * len(self.categories)
+        for i, (code, value) in enumerate(zip(self.category, values)):
+            if mask is None or mask[i]:
+                sums[code] += value
+        return dict(zip(self.categories, sums))
+
+    def totals(self, mask=None):
+        """Total value, total units and SKU count over the (masked) rows."""
+        values = self.stock_value()
+        if np is not None:
+            if mask is not None:
+                values, stock = values[mask], self.stock[mask]
+            else:
+                stock = self.stock
+            return {'total_value': float(values.sum()), 'total_items': int(stock.sum()), 'skus': int(len(stock))}
+
+        keep = mask if mask is not None else [True] * len(self.records)
+        return {'total_value': sum(v for v, k in zip(values, keep) if k),
+                'total_items': sum(s for s, k in zip(self.stock, keep) if k),
+                'skus': sum(1 for k in keep if k)}
+
+
+class CategoryIndex:
+    """
+    category -> set of product ids, built once when the catalog loads and patched from
+    deltas (changed/removed products) instead of being rebuilt. Used for the cashier chips.
+    """
+
+    def __init__(self, products=()):
+        self.rebuild(products)
+
+    def rebuild(self, products):
+        self._ids = {}          # category -> {product id}
+        self._category_of = {}  # product id -> category
+        for product in products:
+            self._add(product)
+
+    def apply_delta(self, products, removed_ids=()):
+        for product in products:
+            self._remove(product.id)
+            self._add(product)
+        for pid in removed_ids:
+            self._remove(pid)
+
+    def ids_for(self, category):
+        return self._ids.get(category, set())
+
+    def categories(self):
+        return sorted(self._ids)
+
+    def counts(self):
+        return {name: len(self._ids[name]) for name in self.categories()}
+
+    def _add(self, product):
+        category = product.category or ""
+        self._ids.setdefault(category, set()).add(product.id)
+        self._category_of[product.id] = category
+
+    def _remove(self, pid):
+        category = self._category_of.pop(pid, None)
+        if category is None:
+            return
+        ids = self._ids.get(category)
+        if ids is not None:
+            ids.discard(pid)
+            if not ids:
+                del self._ids[category]
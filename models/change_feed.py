@@ -0,0 +1,111 @@
+from mysql.connector import Error
+
+from models.entities import ProductRecord, PRODUCT_SELECT
+
+# Change feed for open terminals. Every write to inventory (sales, edits, imports, bulk
+# updates, deletes) takes the next number from catalog_sequence, a one-row counter, inside its
+# own transaction and stamps what it touched with it: inventory.change_seq, or a row in
+# catalog_deletions for a delete. The counter row stays locked until that transaction ends, so
+# numbers become visible in order: once a till has read everything up to N, nothing <= N can
+# show up later, however long the writer ran (a big import, a slow sale).
+CHANGE_FEED_TABLES = {
+    'catalog_sequence': """(
+        id TINYINT NOT NULL PRIMARY KEY,
+        seq BIGINT NOT NULL
+    )""",
+    # tombstones, so tills can drop products deleted elsewhere
+    'catalog_deletions': """(
+        product_id INT NOT NULL PRIMARY KEY,
+        seq BIGINT NOT NULL,
+        INDEX idx_catalog_deletions_seq (seq)
+    )""",
+}
+CHANGE_FEED_COLUMNS = {'change_seq': 'BIGINT NOT NULL DEFAULT 0'}
+CHANGE_FEED_INDEXES = {'idx_inventory_change_seq': 'INDEX (change_seq)'}
+
+NEXT_SEQ_SQL = "UPDATE catalog_sequence SET seq = seq + 1 WHERE id = 1"
+
+INSERT_DELETION_SQL = """
+INSERT INTO catalog_deletions (product_id, seq) VALUES (%s, %s)
+ON DUPLICATE KEY UPDATE seq = VALUES(seq)
+"""
+
+
+def _seed_sequence(cursor, table):
+    if table == 'catalog_sequence':
+        cursor.execute("INSERT IGNORE INTO catalog_sequence (id, seq) VALUES (1, 0)")
+
+
+def ensure_change_feed(main_db):
+    # DDL commits on its own: call before the writer's transaction starts, never inside it
+    return (main_db.ensure_tables(CHANGE_FEED_TABLES, seed=_seed_sequence)
+            and main_db.ensure_columns('inventory', CHANGE_FEED_COLUMNS)
+            and main_db.ensure_indexes('inventory', CHANGE_FEED_INDEXES))
+
+
+def next_seq(cursor):
+    """
+    Takes the next change number on the writer's cursor, to stamp its rows with. Call it before
+    touching any inventory row, so every writer locks the counter first (no lock-order
+    deadlocks); the counter stays locked until the caller commits or rolls back.
+    """
+    cursor.execute(NEXT_SEQ_SQL)
+    cursor.execute("SELECT seq FROM catalog_sequence WHERE id = 1")
+    return cursor.fetchone()[0]
+
+
+def record_deletions(cursor, product_ids, seq):
+    rows = [(pid, seq) for pid in product_ids]
+    if rows:
+        cursor.executemany(INSERT_DELETION_SQL, rows)
+    return len(rows)
+
+
+def current_seq(main_db):
+    """The newest committed change number (one primary key read), or None if unreachable."""
+    if not ensure_change_feed(main_db):
+        return None
+    conn = main_db.get_connection()
+    if conn and conn.is_connected():
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT seq FROM catalog_sequence WHERE id = 1")
+            row = cursor.fetchone()
+            return row[0] if row else None
+        except Error as e:
+            print(f"Error reading the catalog sequence: {e}")
+        finally:
+            conn.close()
+    return None
+
+
+def changes_since(main_db, since):
+    """
+    (changed ProductRecords, deleted product ids, cursor for the next call), or None if the
+    database can't be reached (keep the old cursor and try again). since=None only returns the
+    starting cursor: take it right before loading the catalog.
+    """
+    if not ensure_change_feed(main_db):
+        return None
+    conn = main_db.get_connection()
+    if conn and conn.is_connected():
+        try:
+            cursor = conn.cursor()
+            # Everything up to the committed counter value is committed too (see the top)
+            cursor.execute("SELECT seq FROM catalog_sequence WHERE id = 1")
+            upto = cursor.fetchone()[0]
+            if since is None or upto <= since:
+                return [], [], upto if since is None else since
+
+            cursor.execute(f"SELECT {PRODUCT_SELECT} FROM inventory WHERE change_seq > %s AND change_seq <= %s",
+                           (since, upto))
+            products = [ProductRecord.from_row(row) for row in cursor.fetchall()]
+            cursor.execute("SELECT product_id FROM catalog_deletions WHERE seq > %s AND seq <= %s",
+                           (since, upto))
+            deleted = [row[0] for row in cursor.fetchall()]
+            return products, deleted, upto
+        except Error as e:
+            print(f"Error fetching catalog changes: {e}")
+        finally:
+            conn.close()
+    return None
@@ -1,7 +1,14 @@
+import threading
+from contextlib import contextmanager
+
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector import pooling
 from models.db_cashier import CashierDB
 from models.db_manager import ManagerDB
+from models.report_cache import report_cache
+from models.unit_of_work import UnitOfWork
+from utils.terminal_config import load_terminal_config
 
 
 class DatabaseManager:
@@ -15,6 +22,12 @@ class DatabaseManager:
 
         self.cashier_db = CashierDB(self)
         self.manager_db = ManagerDB(self)
+        self._checked_columns = set()  # (table, column) already known to exist
+        self._checked_indexes = set()  # (table, index name) already known to exist
+        self._checked_tables = set()  # tables already known to exist
+        self._tables_lock = threading.Lock()  # startup maintenance thread vs first sale: seed only once
+        self._pool = None  # created on the first unit_of_work()
+        self._pool_lock = threading.Lock()
 
     def get_connection(self):
         # Centralized connection
@@ -24,18 +37,196 @@ class DatabaseManager:
             print(f"Error connecting to MySQL: {e}")
             return None
 
+    def get_pooled_connection(self):
+        """A connection from the shared pool (close() hands it back). Plain connect if the pool can't."""
+        try:
+            with self._pool_lock:
+                if self._pool is None:
+                    size = int(load_terminal_config().get('db_pool_size', 4))
+                    self._pool = pooling.MySQLConnectionPool(pool_name="pos_pool", pool_size=size, **self.config)
+            return self._pool.get_connection()
+        except Error as e:
+            # pool exhausted or not creatable: don't block the caller
+            print(f"Connection pool unavailable ({e}), connecting directly")
+            return self.get_connection()
+
+    @contextmanager
+    def unit_of_work(self, outer=None):
+        """
+        with db.unit_of_work() as work:
+            db.update_product_fields(..., uow=work)
+            work.audit(user, "Product Edit", details)
+        Everything inside commits together on one pooled connection, or rolls back together
+        (exception, or an operation called work.fail()). Check work.committed afterwards.
+        Passing `outer` joins an already open unit instead of starting a new one.
+        """
+        if outer is not None:
+            try:
+                yield outer
+            except Exception:
+                outer.fail()
+                raise
+            return
+
+        conn = self.get_pooled_connection()
+        if not conn or not conn.is_connected():
+            raise ConnectionError("Cannot reach the database")
+
+        work = UnitOfWork(conn)
+        try:
+            yield work
+            if work.rollback_only:
+                conn.rollback()
+            else:
+                conn.commit()
+                work.committed = True
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        if work.committed:
+            work.run_after_commit()
+
+    def ensure_columns(self, table, columns):
+        """
+        Adds missing columns to an existing table, e.g. ensure_columns('inventory',
+        {'image_path': 'VARCHAR(255) NULL'}). Checked once per process, so callers can
+        run it before every query.
+        """
+        missing = {name: ddl for name, ddl in columns.items() if (table, name) not in self._checked_columns}
+        if not missing:
+            return True
+
+        conn = self.get_connection()
+        if conn and conn.is_connected():
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT COLUMN_NAME FROM information_schema.COLUMNS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+                """, (table,))
+                existing = {row[0] for row in cursor.fetchall()}
+                for name, ddl in missing.items():
+                    if name not in existing:
+                        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+                    self._checked_columns.add((table, name))
+                conn.commit()
+                return True
+            except Error as e:
+                print(f"Error updating {table} columns: {e}")
+                return False
+            finally:
+                conn.close()
+        return False
+
+    def ensure_indexes(self, table, indexes):
+        """
+        Same idea for indexes: ensure_indexes('inventory', {'idx_inventory_name': 'INDEX (name)'}).
+        Building one on a big table takes a while, but only the first time.
+        """
+        missing = {name: ddl for name, ddl in indexes.items() if (table, name) not in self._checked_indexes}
+        if not missing:
+            return True
+
+        conn = self.get_connection()
+        if conn and conn.is_connected():
+            try:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+                """, (table,))
+                existing = {row[0] for row in cursor.fetchall()}
+                for name, ddl in missing.items():
+                    if name not in existing:
+                        # ddl is 'INDEX (cols)' / 'FULLTEXT INDEX (cols)': name goes after the keyword
+                        kind, _, columns = ddl.partition('(')
+                        cursor.execute(f"ALTER TABLE {table} ADD {kind.strip()} {name} ({columns}")
+                    self._checked_indexes.add((table, name))
+                return True
+            except Error as e:
+                print(f"Error adding {table} indexes: {e}")
+                return False
+            finally:
+                conn.close()
+        return False
+
+    def ensure_tables(self, tables, seed=None):
+        """
+        Creates missing tables: ensure_tables({'stock_movements': '(id BIGINT ..., ...)'}).
+        CREATE TABLE commits on its own, so seed rows can't go in with it: seed(cursor, table)
+        runs for every table (new or not) until its transaction commits, and has to check for
+        itself whether there is anything to do. Checked once per process after that, like
+        ensure_columns; a failed seed is retried on the next call.
+        """
+        if all(name in self._checked_tables for name in tables):
+            return True
+
+        with self._tables_lock:
+            missing = {name: ddl for name, ddl in tables.items() if name not in self._checked_tables}
+            if not missing:
+                return True
+
+            conn = self.get_connection()
+            if conn and conn.is_connected():
+                try:
+                    cursor = conn.cursor()
+                    cursor.execute("""
+                        SELECT TABLE_NAME FROM information_schema.TABLES
+                        WHERE TABLE_SCHEMA = DATABASE()
+                    """)
+                    existing = {row[0] for row in cursor.fetchall()}
+                    for name, ddl in missing.items():
+                        if name not in existing:
+                            cursor.execute(f"CREATE TABLE IF NOT EXISTS {name} {ddl}")
+                    if seed:
+                        for name in missing:
+                            seed(cursor, name)
+                    conn.commit()
+                    self._checked_tables.update(missing)  # only once the seed rows are in
+                    return True
+                except Error as e:
+                    print(f"Error creating tables {', '.join(missing)}: {e}")
+                    conn.rollback()
+                    return False
+                finally:
+                    conn.close()
+            return False
+
     def authenticate_user(self, username, password):
         # UPDATED: Delegate authentication to ManagerDB
         # This keeps the logic in one place (ManagerDB)
         return self.manager_db.authenticate_user(username, password)
 
+    def ensure_pin_columns(self):
+        return self.manager_db.ensure_pin_columns()
+
+    def get_pin_user(self, name, terminal_id):
+        return self.manager_db.get_pin_user(name, terminal_id)
+
+    def set_user_pin(self, user_id, pin, terminal_id):
+        return self.manager_db.set_user_pin(user_id, pin, terminal_id)
+
     # Cashier
     def get_all_products(self):
         return self.cashier_db.get_all_products()
 
-    def process_transaction(self, cart_dict, total_amount, cashier_name, payment_info=None):
+    def search_products(self, query, limit=50, offset=0):
+        return self.cashier_db.search_products(query, limit, offset)
+
+    def get_products_by_ids(self, product_ids):
+        return self.cashier_db.get_products_by_ids(product_ids)
+
+    def get_products_changed_since(self, since):
+        return self.cashier_db.get_products_changed_since(since)
+
+    def process_transaction(self, cart_dict, total_amount, cashier_name, payment_info=None, uow=None):
         # Pass the payment_info to the cashier_db
-        return self.cashier_db.process_transaction(cart_dict, total_amount, cashier_name, payment_info)
+        return self.cashier_db.process_transaction(cart_dict, total_amount, cashier_name, payment_info, uow)
+
+    def get_receipt_data(self, sale_id):
+        return self.cashier_db.get_receipt_data(sale_id)
 
     # --- Manager/Inventory
     def get_all_users(self):
@@ -44,27 +235,62 @@ class DatabaseManager:
     def add_user(self, name, pwd, role):
         return self.manager_db.add_user(name, pwd, role)
 
-    def delete_user(self, user_id):
-        return self.manager_db.delete_user(user_id)
+    def delete_user(self, user_id, deleted_by=None, uow=None):
+        return self.manager_db.delete_user(user_id, deleted_by, uow)
 
     def get_inventory_items(self):
         return self.manager_db.get_inventory_items()
 
-    def add_product(self, name, cat, stk, cost, price, thres, exp):
+    def get_catalog_snapshot(self):
+        return self.manager_db.get_catalog_snapshot()
+
+    def get_inventory_facets(self):
+        return self.manager_db.get_inventory_facets()
+
+    def add_product(self, name, cat, stk, cost, price, thres, exp, user_name=None):
         if hasattr(self.manager_db, 'add_product'):
-            return self.manager_db.add_product(name, cat, stk, cost, price, thres, exp)
+            return self.manager_db.add_product(name, cat, stk, cost, price, thres, exp, user_name)
         return False
 
-    def update_product(self, pid, name, cat, stk, cost, price, thres, exp):
+    def update_product(self, pid, name, cat, stk, cost, price, thres, exp,
+                       movement_kind='adjustment', user_name=None, note=None):
         if hasattr(self.manager_db, 'update_product'):
-            return self.manager_db.update_product(pid, name, cat, stk, cost, price, thres, exp)
+            return self.manager_db.update_product(pid, name, cat, stk, cost, price, thres, exp,
+                                                  movement_kind, user_name, note)
         return False
 
+    def update_product_fields(self, pid, expected_version, changes=None, stock_delta=0,
+                              movement_kind='adjustment', user_name=None, note=None, uow=None):
+        return self.manager_db.update_product_fields(pid, expected_version, changes, stock_delta,
+                                                     movement_kind, user_name, note, uow)
+
+    def set_product_image(self, pid, image_path):
+        return self.manager_db.set_product_image(pid, image_path)
+
+    def import_products(self, path, user_name=None, dry_run=False):
+        return self.manager_db.import_products(path, user_name, dry_run)
+
+    def preview_bulk_update(self, rule, category=None, product_ids=None):
+        return self.manager_db.preview_bulk_update(rule, category, product_ids)
+
+    def bulk_update(self, rule, category=None, product_ids=None, user_name=None, uow=None):
+        return self.manager_db.bulk_update(rule, category, product_ids, user_name, uow)
+
     def delete_product(self, pid):
         if hasattr(self.manager_db, 'delete_product'):
             return self.manager_db.delete_product(pid)
         return False
 
+    # Stock ledger (models/stock_ledger.py)
+    def get_stock_as_of(self, when, product_ids=None):
+        return self.manager_db.get_stock_as_of(when, product_ids)
+
+    def get_stock_movements(self, product_id, limit=100):
+        return self.manager_db.get_stock_movements(product_id, limit)
+
+    def run_ledger_maintenance(self):
+        return self.manager_db.run_ledger_maintenance()
+
     # Dashboard ways
     def get_dashboard_stats(self):
         return self.manager_db.get_dashboard_stats()
@@ -98,7 +324,10 @@ class DatabaseManager:
                 conn.close()
         return logs
 
-    def log_audit(self, user_name, action, details):
+    def log_audit(self, user_name, action, details, uow=None):
+        if uow is not None:
+            uow.audit(user_name, action, details)  # commits with the rest of the unit
+            return
         conn = self.get_connection()
         if conn and conn.is_connected():
             try:
@@ -106,6 +335,7 @@ class DatabaseManager:
                 query = "INSERT INTO audit_logs (user_name, action, details) VALUES (%s, %s, %s)"
                 cursor.execute(query, (user_name, action, details))
                 conn.commit()
+                report_cache.note_audit()
             except Error as e:
                 print(f"Error saving audit log: {e}")
             finally:
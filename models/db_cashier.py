@@ -1,5 +1,10 @@
 from mysql.connector import Error
-from models.entities import Product
+from models.entities import ProductRecord, PRODUCT_SELECT
+from models.report_cache import report_cache
+from models.db_manager import INVENTORY_COLUMNS
+from models.product_search import search_products
+from models import stock_ledger
+from models import change_feed
 
 
 class CashierDB:
@@ -7,96 +12,177 @@ class CashierDB:
         self.main_db = db_manager  # Access to get_connection()
 
     def get_all_products(self):
-        """Used by CASHIER: Returns Product objects."""
+        """Used by CASHIER: Returns ProductRecord objects (same type the manager side uses)."""
         products = []
+        self.main_db.ensure_columns('inventory', INVENTORY_COLUMNS)
         conn = self.main_db.get_connection()
         if conn and conn.is_connected():
             try:
-                cursor = conn.cursor(dictionary=True)
-                query = """
-                    SELECT id, name, category, cost_price, selling_price, 
-                           stock, threshold, expiry_date 
-                    FROM inventory 
-                    ORDER BY name DESC
-                """
+                cursor = conn.cursor()
+                query = f"SELECT {PRODUCT_SELECT} FROM inventory ORDER BY name DESC"
                 cursor.execute(query)
-                for row in cursor.fetchall():
-                    p = Product(
-                        id=row['id'],
-                        name=row['name'],
-                        category=row['category'],
-                        cost_price=row['cost_price'],
-                        selling_price=row['selling_price'],
-                        stock=row['stock'],
-                        threshold=row['threshold'],
-                        expiry_date=row['expiry_date']
-                    )
-                    products.append(p)
+                products = [ProductRecord.from_row(row) for row in cursor.fetchall()]
             except Error as e:
                 print(f"Error fetching products for cashier: {e}")
             finally:
                 conn.close()
         return products
 
-    def process_transaction(self, cart_dict, total_amount, cashier_name, payment_info=None):
+    def search_products(self, query, limit=50, offset=0):
+        """Server-side ranked search for terminals that can't hold the whole catalog."""
+        self.main_db.ensure_columns('inventory', INVENTORY_COLUMNS)
+        return search_products(self.main_db, query, limit, offset)
+
+    def get_products_by_ids(self, product_ids):
+        """Fresh rows for just these products (catalog delta after a sale, instead of a full reload)."""
+        product_ids = list(product_ids)
+        if not product_ids:
+            return []
+        products = []
+        conn = self.main_db.get_connection()
+        if conn and conn.is_connected():
+            try:
+                cursor = conn.cursor()
+                placeholders = ", ".join(["%s"] * len(product_ids))
+                cursor.execute(f"SELECT {PRODUCT_SELECT} FROM inventory WHERE id IN ({placeholders})", product_ids)
+                products = [ProductRecord.from_row(row) for row in cursor.fetchall()]
+            except Error as e:
+                print(f"Error fetching changed products: {e}")
+            finally:
+                conn.close()
+        return products
+
+    def get_products_changed_since(self, since):
+        """
+        Catalog delta for an open till: (changed products, deleted ids, cursor for the next call),
+        or None when the database can't be reached (keep the old cursor, try again later).
+        Call with since=None once, right before loading the catalog, to get the starting cursor.
+        Works on change numbers, not timestamps (models/change_feed.py), so a long transaction
+        committing late is still picked up. A product coming back twice is fine.
+        """
+        self.main_db.ensure_columns('inventory', INVENTORY_COLUMNS)
+        return change_feed.changes_since(self.main_db, since)
+
+    def process_transaction(self, cart_dict, total_amount, cashier_name, payment_info=None, uow=None):
         """
         Saves the sale AND the payment details (Method, Tendered, Change).
+        Returns the new sale id on success, False otherwise.
+        Runs in its own unit of work, or joins `uow` (then the caller's commit decides).
         """
-        conn = self.main_db.get_connection()
-        if not conn or not conn.is_connected():
-            return False
+        stock_ledger.ensure_ledger(self.main_db)  # DDL can't run inside the sale transaction
+        change_feed.ensure_change_feed(self.main_db)
 
         try:
-            conn.start_transaction()
-            cursor = conn.cursor()
-
-            # 1. Prepare Payment Data
-            p_method = 'Cash'
-            p_tendered = 0.0
-            p_change = 0.0
-            p_ref = None
-
-            if payment_info:
-                p_method = payment_info.get('method', 'Cash')
-                p_tendered = payment_info.get('tendered', 0.0)
-                p_change = payment_info.get('change', 0.0)
-                p_ref = payment_info.get('reference', None)
-
-            # 2. Insert into sales (UPDATED with new columns)
-            items_count = sum(cart_dict.values())
-            insert_sale = """
-                INSERT INTO sales 
-                (total_amount, items_count, cashier_name, sale_timestamp, 
-                 payment_method, amount_tendered, change_amount, reference_number)
-                VALUES (%s, %s, %s, NOW(), %s, %s, %s, %s)
-            """
-            cursor.execute(insert_sale, (total_amount, items_count, cashier_name,
-                                         p_method, p_tendered, p_change, p_ref))
-            sale_id = cursor.lastrowid
-
-            # 3. Insert items and update stock
-            for pid, qty in cart_dict.items():
-                # Get current price to lock it in history
-                cursor.execute("SELECT selling_price FROM inventory WHERE id = %s", (pid,))
-                res = cursor.fetchone()
-                price = res[0] if res else 0.0
-
-                insert_item = """
-                    INSERT INTO sale_items (sale_id, product_id, quantity, price)
-                    VALUES (%s, %s, %s, %s)
+            with self.main_db.unit_of_work(uow) as work:
+                cursor = work.cursor
+                # change number first: the counter is always locked before inventory rows
+                seq = change_feed.next_seq(cursor)
+
+                # 1. Prepare Payment Data
+                p_method = 'Cash'
+                p_tendered = 0.0
+                p_change = 0.0
+                p_ref = None
+
+                if payment_info:
+                    p_method = payment_info.get('method', 'Cash')
+                    p_tendered = payment_info.get('tendered', 0.0)
+                    p_change = payment_info.get('change', 0.0)
+                    p_ref = payment_info.get('reference', None)
+
+                # 2. Insert into sales (UPDATED with new columns)
+                items_count = sum(cart_dict.values())
+                insert_sale = """
+                    INSERT INTO sales 
+                    (total_amount, items_count, cashier_name, sale_timestamp, 
+                     payment_method, amount_tendered, change_amount, reference_number)
+                    VALUES (%s, %s, %s, NOW(), %s, %s, %s, %s)
                 """
-                cursor.execute(insert_item, (sale_id, pid, qty, price))
+                cursor.execute(insert_sale, (total_amount, items_count, cashier_name,
+                                             p_method, p_tendered, p_change, p_ref))
+                sale_id = cursor.lastrowid
 
-                # Deduct Stock
-                update_stock = "UPDATE inventory SET stock = stock - %s WHERE id = %s"
-                cursor.execute(update_stock, (qty, pid))
+                # 3. Insert items and update stock
+                for pid, qty in cart_dict.items():
+                    # Get current price to lock it in history
+                    cursor.execute("SELECT selling_price FROM inventory WHERE id = %s", (pid,))
+                    res = cursor.fetchone()
+                    price = res[0] if res else 0.0
 
-            conn.commit()
-            return True
+                    insert_item = """
+                        INSERT INTO sale_items (sale_id, product_id, quantity, price)
+                        VALUES (%s, %s, %s, %s)
+                    """
+                    cursor.execute(insert_item, (sale_id, pid, qty, price))
+
+                    # Deduct Stock
+                    update_stock = "UPDATE inventory SET stock = stock - %s, change_seq = %s WHERE id = %s"
+                    cursor.execute(update_stock, (qty, seq, pid))
+
+                # 4. Same quantities into the stock ledger, committed with the sale
+                stock_ledger.record_movements(cursor, [(pid, stock_ledger.SALE, -qty) for pid, qty in cart_dict.items()],
+                                              ref=f"sale #{sale_id}", user_name=cashier_name)
+                work.on_commit(report_cache.note_sale)
+
+            if uow is None and not work.committed:
+                return False
+            return sale_id
 
         except Exception as e:
             print(f"Transaction Failed: {e}")
-            conn.rollback()
             return False
+
+    def get_receipt_data(self, sale_id):
+        """
+        Rebuilds the receipt dict (same shape ReceiptManager takes) for a past sale
+        from sales + sale_items, so reprints don't need an archived PDF.
+        """
+        conn = self.main_db.get_connection()
+        if not conn or not conn.is_connected():
+            return None
+
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT id, total_amount, cashier_name, sale_timestamp,
+                       payment_method, amount_tendered, change_amount, reference_number
+                FROM sales
+                WHERE id = %s
+            """, (sale_id,))
+            sale = cursor.fetchone()
+            if not sale:
+                return None
+
+            cursor.execute("""
+                SELECT COALESCE(i.name, CONCAT('Item #', si.product_id)) AS name,
+                       si.quantity, si.price
+                FROM sale_items si
+                LEFT JOIN inventory i ON si.product_id = i.id
+                WHERE si.sale_id = %s
+            """, (sale_id,))
+            items = [{'name': row['name'], 'qty': int(row['quantity']), 'price': float(row['price'])}
+                     for row in cursor.fetchall()]
+
+            # Same math as the checkout: total = subtotal + 12% VAT
+            total = float(sale['total_amount'])
+            subtotal = total / 1.12
+            return {
+                'sale_id': sale['id'],
+                'cashier': sale['cashier_name'],
+                'items': items,
+                'subtotal': subtotal,
+                'vat': total - subtotal,
+                'total': total,
+                'payment': {
+                    'method': sale['payment_method'] or 'Cash',
+                    'tendered': float(sale['amount_tendered'] or 0),
+                    'change': float(sale['change_amount'] or 0),
+                    'reference': sale['reference_number'],
+                },
+                'date': sale['sale_timestamp'],
+            }
+        except Error as e:
+            print(f"Error loading sale {sale_id} for reprint: {e}")
+            return None
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
@@ -1,6 +1,82 @@
 from mysql.connector import Error
-from models.entities import User, InventoryItem, DashboardStats
-from models.user_model import UserModel  # Added for password hashing
+from models.entities import User, DashboardStats, ProductRecord, PRODUCT_SELECT
+from models.user_model import UserModel, PIN_ITERATIONS  # Added for password hashing
+from models.report_cache import report_cache
+from models.catalog import CatalogSnapshot, STATUS_LOW
+from models.product_search import search_products
+from models import stock_ledger
+from models import change_feed
+from models.product_import import import_products
+from models import bulk_pricing
+from utils.terminal_config import load_terminal_config
+
+# Report queries, shared by the get_*_data methods and the streaming exporters
+SALES_REPORT_SQL = """
+SELECT 
+    id as invoice_id,
+    sale_timestamp as date,
+    cashier_name as cashier,
+    items_count,
+    total_amount,
+    payment_method,
+    reference_number
+FROM sales 
+WHERE DATE(sale_timestamp) BETWEEN %s AND %s
+ORDER BY sale_timestamp DESC
+"""
+
+VALUATION_SQL = """
+SELECT 
+    id, name, category, stock, cost_price, selling_price,
+    (stock * selling_price) as total_value
+FROM inventory
+ORDER BY category, name
+"""
+
+LOW_STOCK_SQL = """
+SELECT id, name, category, stock, threshold
+FROM inventory
+WHERE stock <= threshold
+ORDER BY stock ASC
+"""
+
+AUDIT_LOG_SQL = """
+SELECT timestamp, user_name, action, details
+FROM audit_logs
+WHERE DATE(timestamp) BETWEEN %s AND %s
+ORDER BY timestamp DESC
+"""
+
+# Columns added after the original schema (see DatabaseManager.ensure_columns)
+PIN_COLUMNS = {'pin_hash': 'VARCHAR(160) NULL', 'pin_terminal': 'VARCHAR(64) NULL'}
+IMAGE_COLUMNS = {'image_path': 'VARCHAR(255) NULL'}
+VERSION_COLUMNS = {'version': 'INT NOT NULL DEFAULT 0'}
+INVENTORY_COLUMNS = {**IMAGE_COLUMNS, **VERSION_COLUMNS}  # everything PRODUCT_SELECT needs
+
+# Product details update_product_fields() may change. Stock isn't one: it only moves by
+# deltas (sales, removals), which don't need the version check and don't bump it.
+EDITABLE_PRODUCT_FIELDS = ('name', 'category', 'cost_price', 'selling_price', 'threshold',
+                           'expiry_date', 'image_path')
+
+# Counts per category x stock status in one pass. ROLLUP adds a subtotal row per category
+# (status NULL) and a grand total (both NULL); COALESCE keeps a real NULL category apart.
+INVENTORY_FACETS_SQL = """
+SELECT
+    COALESCE(category, '') AS category,
+    CASE WHEN stock = 0 THEN 'out' WHEN stock <= threshold THEN 'low' ELSE 'ok' END AS status,
+    COUNT(*) AS cnt,
+    COALESCE(SUM(stock * selling_price), 0) AS value
+FROM inventory
+GROUP BY COALESCE(category, ''), status WITH ROLLUP
+"""
+
+# name -> (sql, takes a date range)
+EXPORT_QUERIES = {
+    'sales': (SALES_REPORT_SQL, True),
+    'valuation': (VALUATION_SQL, False),
+    'low_stock': (LOW_STOCK_SQL, False),
+    'audit': (AUDIT_LOG_SQL, True),
+}
 
 
 # Manager's side DB
@@ -41,6 +117,52 @@ class ManagerDB:
 
         return user_obj
 
+    def ensure_pin_columns(self):
+        """Adds users.pin_hash / users.pin_terminal on first use (older databases don't have them)."""
+        return self.main_db.ensure_columns('users', PIN_COLUMNS)
+
+    def get_pin_user(self, name, terminal_id):
+        """
+        The current row of one PIN cashier on this terminal ({id, name, role, pin_hash}), or None.
+        Read fresh on every PIN attempt so a revoked/changed PIN or a deleted account stops working at once.
+        """
+        conn = self.main_db.get_connection()
+        if conn and conn.is_connected():
+            try:
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute("""
+                    SELECT id, name, role, pin_hash FROM users
+                    WHERE name = %s AND role = 'Cashier' AND pin_hash IS NOT NULL AND pin_terminal = %s
+                """, (name, terminal_id))
+                rows = cursor.fetchall()
+                return rows[0] if len(rows) == 1 else None  # ambiguous name: no PIN shortcut
+            except Error as e:
+                print(f"Error fetching PIN user: {e}")
+            finally:
+                conn.close()
+        return None
+
+    def set_user_pin(self, user_id, pin, terminal_id):
+        """Sets (or clears, with pin=None) a cashier's quick-unlock PIN for one terminal."""
+        if not self.ensure_pin_columns():
+            return False
+        iterations = int(load_terminal_config().get('pin_iterations', PIN_ITERATIONS))
+        pin_hash = UserModel.hash_pin(pin, iterations) if pin else None
+        conn = self.main_db.get_connection()
+        if conn and conn.is_connected():
+            try:
+                cursor = conn.cursor()
+                cursor.execute("UPDATE users SET pin_hash = %s, pin_terminal = %s WHERE id = %s",
+                               (pin_hash, terminal_id if pin else None, user_id))
+                conn.commit()
+                return cursor.rowcount > 0
+            except Error as e:
+                print(f"Error setting PIN: {e}")
+                return False
+            finally:
+                conn.close()
+        return False
+
     def get_all_users(self):
         users = []
         conn = self.main_db.get_connection()
@@ -77,52 +199,43 @@ class ManagerDB:
                 conn.close()
         return False
 
-    def delete_user(self, user_id):
-        conn = self.main_db.get_connection()
-        if conn and conn.is_connected():
-            try:
-                cursor = conn.cursor()
-                # prevent deleting last manager's profile
-                cursor.execute("SELECT role FROM users WHERE id = %s", (user_id,))
+    def delete_user(self, user_id, deleted_by=None, uow=None):
+        """Deletes a user (never the last Manager). With deleted_by, the audit entry commits with it."""
+        try:
+            with self.main_db.unit_of_work(uow) as work:
+                cursor = work.cursor
+                # prevent deleting last manager's profile (locked, so two deletes can't both pass)
+                cursor.execute("SELECT name, role FROM users WHERE id = %s FOR UPDATE", (user_id,))
                 row = cursor.fetchone()
-                if row and row[0] == 'Manager':
-                    cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'Manager'")
+                if not row:
+                    return False
+                if row[1] == 'Manager':
+                    cursor.execute("SELECT COUNT(*) FROM users WHERE role = 'Manager' FOR UPDATE")
                     manager_count = cursor.fetchone()[0]
                     if manager_count <= 1:
                         print("Cannot delete the last Manager account.")
                         return False
 
                 cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
-                conn.commit()
-                return True
-            except Error as e:
-                print(f"cant delete user: {e}")
-                return False
-            finally:
-                conn.close()
-        return False
+                if deleted_by:
+                    work.audit(deleted_by, "User Deleted", f"Deleted {row[1]} account: {row[0]}")
+            return uow is not None or work.committed
+        except Exception as e:
+            print(f"cant delete user: {e}")
+            return False
 
     # --- INVENTORY MANAGEMENT ---
     def get_inventory_items(self):
         items = []
+        self.main_db.ensure_columns('inventory', INVENTORY_COLUMNS)
         conn = self.main_db.get_connection()
         if conn and conn.is_connected():
             try:
-                cursor = conn.cursor(dictionary=True)
-                query = "SELECT * FROM inventory ORDER BY id DESC"
+                # plain tuple cursor: rows go straight into ProductRecord, no dict per row
+                cursor = conn.cursor()
+                query = f"SELECT {PRODUCT_SELECT} FROM inventory ORDER BY id DESC"
                 cursor.execute(query)
-                for row in cursor.fetchall():
-                    item = InventoryItem(
-                        id=row['id'],
-                        name=row['name'],
-                        category=row['category'],
-                        stock=row['stock'],
-                        cost_price=row['cost_price'],
-                        selling_price=row['selling_price'],
-                        threshold=row['threshold'],
-                        expiry_date=row['expiry_date']
-                    )
-                    items.append(item)
+                items = [ProductRecord.from_row(row) for row in cursor.fetchall()]
             except Error as e:
                 print(f"Error fetching inventory: {e}")
             finally:
@@ -132,16 +245,17 @@ class ManagerDB:
     def get_expiring_products_in_stock(self, days_threshold=30):
         # get items that have more than 1 stock and are expiring
         items = []
+        self.main_db.ensure_columns('inventory', INVENTORY_COLUMNS)
         conn = self.main_db.get_connection()
         if conn and conn.is_connected():
             try:
-                cursor = conn.cursor(dictionary=True)
+                cursor = conn.cursor()
                 # explanation oh
                 # 1. stock > 0: Only available items (Perishables view Requirement)
                 # 2. expiry_date IS NOT NULL: Must have an expiry
                 # 3. expiry_date <= ...: Date is today or in the past (expired) OR within next 30 days
-                query = """
-                        SELECT * \
+                query = f"""
+                        SELECT {PRODUCT_SELECT}
                         FROM inventory
                         WHERE stock > 0
                           AND expiry_date IS NOT NULL
@@ -149,51 +263,61 @@ class ManagerDB:
                         ORDER BY expiry_date ASC
                         """
                 cursor.execute(query, (days_threshold,))
-
-                for row in cursor.fetchall():
-                    item = InventoryItem(
-                        id=row['id'],
-                        name=row['name'],
-                        category=row['category'],
-                        stock=row['stock'],
-                        cost_price=row['cost_price'],
-                        selling_price=row['selling_price'],
-                        threshold=row['threshold'],
-                        expiry_date=row['expiry_date']
-                    )
-                    items.append(item)
+                items = [ProductRecord.from_row(row) for row in cursor.fetchall()]
             except Error as e:
                 print(f"Error fetching perishables: {e}")
             finally:
                 conn.close()
         return items
 
-    def add_product(self, name, category, stock, cost, price, threshold, expiry):
+    def add_product(self, name, category, stock, cost, price, threshold, expiry, user_name=None):
+        stock_ledger.ensure_ledger(self.main_db)
+        change_feed.ensure_change_feed(self.main_db)
         conn = self.main_db.get_connection()
         if conn and conn.is_connected():
             try:
                 cursor = conn.cursor()
+                seq = change_feed.next_seq(cursor)
                 query = """
                         INSERT INTO inventory
-                        (name, category, stock, cost_price, selling_price, threshold, expiry_date)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s) \
+                        (name, category, stock, cost_price, selling_price, threshold, expiry_date, change_seq)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s) \
                         """
                 if expiry == "": expiry = None
-                cursor.execute(query, (name, category, stock, cost, price, threshold, expiry))
+                cursor.execute(query, (name, category, stock, cost, price, threshold, expiry, seq))
+                # opening stock goes into the ledger as a receipt
+                stock_ledger.record_movements(cursor, [(cursor.lastrowid, stock_ledger.RECEIPT, int(stock))],
+                                              ref="new product", user_name=user_name)
                 conn.commit()
+                report_cache.note_product_change()
                 return True
             except Error as e:
                 print(f"Error adding product: {e}")
+                conn.rollback()
                 return False
             finally:
                 conn.close()
         return False
 
-    def update_product(self, pid, name, category, stock, cost, price, threshold, expiry):
+    def update_product(self, pid, name, category, stock, cost, price, threshold, expiry,
+                       movement_kind=stock_ledger.ADJUSTMENT, user_name=None, note=None):
+        """
+        Saves the product. A stock change is also appended to the ledger as the difference
+        from the current row (movement_kind 'shrinkage' for removals with a reason).
+        """
+        self.main_db.ensure_columns('inventory', INVENTORY_COLUMNS)
+        stock_ledger.ensure_ledger(self.main_db)
+        change_feed.ensure_change_feed(self.main_db)
         conn = self.main_db.get_connection()
         if conn and conn.is_connected():
             try:
                 cursor = conn.cursor()
+                seq = change_feed.next_seq(cursor)
+                # lock the row so a sale in between can't make the delta wrong
+                cursor.execute("SELECT stock FROM inventory WHERE id = %s FOR UPDATE", (pid,))
+                res = cursor.fetchone()
+                old_stock = int(res[0]) if res and res[0] is not None else 0
+
                 query = """
                         UPDATE inventory
                         SET name=%s, \
@@ -202,55 +326,246 @@ class ManagerDB:
                             cost_price=%s,
                             selling_price=%s, \
                             threshold=%s, \
-                            expiry_date=%s
+                            expiry_date=%s, \
+                            version=version + 1, \
+                            change_seq=%s
                         WHERE id = %s \
                         """
                 if expiry == "": expiry = None
-                cursor.execute(query, (name, category, stock, cost, price, threshold, expiry, pid))
+                cursor.execute(query, (name, category, stock, cost, price, threshold, expiry, seq, pid))
+                if res:
+                    stock_ledger.record_movements(cursor, [(pid, movement_kind, int(stock) - old_stock)],
+                                                  ref="product edit", user_name=user_name, note=note)
                 conn.commit()
+                report_cache.note_product_change()
                 return True
             except Error as e:
                 print(f"Error updating product: {e}")
+                conn.rollback()
+                return False
+            finally:
+                conn.close()
+        return False
+
+    def update_product_fields(self, pid, expected_version, changes=None, stock_delta=0,
+                              movement_kind=stock_ledger.ADJUSTMENT, user_name=None, note=None, uow=None):
+        """
+        Partial product update: writes only the fields in `changes` (EDITABLE_PRODUCT_FIELDS)
+        and moves stock by `stock_delta` (negative = removal) instead of overwriting it, so
+        sales made meanwhile are kept. Field changes only go through if the row is still at
+        expected_version (the ProductRecord's version when the edit started).
+        Returns (status, ProductRecord or None), status in 'ok', 'conflict' (edited by someone
+        else), 'not_enough_stock', 'missing' (deleted) or 'error'. The record is the current
+        row, so the caller can show it and retry. Joins `uow` when given.
+        """
+        changes = {k: v for k, v in (changes or {}).items() if k in EDITABLE_PRODUCT_FIELDS}
+        if 'expiry_date' in changes and changes['expiry_date'] == "":
+            changes['expiry_date'] = None
+
+        self.main_db.ensure_columns('inventory', INVENTORY_COLUMNS)
+        stock_ledger.ensure_ledger(self.main_db)
+        change_feed.ensure_change_feed(self.main_db)
+        try:
+            with self.main_db.unit_of_work(uow) as work:
+                cursor = work.cursor
+                status = 'ok'
+                if changes or stock_delta:
+                    sets = [f"{field} = %s" for field in changes] + ["change_seq = %s"]
+                    params = list(changes.values()) + [change_feed.next_seq(cursor)]
+                    where = ["id = %s"]
+                    where_params = [pid]
+                    if changes:
+                        sets.append("version = version + 1")
+                        where.append("version = %s")
+                        where_params.append(expected_version)
+                    if stock_delta:
+                        sets.append("stock = stock + %s")
+                        params.append(stock_delta)
+                        where.append("stock + %s >= 0")
+                        where_params.append(stock_delta)
+
+                    cursor.execute(f"UPDATE inventory SET {', '.join(sets)} WHERE {' AND '.join(where)}",
+                                   params + where_params)
+                    if cursor.rowcount == 0:
+                        status = None  # nothing written, find out why below
+                    else:
+                        stock_ledger.record_movements(cursor, [(pid, movement_kind, stock_delta)],
+                                                      ref="product edit", user_name=user_name, note=note)
+                        work.on_commit(report_cache.note_product_change)
+
+                cursor.execute(f"SELECT {PRODUCT_SELECT} FROM inventory WHERE id = %s", (pid,))
+                row = cursor.fetchone()
+                current = ProductRecord.from_row(row) if row else None
+                if status is None:
+                    if current is None:
+                        status = 'missing'
+                    elif changes and current.version != expected_version:
+                        status = 'conflict'
+                    else:
+                        status = 'not_enough_stock'
+            if uow is None and not work.committed:
+                return 'error', current
+            return status, current
+        except Exception as e:
+            print(f"Error updating product fields: {e}")
+            return 'error', None
+
+    def set_product_image(self, pid, image_path):
+        """Points a product at an image file (None to remove it). Thumbnails are made on demand."""
+        self.main_db.ensure_columns('inventory', INVENTORY_COLUMNS)
+        change_feed.ensure_change_feed(self.main_db)
+        conn = self.main_db.get_connection()
+        if conn and conn.is_connected():
+            try:
+                cursor = conn.cursor()
+                seq = change_feed.next_seq(cursor)
+                cursor.execute("UPDATE inventory SET image_path = %s, version = version + 1, change_seq = %s "
+                               "WHERE id = %s", (image_path or None, seq, pid))
+                conn.commit()
+                report_cache.note_product_change()
+                return True
+            except Error as e:
+                print(f"Error setting product image: {e}")
+                conn.rollback()
                 return False
             finally:
                 conn.close()
         return False
 
     def delete_product(self, pid):
+        change_feed.ensure_change_feed(self.main_db)
         conn = self.main_db.get_connection()
         if conn and conn.is_connected():
             try:
                 cursor = conn.cursor()
+                seq = change_feed.next_seq(cursor)
                 cursor.execute("DELETE FROM inventory WHERE id=%s", (pid,))
+                if cursor.rowcount:
+                    change_feed.record_deletions(cursor, [pid], seq)  # open tills drop it on their next poll
                 conn.commit()
+                report_cache.note_product_change()
                 return True
             except Error as e:
                 print(f"Error deleting product: {e}")
+                conn.rollback()
                 return False
             finally:
                 conn.close()
         return False
 
+    def import_products(self, path, user_name=None, dry_run=False):
+        """Bulk CSV/XLSX import (models/product_import.py). Returns an ImportReport."""
+        self.main_db.ensure_columns('inventory', INVENTORY_COLUMNS)
+        return import_products(self.main_db, path, user_name, dry_run)
+
+    def ensure_change_feed(self):
+        return change_feed.ensure_change_feed(self.main_db)
+
+    def preview_bulk_update(self, rule, category=None, product_ids=None):
+        """What bulk_update(rule, ...) would change, from the cached catalog snapshot (models/bulk_pricing.py)."""
+        return bulk_pricing.preview(self.get_catalog_snapshot(), rule, category, product_ids)
+
+    def bulk_update(self, rule, category=None, product_ids=None, user_name=None, uow=None):
+        """
+        Applies a PriceRule to a category or id list in one UPDATE + one audit entry. For the
+        inventory filters, pass the ids of a snapshot selection, e.g.
+        [r.id for r in catalog.select(catalog.status_mask(STATUS_LOW))].
+        Open tills pick the changed rows up from the change feed. Returns the number changed.
+        """
+        self.main_db.ensure_columns('inventory', INVENTORY_COLUMNS)
+        self.ensure_change_feed()
+        return bulk_pricing.apply(self.main_db, rule, category, product_ids, user_name, uow)
+
+    # --- Stock ledger (models/stock_ledger.py) ---
+
+    def get_stock_as_of(self, when, product_ids=None):
+        """{product_id: stock} at a past date/datetime, None where the ledger doesn't reach back."""
+        return stock_ledger.stock_as_of(self.main_db, when, product_ids)
+
+    def get_stock_movements(self, product_id, limit=100):
+        return stock_ledger.get_movements(self.main_db, product_id, limit)
+
+    def run_ledger_maintenance(self):
+        """Checkpoint + compaction, on the schedule set in terminal.json."""
+        config = load_terminal_config()
+        return stock_ledger.run_maintenance(self.main_db,
+                                            checkpoint_hours=float(config.get('ledger_checkpoint_hours', 24)),
+                                            keep_days=int(config.get('ledger_keep_days', 90)))
+
+    def search_products(self, query, limit=50, offset=0):
+        """Ranked, paginated inventory search in MySQL (FULLTEXT, prefix match for short queries)."""
+        self.main_db.ensure_columns('inventory', INVENTORY_COLUMNS)
+        return search_products(self.main_db, query, limit, offset)
+
     def get_all_categories(self):
-        # Get unique category
-        categories = []
+        # Get unique category (from the cached facet counts, no separate DISTINCT query)
+        return sorted(name for name in self.get_inventory_facets()['categories'] if name)
+
+    def get_inventory_facets(self):
+        """
+        Counts per stock status and per category, plus total stock value, from one grouped query:
+        {'version', 'total': {'count', 'value'}, 'status': {'ok', 'low', 'out'},
+         'categories': {name: {'count', 'value', 'ok', 'low', 'out'}}}
+        Cached until the catalog version moves, here or on another terminal (catalog_version()).
+        """
+        version = self.catalog_version()
+        key = ('facets', None, None)
+        cached = report_cache.get(key)
+        if cached is not None and (cached['version'] == version or version[0] is None):
+            return cached  # unchanged, or the DB is unreachable
+
+        facets = {'version': version, 'total': {'count': 0, 'value': 0.0},
+                  'status': {'ok': 0, 'low': 0, 'out': 0}, 'categories': {}}
         conn = self.main_db.get_connection()
         if conn and conn.is_connected():
             try:
                 cursor = conn.cursor()
-                # distinct selects only unique values
-                cursor.execute("SELECT DISTINCT category FROM inventory ORDER BY category ASC")
-                for row in cursor.fetchall():
-                    if row[0]:  # Ensure not None/Empty
-                        categories.append(row[0])
-            except Exception as e:
-                print(f"Error fetching categories: {e}")
+                cursor.execute(INVENTORY_FACETS_SQL)
+                for category, status, count, value in cursor.fetchall():
+                    count, value = int(count), float(value)
+                    if category is None:
+                        facets['total'] = {'count': count, 'value': value}  # grand total row
+                        continue
+                    entry = facets['categories'].setdefault(
+                        category, {'count': 0, 'value': 0.0, 'ok': 0, 'low': 0, 'out': 0})
+                    if status is None:
+                        entry['count'], entry['value'] = count, value  # category subtotal row
+                    else:
+                        entry[status] = count
+                        facets['status'][status] += count
+                report_cache.put(key, facets, ('inventory',))
+            except Error as e:
+                print(f"Error fetching inventory facets: {e}")
             finally:
                 conn.close()
-        return categories
+        return facets
 
     # --- ANALYTICS & REPORTS ---
 
+    def catalog_version(self):
+        """
+        What cached catalog data is checked against: the committed change number (every
+        terminal's product writes and sales bump it, models/change_feed.py) plus this process's
+        'inventory' generation. One primary key read. The first part is None if the DB is unreachable.
+        """
+        return change_feed.current_seq(self.main_db), report_cache.generation('inventory')
+
+    def get_catalog_snapshot(self):
+        """
+        Columnar inventory snapshot (models/catalog.py), cached until the catalog version moves,
+        here or on another terminal.
+        """
+        version = self.catalog_version()
+        key = ('catalog', None, None)
+        cached = report_cache.get(key)
+        if cached is not None and (cached.version == version or version[0] is None):
+            return cached  # unchanged, or the DB is unreachable: the last snapshot beats an empty one
+
+        catalog = CatalogSnapshot(self.get_inventory_items())
+        catalog.version = version
+        report_cache.put(key, catalog, ('inventory',))
+        return catalog
+
     def get_dashboard_stats(self):
         conn = self.main_db.get_connection()
         stats = DashboardStats(0, 0, 0)
@@ -264,23 +579,10 @@ class ManagerDB:
                 res_rev = cursor.fetchone()
                 revenue = res_rev['rev'] if res_rev and res_rev['rev'] else 0.0
 
-                # Low Stock (Ignore 0 stock)
-                cursor.execute("""
-                    SELECT COUNT(*) as cnt 
-                    FROM inventory 
-                    WHERE stock <= threshold 
-                    AND stock > 0
-                """)
-                low_stock = cursor.fetchone()['cnt']
-
-                # Expiring Soon (Ignore 0 stock)
-                cursor.execute("""
-                               SELECT COUNT(*) as cnt
-                               FROM inventory
-                               WHERE expiry_date <= DATE_ADD(CURDATE(), INTERVAL 30 DAY)
-                                 AND stock > 0
-                               """)
-                expiring = cursor.fetchone()['cnt']
+                # Low Stock / Expiring Soon (Ignore 0 stock): counted on the cached catalog, no extra queries
+                catalog = self.get_catalog_snapshot()
+                low_stock = catalog.count(catalog.status_mask(STATUS_LOW))
+                expiring = catalog.count(catalog.expiring_mask(days=30))
 
                 stats = DashboardStats(revenue, low_stock, expiring)
             except Error as e:
@@ -339,27 +641,20 @@ class ManagerDB:
 
     def get_sales_report_data(self, start_date, end_date):
         # UPDATED: Added payment_method and reference_number
+        key = ('sales', start_date, end_date)
+        cached = report_cache.get(key)
+        if cached is not None:
+            return cached
+
         data = []
         conn = self.main_db.get_connection()
         if conn and conn.is_connected():
             try:
                 cursor = conn.cursor(dictionary=True)
-                query = """
-                SELECT 
-                    id as invoice_id,
-                    sale_timestamp as date,
-                    cashier_name as cashier,
-                    items_count,
-                    total_amount,
-                    payment_method,
-                    reference_number
-                FROM sales 
-                WHERE DATE(sale_timestamp) BETWEEN %s AND %s
-                ORDER BY sale_timestamp DESC
-                """
-                cursor.execute(query, (start_date, end_date))
+                cursor.execute(SALES_REPORT_SQL, (start_date, end_date))
                 data = cursor.fetchall()
                 cursor.close()
+                report_cache.put(key, data, ('sales',), start_date, end_date)
             except Error as e:
                 print(f"Error fetching sales report: {e}")
             finally:
@@ -368,21 +663,20 @@ class ManagerDB:
 
     def get_inventory_valuation_data(self):
         # calculate total value sa stock
+        key = ('valuation', None, None)
+        cached = report_cache.get(key)
+        if cached is not None:
+            return cached
+
         data = []
         conn = self.main_db.get_connection()
         if conn and conn.is_connected():
             try:
                 cursor = conn.cursor(dictionary=True)
-                query = """
-                SELECT 
-                    id, name, category, stock, cost_price, selling_price,
-                    (stock * selling_price) as total_value
-                FROM inventory
-                ORDER BY category, name
-                """
-                cursor.execute(query)
+                cursor.execute(VALUATION_SQL)
                 data = cursor.fetchall()
                 cursor.close()
+                report_cache.put(key, data, ('inventory',))
             except Error as e:
                 print(f"cant grab inventory valuations: {e}")
             finally:
@@ -391,20 +685,20 @@ class ManagerDB:
 
     def get_low_stock_data(self):
         # get items below threshold (always <=10)
+        key = ('low_stock', None, None)
+        cached = report_cache.get(key)
+        if cached is not None:
+            return cached
+
         data = []
         conn = self.main_db.get_connection()
         if conn and conn.is_connected():
             try:
                 cursor = conn.cursor(dictionary=True)
-                query = """
-                SELECT id, name, category, stock, threshold
-                FROM inventory
-                WHERE stock <= threshold
-                ORDER BY stock ASC
-                """
-                cursor.execute(query)
+                cursor.execute(LOW_STOCK_SQL)
                 data = cursor.fetchall()
                 cursor.close()
+                report_cache.put(key, data, ('inventory',))
             except Error as e:
                 print(f"Ecant grab low stocks: {e}")
             finally:
@@ -412,22 +706,53 @@ class ManagerDB:
         return data
 
     def get_audit_log_data(self, start_date, end_date):
+        key = ('audit', start_date, end_date)
+        cached = report_cache.get(key)
+        if cached is not None:
+            return cached
+
         data = []
         conn = self.main_db.get_connection()
         if conn and conn.is_connected():
             try:
                 cursor = conn.cursor(dictionary=True)
-                query = """
-                SELECT timestamp, user_name, action, details
-                FROM audit_logs
-                WHERE DATE(timestamp) BETWEEN %s AND %s
-                ORDER BY timestamp DESC
-                """
-                cursor.execute(query, (start_date, end_date))
+                cursor.execute(AUDIT_LOG_SQL, (start_date, end_date))
                 data = cursor.fetchall()
                 cursor.close()
+                report_cache.put(key, data, ('audit',), start_date, end_date)
             except Error as e:
                 print(f"Error fetching audit logs: {e}")
             finally:
                 conn.close()
-        return data
\ No newline at end of file
+        return data
+
+    def stream_report_rows(self, report, start_date=None, end_date=None, batch_size=1000):
+        """
+        Yields the column names, then one tuple per row, straight off an unbuffered cursor.
+        Used by the CSV/XLSX exporters so memory stays flat no matter how many rows there are.
+        :param report: one of EXPORT_QUERIES ('sales', 'valuation', 'low_stock', 'audit')
+        """
+        sql, dated = EXPORT_QUERIES[report]
+        conn = self.main_db.get_connection()
+        if not conn or not conn.is_connected():
+            raise ConnectionError("Cannot reach the database")
+
+        cursor = None
+        try:
+            cursor = conn.cursor(buffered=False)
+            cursor.execute(sql, (start_date, end_date) if dated else ())
+            yield [col[0] for col in cursor.description]
+
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+        finally:
+            # an abandoned unbuffered cursor still has unread rows, don't let that mask the real error
+            try:
+                if cursor: cursor.close()
+            except Error:
+                pass
+            conn.close()
@@ -4,9 +4,19 @@ class User:
         self.name = name
         self.role = role
 
-class InventoryItem:
-    # Used by Inventory Controller
-    def __init__(self, id, name, category, stock, cost_price, selling_price, threshold, expiry_date=None):
+# Column order of a product row, shared by the SELECTs and ProductRecord.from_row
+PRODUCT_COLUMNS = ('id', 'name', 'category', 'stock', 'cost_price', 'selling_price',
+                   'threshold', 'expiry_date', 'image_path', 'version')
+PRODUCT_SELECT = ", ".join(PRODUCT_COLUMNS)
+
+
+class ProductRecord:
+    # One product type for both sides (cashier grid and manager inventory).
+    # __slots__: no per-object __dict__, which adds up with a big catalog
+    __slots__ = PRODUCT_COLUMNS
+
+    def __init__(self, id, name, category, stock=0, cost_price=0.0, selling_price=0.0, threshold=0,
+                 expiry_date=None, image_path=None, version=0):
         self.id = id
         self.name = name
         self.category = category
@@ -16,19 +26,28 @@ class InventoryItem:
         self.selling_price = float(selling_price) if selling_price is not None else 0.0
         self.threshold = int(threshold) if threshold is not None else 0
         self.expiry_date = expiry_date
+        self.image_path = image_path
+        self.version = version  # bumped on every detail edit, see ManagerDB.update_product_fields
 
-class Product:
-    # Used by Cashier Controller
-    def __init__(self, id, name, category, cost_price, selling_price, stock, threshold, expiry_date):
-        self.id = id
-        self.name = name
-        self.category = category
-        # Safety Casts
-        self.cost_price = float(cost_price) if cost_price is not None else 0.0
-        self.selling_price = float(selling_price) if selling_price is not None else 0.0
-        self.stock = int(stock) if stock is not None else 0
-        self.threshold = int(threshold) if threshold is not None else 0
-        self.expiry_date = expiry_date
+    @classmethod
+    def from_row(cls, row):
+        """Builds a record from a plain (non-dictionary) cursor row in PRODUCT_COLUMNS order."""
+        rec = cls.__new__(cls)
+        (rec.id, rec.name, rec.category, stock, cost, price, threshold,
+         rec.expiry_date, rec.image_path, rec.version) = row
+        rec.stock = int(stock) if stock is not None else 0
+        rec.cost_price = float(cost) if cost is not None else 0.0
+        rec.selling_price = float(price) if price is not None else 0.0
+        rec.threshold = int(threshold) if threshold is not None else 0
+        return rec
+
+    def __repr__(self):
+        return f"ProductRecord(id={self.id!r}, name={self.name!r}, stock={self.stock})"
+
+
+# Old names, used by the Inventory (manager) and Cashier code: same record now
+InventoryItem = ProductRecord
+Product = ProductRecord
 
 class DashboardStats:
     def __init__(self, revenue, low_stock_count, expiring_count):
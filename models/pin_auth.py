@@ -0,0 +1,69 @@
+import threading
+import time
+
+from models.entities import User
+from models.user_model import UserModel
+
+
+class PinDirectory:
+    """
+    Quick-unlock for cashiers bound to this terminal: one indexed lookup of the user's current
+    row (so a revoked or changed PIN, or a deleted account, stops working at once) and one
+    cheap PBKDF2 check instead of bcrypt. After MAX_ATTEMPTS wrong PINs the user is locked
+    out of PIN login for LOCKOUT_SECONDS and has to use their password. Only the lockout
+    counters are kept in memory.
+    Safe to call from the login worker thread.
+    """
+
+    MAX_ATTEMPTS = 5
+    LOCKOUT_SECONDS = 300
+    PIN_LENGTHS = range(4, 9)
+
+    def __init__(self, db, terminal_id):
+        self.db = db
+        self.terminal_id = terminal_id
+        self._failures = {}      # name.lower() -> consecutive wrong PINs
+        self._locked_until = {}  # name.lower() -> time.monotonic() deadline
+        self._lock = threading.Lock()
+        self._columns_checked = False
+
+    @classmethod
+    def looks_like_pin(cls, secret):
+        return secret.isdigit() and len(secret) in cls.PIN_LENGTHS
+
+    def lookup(self, username):
+        if not self._columns_checked and hasattr(self.db, 'ensure_pin_columns'):
+            self._columns_checked = bool(self.db.ensure_pin_columns())
+        if not hasattr(self.db, 'get_pin_user'):
+            return None
+        return self.db.get_pin_user(username, self.terminal_id)
+
+    def is_locked(self, username):
+        with self._lock:
+            return self._locked_until.get(username.lower(), 0) > time.monotonic()
+
+    def authenticate(self, username, pin):
+        """
+        Returns (User or None, status) with status in 'ok', 'no_pin', 'locked', 'invalid'.
+        Anything but 'ok' means the caller should still try the digits as the password.
+        """
+        key = username.lower()
+        if self.is_locked(username):
+            return None, 'locked'
+
+        row = self.lookup(username)
+        if not row:
+            return None, 'no_pin'
+
+        if UserModel.verify_pin(pin, row['pin_hash']):
+            with self._lock:
+                self._failures.pop(key, None)
+            return User(row['id'], row['name'], row['role']), 'ok'
+
+        with self._lock:
+            self._failures[key] = self._failures.get(key, 0) + 1
+            if self._failures[key] >= self.MAX_ATTEMPTS:
+                self._failures.pop(key)
+                self._locked_until[key] = time.monotonic() + self.LOCKOUT_SECONDS
+                return None, 'locked'
+        return None, 'invalid'
@@ -0,0 +1,306 @@
+import csv
+import os
+import time
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from models import stock_ledger
+from models import change_feed
+from models.report_cache import report_cache
+
+# Barcode is only used by imports for now (match key next to the name)
+BARCODE_COLUMNS = {'barcode': 'VARCHAR(64) NULL'}
+BARCODE_INDEXES = {'uq_inventory_barcode': 'UNIQUE INDEX (barcode)'}
+
+BATCH_SIZE = 500
+
+# Accepted header names (lower-cased, spaces -> _) for each field
+HEADER_ALIASES = {
+    'name': 'name', 'product': 'name', 'product_name': 'name', 'description': 'name',
+    'category': 'category',
+    'stock': 'stock', 'qty': 'stock', 'quantity': 'stock',
+    'cost_price': 'cost_price', 'cost': 'cost_price', 'unit_cost': 'cost_price',
+    'selling_price': 'selling_price', 'price': 'selling_price', 'srp': 'selling_price',
+    'threshold': 'threshold', 'reorder_level': 'threshold',
+    'expiry_date': 'expiry_date', 'expiry': 'expiry_date', 'expiration': 'expiry_date',
+    'barcode': 'barcode', 'sku': 'barcode', 'upc': 'barcode', 'ean': 'barcode',
+}
+
+DEFAULT_THRESHOLD = 10  # same as the Add Stock dialog
+
+# New products: one multi-row INSERT per batch
+INSERT_SQL = """
+INSERT INTO inventory
+    (name, category, stock, cost_price, selling_price, threshold, expiry_date, barcode, change_seq)
+VALUES {values}
+"""
+_ROW_PLACEHOLDERS = "(" + ", ".join(["%s"] * 9) + ")"
+
+# Existing products: one UPDATE per batch, joined to the file rows. A NULL (empty cell) keeps
+# whatever is in the row *now*, so a concurrent edit by a manager isn't overwritten with the
+# value read before the import. stock in the file is the quantity received, so it adds up.
+UPDATE_SQL = """
+UPDATE inventory p
+JOIN ({rows}) v ON v.id = p.id
+SET p.name = v.name,
+    p.category = COALESCE(v.category, p.category),
+    p.stock = p.stock + v.stock,
+    p.cost_price = COALESCE(v.cost_price, p.cost_price),
+    p.selling_price = COALESCE(v.selling_price, p.selling_price),
+    p.threshold = COALESCE(v.threshold, p.threshold),
+    p.expiry_date = COALESCE(v.expiry_date, p.expiry_date),
+    p.barcode = COALESCE(v.barcode, p.barcode),
+    p.version = p.version + 1,
+    p.change_seq = %s
+"""
+_UPDATE_FIRST_ROW = ("SELECT %s AS id, %s AS name, %s AS category, %s AS stock, %s AS cost_price, "
+                     "%s AS selling_price, %s AS threshold, %s AS expiry_date, %s AS barcode")
+_UPDATE_ROW = "SELECT " + ", ".join(["%s"] * 9)
+
+EXISTING_SQL = """
+SELECT id, name, barcode
+FROM inventory
+"""
+
+
+class ImportReport:
+    def __init__(self, source):
+        self.source = source
+        self.rows_read = 0
+        self.inserted = 0
+        self.updated = 0
+        self.errors = []  # (line number, message)
+        self.seconds = 0.0
+        self.committed = False
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        return (f"{os.path.basename(self.source)}: {self.inserted} added, {self.updated} updated, "
+                f"{len(self.errors)} rejected of {self.rows_read} rows "
+                f"({self.seconds:.1f}s, {self.rows_per_second:.0f} rows/s)")
+
+
+# --- stage 1: parse (streamed) ---
+
+def _field_names(header):
+    return [HEADER_ALIASES.get(str(h or "").strip().lower().replace(" ", "_")) for h in header]
+
+
+def _rows_from_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        yield from csv.reader(f)
+
+
+def _rows_from_xlsx(path):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("Excel import needs openpyxl (pip install openpyxl)")
+    # read-only mode streams the sheet instead of loading it whole
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from wb.active.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def read_rows(path):
+    """Yields (line number, {field: raw value}) from a CSV or XLSX file, header on the first line."""
+    reader = _rows_from_xlsx(path) if path.lower().endswith(('.xlsx', '.xlsm')) else _rows_from_csv(path)
+    fields = None
+    for line_no, values in enumerate(reader, start=1):
+        if fields is None:
+            fields = _field_names(values)
+            if 'name' not in fields:
+                raise ValueError("The file needs a 'name' column")
+            continue
+        if not values or all(v in (None, "") for v in values):
+            continue
+        yield line_no, {f: v for f, v in zip(fields, values) if f}
+
+
+# --- stage 2: validate ---
+
+def _text(value):
+    return str(value).strip() if value is not None else ""
+
+
+def _number(value, field, cast):
+    text = _text(value).replace(",", "")
+    if not text:
+        return None
+    try:
+        number = cast(Decimal(text)) if cast is int else cast(text)
+    except (ValueError, InvalidOperation):
+        raise ValueError(f"{field} is not a number: {value!r}")
+    if number < 0:
+        raise ValueError(f"{field} can't be negative")
+    return number
+
+
+def _date(value):
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(_text(value)[:10])
+    except ValueError:
+        raise ValueError(f"expiry_date must be yyyy-mm-dd: {value!r}")
+
+
+def _load_existing(cursor):
+    by_name, by_barcode = {}, {}
+    cursor.execute(EXISTING_SQL)
+    for row in cursor.fetchall():
+        by_name.setdefault(row[1].strip().lower(), row)
+        if row[2]:
+            by_barcode[row[2]] = row
+    return by_name, by_barcode
+
+
+def validate(rows, by_name, by_barcode, report):
+    """
+    Checks parsed rows against each other and the existing catalog (two dict lookups per row,
+    no query per row). Returns upsert tuples; rejected rows go to report.errors.
+    Columns left empty are None for an existing product (the UPDATE keeps the current value).
+    """
+    valid = []
+    seen = set()
+    for line_no, raw in rows:
+        report.rows_read += 1
+        try:
+            name = _text(raw.get('name'))
+            code = raw.get('barcode')
+            if isinstance(code, float) and code.is_integer():
+                code = int(code)  # Excel turns numeric barcodes into floats
+            barcode = _text(code) or None
+            if not name:
+                raise ValueError("name is required")
+
+            by_code = by_barcode.get(barcode) if barcode else None
+            by_nm = by_name.get(name.lower())
+            if by_code and by_nm and by_code[0] != by_nm[0]:
+                raise ValueError(f"barcode {barcode} belongs to '{by_code[1]}', not '{name}'")
+            existing = by_code or by_nm
+
+            keys = [('name', name.lower())]
+            if barcode:
+                keys.append(('barcode', barcode))
+            if existing:
+                keys.append(('id', existing[0]))
+            if any(key in seen for key in keys):
+                raise ValueError("duplicate of an earlier row in this file")
+            seen.update(keys)
+
+            stock = _number(raw.get('stock'), 'stock', int) or 0
+            cost = _number(raw.get('cost_price'), 'cost_price', float)
+            price = _number(raw.get('selling_price'), 'selling_price', float)
+            threshold = _number(raw.get('threshold'), 'threshold', int)
+            category = _text(raw.get('category')) or None
+            expiry = _date(raw.get('expiry_date'))
+
+            if not existing:
+                if not category:
+                    raise ValueError("category is required for a new product")
+                if price is None:
+                    raise ValueError("selling_price is required for a new product")
+                cost = cost or 0.0
+                threshold = DEFAULT_THRESHOLD if threshold is None else threshold
+
+            valid.append((existing[0] if existing else None, name, category, stock, cost, price,
+                          threshold, expiry, barcode))
+        except ValueError as e:
+            report.errors.append((line_no, str(e)))
+    return valid
+
+
+# --- stage 3: upsert ---
+
+def _update(cursor, rows, seq):
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        selects = " UNION ALL ".join([_UPDATE_FIRST_ROW] + [_UPDATE_ROW] * (len(batch) - 1))
+        cursor.execute(UPDATE_SQL.format(rows=selects), [v for row in batch for v in row] + [seq])
+
+
+def _insert(cursor, rows, seq):
+    """
+    Inserts new products, returns their ids in row order. A multi-row INSERT hands out
+    consecutive ids starting at lastrowid; they're read back and checked against the names,
+    and anything unexpected raises (the unit rolls back rather than lose ledger receipts).
+    """
+    ids = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = [row[1:] + (seq,) for row in rows[start:start + BATCH_SIZE]]
+        values = ", ".join([_ROW_PLACEHOLDERS] * len(batch))
+        cursor.execute(INSERT_SQL.format(values=values), [v for row in batch for v in row])
+        first = cursor.lastrowid
+        if not first or cursor.rowcount != len(batch):
+            raise RuntimeError("Could not read back the ids of the new products")
+
+        batch_ids = list(range(first, first + len(batch)))
+        cursor.execute(f"SELECT id, name FROM inventory WHERE id IN ({', '.join(['%s'] * len(batch_ids))})",
+                       batch_ids)
+        names = dict(cursor.fetchall())
+        if any(names.get(pid) != row[0] for pid, row in zip(batch_ids, batch)):
+            raise RuntimeError("New product ids are not consecutive, import rolled back")
+        ids += batch_ids
+    return ids
+
+
+def import_products(main_db, path, user_name=None, dry_run=False):
+    """
+    Bulk-loads products from a CSV/XLSX price list: stream-parse, validate against the current
+    catalog, then batched UPDATEs (existing) and INSERTs (new), ledger receipts and one
+    "Bulk Import" audit entry, all in one transaction. Bad rows are skipped and listed in
+    the returned ImportReport. dry_run validates only.
+    """
+    main_db.ensure_columns('inventory', BARCODE_COLUMNS)
+    main_db.ensure_indexes('inventory', BARCODE_INDEXES)
+    stock_ledger.ensure_ledger(main_db)
+    change_feed.ensure_change_feed(main_db)
+
+    report = ImportReport(path)
+    started = time.perf_counter()
+    try:
+        with main_db.unit_of_work() as work:
+            cursor = work.cursor
+            by_name, by_barcode = _load_existing(cursor)
+            rows = validate(read_rows(path), by_name, by_barcode, report)
+            existing = [row for row in rows if row[0] is not None]
+            new = [row for row in rows if row[0] is None]
+            report.updated, report.inserted = len(existing), len(new)
+
+            if dry_run or not rows:
+                work.fail()  # nothing to write
+            else:
+                seq = change_feed.next_seq(cursor)
+                _update(cursor, existing, seq)
+                new_ids = _insert(cursor, new, seq)
+
+                movements = [(row[0], stock_ledger.RECEIPT, row[3]) for row in existing]
+                movements += [(pid, stock_ledger.RECEIPT, row[3]) for pid, row in zip(new_ids, new)]
+                stock_ledger.record_movements(cursor, movements, ref=f"import {os.path.basename(path)}"[:64],
+                                              user_name=user_name)
+
+                report.seconds = time.perf_counter() - started
+                work.audit(user_name or "System", "Bulk Import", report.summary())
+                work.on_commit(report_cache.note_product_change)
+        report.committed = work.committed
+        if not report.committed and not dry_run:
+            report.inserted = report.updated = 0
+    except Exception as e:
+        # anything from the file (bad zip, broken CSV quoting, ...) or the DB ends up in the
+        # report instead of escaping into the caller's Qt slot
+        print(f"Import failed: {e}")
+        report.errors.append((0, str(e)))
+        report.inserted = report.updated = 0
+
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,96 @@
+import re
+
+from mysql.connector import Error
+
+from models.entities import ProductRecord, PRODUCT_SELECT, PRODUCT_COLUMNS
+
+# FULLTEXT for ranked word search, a plain name index for the short-query prefix fallback
+SEARCH_INDEXES = {
+    'ft_inventory_name_category': 'FULLTEXT INDEX (name, category)',
+    'idx_inventory_name': 'INDEX (name)',
+}
+
+# InnoDB skips words shorter than innodb_ft_min_token_size (3 by default)
+MIN_TOKEN = 3
+
+# Characters with a meaning in BOOLEAN MODE, stripped from user input
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+FULLTEXT_SEARCH_SQL = """
+SELECT {columns}, MATCH(name, category) AGAINST (%s IN BOOLEAN MODE) AS score
+FROM {table}
+WHERE MATCH(name, category) AGAINST (%s IN BOOLEAN MODE)
+ORDER BY score DESC, name ASC
+LIMIT %s OFFSET %s
+"""
+
+# Does the FULLTEXT query match anything at all? Decides the strategy for every page alike.
+FULLTEXT_EXISTS_SQL = """
+SELECT 1 FROM {table} WHERE MATCH(name, category) AGAINST (%s IN BOOLEAN MODE) LIMIT 1
+"""
+
+# Names first, then category-only matches
+PREFIX_SEARCH_SQL = """
+SELECT {columns}, (name LIKE %s) AS score
+FROM {table}
+WHERE name LIKE %s OR category LIKE %s
+ORDER BY score DESC, name ASC
+LIMIT %s OFFSET %s
+"""
+
+
+def _boolean_query(tokens):
+    # every word required, each matched as a prefix: "coca col" -> "+coca* +col*"
+    return " ".join(f"+{token}*" for token in tokens)
+
+
+def _like_prefix(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def search_products(main_db, query, limit=50, offset=0, table='inventory'):
+    """
+    Ranked, paginated product search done by MySQL (shared by ManagerDB and CashierDB).
+    Queries with a word shorter than MIN_TOKEN can't use the FULLTEXT index, so they (and
+    queries FULLTEXT finds nothing for) fall back to a name/category prefix match. The choice
+    doesn't depend on the offset, so every page of one query comes from the same strategy.
+    Returns ProductRecords, best match first.
+    """
+    text = _BOOLEAN_OPERATORS.sub(" ", query or "").strip()
+    if not text:
+        return []
+
+    if table == 'inventory':
+        main_db.ensure_indexes(table, SEARCH_INDEXES)
+
+    tokens = text.split()
+    results = []
+    conn = main_db.get_connection()
+    if conn and conn.is_connected():
+        try:
+            cursor = conn.cursor()
+            width = len(PRODUCT_COLUMNS)
+
+            if all(len(token) >= MIN_TOKEN for token in tokens):
+                boolean = _boolean_query(tokens)
+                if offset:
+                    cursor.execute(FULLTEXT_EXISTS_SQL.format(table=table), (boolean,))
+                    use_fulltext = cursor.fetchone() is not None
+                else:
+                    use_fulltext = True  # page 1: an empty result is the same answer
+                if use_fulltext:
+                    cursor.execute(FULLTEXT_SEARCH_SQL.format(columns=PRODUCT_SELECT, table=table),
+                                   (boolean, boolean, limit, offset))
+                    results = [ProductRecord.from_row(row[:width]) for row in cursor.fetchall()]
+                    if results or offset:
+                        return results
+
+            prefix = _like_prefix(text)
+            cursor.execute(PREFIX_SEARCH_SQL.format(columns=PRODUCT_SELECT, table=table),
+                           (prefix, prefix, prefix, limit, offset))
+            results = [ProductRecord.from_row(row[:width]) for row in cursor.fetchall()]
+        except Error as e:
+            print(f"Error searching products: {e}")
+        finally:
+            conn.close()
+    return results
@@ -0,0 +1,150 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+
+
+def _to_date(value):
+    # Accepts date, datetime or 'yyyy-MM-dd' strings (what the report dialog sends)
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+def _estimate_size(value):
+    # Rough byte count so the budget means something (rows are lists of dicts)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if hasattr(value, 'nbytes'):
+        return value.nbytes  # columnar snapshots / arrays know their own size
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        for row in value:
+            size += sys.getsizeof(row)
+            if isinstance(row, dict):
+                size += sum(sys.getsizeof(v) for v in row.values())
+    return size
+
+
+class ReportCache:
+    """
+    LRU cache of report datasets and rendered PDFs, keyed by report type and (start, end).
+    Entries are tagged with the data kinds they were built from ('sales', 'inventory', 'audit')
+    and only dropped when a change of that kind lands inside their date range.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, open_ttl=60):
+        self.max_bytes = max_bytes
+        # Ranges that reach today can also change from other terminals, so only trust them this long
+        self.open_ttl = open_ttl
+        self._entries = OrderedDict()  # key -> dict(value, size, kinds, start, end, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.generations = {}  # kind -> bumped on every invalidate, e.g. the catalog version
+
+    def generation(self, kind):
+        """Version of a data kind in this process: changes whenever that kind is invalidated."""
+        with self._lock:
+            return self.generations.get(kind, 0)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if self._is_open(entry) and time.monotonic() - entry['stored_at'] > self.open_ttl:
+                self._drop(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry['value']
+
+    def put(self, key, value, kinds, start=None, end=None):
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return  # would evict everything else, not worth it
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+            self._entries[key] = {
+                'value': value,
+                'size': size,
+                'kinds': frozenset(kinds),
+                'start': _to_date(start),
+                'end': _to_date(end),
+                'stored_at': time.monotonic(),
+            }
+            self._bytes += size
+
+            # LRU eviction until we are back under budget
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+
+    def invalidate(self, kind, when=None):
+        """Drops entries built from `kind` whose range covers `when` (all of them if when is None)."""
+        day = _to_date(when)
+        with self._lock:
+            self.generations[kind] = self.generations.get(kind, 0) + 1
+            stale = [key for key, entry in self._entries.items()
+                     if kind in entry['kinds'] and self._covers(entry, day)]
+            for key in stale:
+                self._drop(key)
+
+    # --- change hooks (called after a successful commit) ---
+
+    def note_sale(self, when=None):
+        when = when or datetime.now()
+        self.invalidate('sales', when)
+        self.invalidate('inventory')  # stock moved
+
+    def note_product_change(self):
+        self.invalidate('inventory')
+
+    def note_audit(self, when=None):
+        self.invalidate('audit', when or datetime.now())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes,
+                    'hits': self.hits, 'misses': self.misses}
+
+    # --- internals (lock must be held) ---
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= entry['size']
+
+    @staticmethod
+    def _covers(entry, day):
+        if day is None or entry['start'] is None or entry['end'] is None:
+            return True
+        return entry['start'] <= day <= entry['end']
+
+    @staticmethod
+    def _is_open(entry):
+        # Snapshots (no range) and ranges ending today or later can still change
+        return entry['end'] is None or entry['end'] >= date.today()
+
+
+# One cache per process, shared by every DatabaseManager / ManagerDB instance
+report_cache = ReportCache()
@@ -0,0 +1,262 @@
+from datetime import datetime, timedelta
+
+from mysql.connector import Error
+
+# Movement kinds. qty is the signed change: sales are negative, receipts positive.
+SALE = 'sale'
+RECEIPT = 'receipt'
+SHRINKAGE = 'shrinkage'
+ADJUSTMENT = 'adjustment'
+
+# Created on first use by DatabaseManager.ensure_tables (movements first, the checkpoint seed reads it)
+LEDGER_TABLES = {
+    'stock_movements': """(
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        product_id INT NOT NULL,
+        kind VARCHAR(16) NOT NULL,
+        qty INT NOT NULL,
+        ref VARCHAR(64) NULL,
+        user_name VARCHAR(100) NULL,
+        note VARCHAR(255) NULL,
+        created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_movements_product (product_id, id),
+        INDEX idx_movements_created (created_at)
+    )""",
+    # stock = balance after every movement up to last_movement_id (for that product)
+    'stock_checkpoints': """(
+        product_id INT NOT NULL,
+        last_movement_id BIGINT NOT NULL,
+        as_of DATETIME NOT NULL,
+        stock INT NOT NULL,
+        PRIMARY KEY (product_id, last_movement_id),
+        INDEX idx_checkpoints_as_of (as_of)
+    )""",
+}
+
+# Existing stock becomes the opening balance, history starts here. Run while the table is
+# empty (IGNORE: another terminal seeding at the same moment wins, nothing doubles up).
+SEED_CHECKPOINTS_SQL = """
+INSERT IGNORE INTO stock_checkpoints (product_id, last_movement_id, as_of, stock)
+SELECT id, (SELECT COALESCE(MAX(id), 0) FROM stock_movements), NOW(), stock
+FROM inventory
+"""
+
+INSERT_MOVEMENT_SQL = """
+INSERT INTO stock_movements (product_id, kind, qty, ref, user_name, note)
+VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+# Movements still being written by an open sale could get a lower id than ones already
+# committed, so checkpoints only fold in movements older than this.
+SETTLE_SECONDS = 60
+
+CHECKPOINT_SQL = """
+INSERT INTO stock_checkpoints (product_id, last_movement_id, as_of, stock)
+SELECT m.product_id, MAX(m.id), NOW(), COALESCE(c.stock, 0) + SUM(m.qty)
+FROM stock_movements m
+LEFT JOIN (
+    SELECT product_id, MAX(last_movement_id) AS last_id FROM stock_checkpoints GROUP BY product_id
+) latest ON latest.product_id = m.product_id
+LEFT JOIN stock_checkpoints c
+    ON c.product_id = latest.product_id AND c.last_movement_id = latest.last_id
+WHERE m.id > COALESCE(latest.last_id, 0) AND m.id <= %s
+GROUP BY m.product_id, c.stock
+"""
+
+# Nearest checkpoint at or before the date + the movements after it, per product.
+# first_as_of tells "no history that far back" apart from a real zero.
+STOCK_AS_OF_SQL = """
+SELECT p.id, COALESCE(c.stock, 0) + COALESCE(SUM(m.qty), 0) AS stock, cp.last_id, cp.first_as_of
+FROM inventory p
+LEFT JOIN (
+    SELECT product_id,
+           MAX(CASE WHEN as_of <= %s THEN last_movement_id END) AS last_id,
+           MIN(as_of) AS first_as_of
+    FROM stock_checkpoints GROUP BY product_id
+) cp ON cp.product_id = p.id
+LEFT JOIN stock_checkpoints c ON c.product_id = p.id AND c.last_movement_id = cp.last_id
+LEFT JOIN stock_movements m
+    ON m.product_id = p.id AND m.id > COALESCE(cp.last_id, 0) AND m.created_at <= %s
+{where}
+GROUP BY p.id, c.stock, cp.last_id, cp.first_as_of
+"""
+
+# Compaction: per product, the newest checkpoint at or before the cutoff becomes the
+# opening balance; the movements and checkpoints it summarizes go.
+_KEEP = """
+    SELECT product_id, MAX(last_movement_id) AS keep_id
+    FROM stock_checkpoints WHERE as_of <= %s GROUP BY product_id
+"""
+
+COMPACT_MOVEMENTS_SQL = f"""
+DELETE m FROM stock_movements m
+JOIN ({_KEEP}) k ON k.product_id = m.product_id
+WHERE m.id <= k.keep_id
+"""
+
+COMPACT_CHECKPOINTS_SQL = f"""
+DELETE c FROM stock_checkpoints c
+JOIN ({_KEEP}) k ON k.product_id = c.product_id
+WHERE c.last_movement_id < k.keep_id
+"""
+
+# Ledger rows of deleted products
+PURGE_DELETED_SQL = """
+DELETE FROM {table}
+WHERE product_id NOT IN (SELECT id FROM inventory) AND {column} < %s
+"""
+
+
+def _seed_checkpoints(cursor, table):
+    # on an empty table, not "just created": a seed that failed last time is tried again
+    if table == 'stock_checkpoints':
+        cursor.execute("SELECT 1 FROM stock_checkpoints LIMIT 1")
+        if cursor.fetchone() is None:
+            cursor.execute(SEED_CHECKPOINTS_SQL)
+
+
+def ensure_ledger(main_db):
+    return main_db.ensure_tables(LEDGER_TABLES, seed=_seed_checkpoints)
+
+
+def record_movements(cursor, movements, ref=None, user_name=None, note=None):
+    """
+    Appends movements [(product_id, kind, qty), ...] on the caller's cursor, so they commit
+    (or roll back) with the sale / product update that caused them. Zero changes are skipped.
+    """
+    rows = [(pid, kind, qty, ref, user_name, (note or None) and note[:255])
+            for pid, kind, qty in movements if qty]
+    if rows:
+        cursor.executemany(INSERT_MOVEMENT_SQL, rows)
+    return len(rows)
+
+
+def stock_as_of(main_db, when, product_ids=None):
+    """
+    {product_id: stock at `when`} rebuilt from the nearest checkpoint. Products whose
+    history (after compaction, or before the ledger existed) doesn't reach back that far map
+    to None.
+    """
+    ensure_ledger(main_db)
+    result = {}
+    conn = main_db.get_connection()
+    if conn and conn.is_connected():
+        try:
+            cursor = conn.cursor()
+            params = [when, when]
+            where = ""
+            if product_ids is not None:
+                product_ids = list(product_ids)
+                if not product_ids:
+                    return result
+                where = f"WHERE p.id IN ({', '.join(['%s'] * len(product_ids))})"
+                params += product_ids
+            cursor.execute(STOCK_AS_OF_SQL.format(where=where), params)
+            for pid, stock, last_id, first_as_of in cursor.fetchall():
+                before_history = last_id is None and first_as_of is not None
+                result[pid] = None if before_history else int(stock)
+        except Error as e:
+            print(f"Error rebuilding stock as of {when}: {e}")
+        finally:
+            conn.close()
+    return result
+
+
+def get_movements(main_db, product_id, limit=100):
+    """Newest movements of one product: [{id, kind, qty, ref, user_name, note, created_at}]"""
+    ensure_ledger(main_db)
+    rows = []
+    conn = main_db.get_connection()
+    if conn and conn.is_connected():
+        try:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT id, kind, qty, ref, user_name, note, created_at FROM stock_movements
+                WHERE product_id = %s ORDER BY id DESC LIMIT %s
+            """, (product_id, limit))
+            rows = cursor.fetchall()
+        except Error as e:
+            print(f"Error fetching stock movements: {e}")
+        finally:
+            conn.close()
+    return rows
+
+
+def take_checkpoint(main_db):
+    """Writes a checkpoint for every product that moved since its last one. Returns how many."""
+    ensure_ledger(main_db)
+    conn = main_db.get_connection()
+    if conn and conn.is_connected():
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(id) FROM stock_movements WHERE created_at <= NOW() - INTERVAL %s SECOND",
+                           (SETTLE_SECONDS,))
+            upto = cursor.fetchone()[0]
+            if upto is None:
+                return 0
+            cursor.execute(CHECKPOINT_SQL, (upto,))
+            conn.commit()
+            return cursor.rowcount
+        except Error as e:
+            print(f"Error writing stock checkpoints: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+    return 0
+
+
+def compact(main_db, before):
+    """
+    Folds everything up to the newest checkpoint at or before `before` into that checkpoint,
+    so stock_as_of() stays exact from there on. Returns (movements, checkpoints) deleted.
+    """
+    ensure_ledger(main_db)
+    conn = main_db.get_connection()
+    if conn and conn.is_connected():
+        try:
+            cursor = conn.cursor()
+            cursor.execute(COMPACT_MOVEMENTS_SQL, (before,))
+            movements = cursor.rowcount
+            cursor.execute(COMPACT_CHECKPOINTS_SQL, (before,))
+            checkpoints = cursor.rowcount
+            cursor.execute(PURGE_DELETED_SQL.format(table='stock_movements', column='created_at'), (before,))
+            movements += cursor.rowcount
+            cursor.execute(PURGE_DELETED_SQL.format(table='stock_checkpoints', column='as_of'), (before,))
+            checkpoints += cursor.rowcount
+            conn.commit()
+            return movements, checkpoints
+        except Error as e:
+            print(f"Error compacting the stock ledger: {e}")
+            conn.rollback()
+        finally:
+            conn.close()
+    return 0, 0
+
+
+def run_maintenance(main_db, checkpoint_hours=24, keep_days=90):
+    """
+    The periodic job: a checkpoint when the last one is older than `checkpoint_hours`, then
+    compaction of anything older than `keep_days`. Cheap when nothing is due, so the app
+    calls it at start and then every `ledger_check_minutes` (see main.py).
+    """
+    if not ensure_ledger(main_db):
+        return None
+
+    last = None
+    conn = main_db.get_connection()
+    if conn and conn.is_connected():
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(as_of) FROM stock_checkpoints")
+            last = cursor.fetchone()[0]
+        except Error as e:
+            print(f"Error reading stock checkpoints: {e}")
+        finally:
+            conn.close()
+
+    now = datetime.now()
+    checkpoints = 0
+    if last is None or now - last >= timedelta(hours=checkpoint_hours):
+        checkpoints = take_checkpoint(main_db)
+    removed = compact(main_db, now - timedelta(days=keep_days))
+    return {'checkpoints': checkpoints, 'compacted': removed}
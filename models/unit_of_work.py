@@ -0,0 +1,36 @@
+from models.report_cache import report_cache
+
+AUDIT_INSERT_SQL = "INSERT INTO audit_logs (user_name, action, details) VALUES (%s, %s, %s)"
+
+
+class UnitOfWork:
+    """
+    One pooled connection and one transaction shared by several DB operations, from
+    DatabaseManager.unit_of_work(). ManagerDB / CashierDB methods that take `uow=` run their
+    statements on it instead of opening their own connection; audit() adds the audit row to
+    the same transaction. Cache invalidation waits for the commit (on_commit).
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.rollback_only = False
+        self.committed = False
+        self._after_commit = []
+
+    def audit(self, user_name, action, details):
+        self.cursor.execute(AUDIT_INSERT_SQL, (user_name, action, details))
+        self.on_commit(report_cache.note_audit)
+
+    def on_commit(self, callback):
+        # same callback twice (two product edits) only runs once
+        if callback not in self._after_commit:
+            self._after_commit.append(callback)
+
+    def fail(self):
+        """Makes the whole unit roll back at the end (an operation inside it failed)."""
+        self.rollback_only = True
+
+    def run_after_commit(self):
+        for callback in self._after_commit:
+            callback()
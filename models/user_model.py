@@ -1,4 +1,12 @@
 import bcrypt
+import hashlib
+import hmac
+import os
+
+# PIN hashes: PBKDF2-SHA256, iteration count stored in the hash so it can be retuned
+# per terminal without invalidating existing PINs. Passwords stay on full-cost bcrypt.
+PIN_ITERATIONS = 60000
+PIN_PREFIX = 'pbkdf2_sha256'
 
 
 class UserModel:
@@ -24,4 +32,25 @@ class UserModel:
             return bcrypt.checkpw(plain_bytes, hashed_bytes)
         except ValueError:
             #handle stuff when hash is invalid
-            return False
\ No newline at end of file
+            return False
+
+    @staticmethod
+    def hash_pin(pin, iterations=PIN_ITERATIONS):
+        # format: pbkdf2_sha256$<iterations>$<salt hex>$<hash hex>
+        salt = os.urandom(16)
+        digest = hashlib.pbkdf2_hmac('sha256', pin.encode('utf-8'), salt, iterations)
+        return f"{PIN_PREFIX}${iterations}${salt.hex()}${digest.hex()}"
+
+    @staticmethod
+    def verify_pin(pin, pin_hash):
+        if not pin_hash:
+            return False
+
+        try:
+            prefix, iterations, salt_hex, digest_hex = pin_hash.split('$')
+            if prefix != PIN_PREFIX:
+                return False
+            digest = hashlib.pbkdf2_hmac('sha256', pin.encode('utf-8'), bytes.fromhex(salt_hex), int(iterations))
+            return hmac.compare_digest(digest.hex(), digest_hex)
+        except ValueError:
+            return False
@@ -0,0 +1,71 @@
+"""
+Headless report export (no PyQt, no display server needed).
+
+    python -m report_cli --type sales --start 2025-12-01 --end 2025-12-19 --out Sales.pdf
+
+Meant for cron / end-of-day batch exports on the back-office box.
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.database_manager import DatabaseManager
+from utils.report_builder import export_report, FORMATS
+
+# CLI names -> the names used in report_dialog.ui
+REPORT_ALIASES = {
+    'all': "All Reports",
+    'sales': "Sales Report",
+    'valuation': "Inventory Valuation",
+    'low-stock': "Low Stock Alert",
+    'audit': "Audit Logs",
+}
+
+
+def parse_args(argv=None):
+    today = date.today()
+    parser = argparse.ArgumentParser(prog="report_cli", description="Export ShelfSync reports without the GUI.")
+    parser.add_argument('--type', dest='rpt_type', choices=sorted(REPORT_ALIASES), default='all',
+                        help="report to export (default: all)")
+    parser.add_argument('--start', default=today.replace(day=1).isoformat(),
+                        help="start date yyyy-mm-dd (default: first of this month)")
+    parser.add_argument('--end', default=today.isoformat(), help="end date yyyy-mm-dd (default: today)")
+    parser.add_argument('--format', dest='fmt', choices=FORMATS, default='pdf',
+                        help="pdf (formatted) or csv/xlsx (raw rows, streamed)")
+    parser.add_argument('--out', help="output path (default: <Report_Type>_<end>.<format>)")
+    args = parser.parse_args(argv)
+
+    try:
+        if date.fromisoformat(args.start) > date.fromisoformat(args.end):
+            parser.error("--start is after --end")
+    except ValueError as e:
+        parser.error(f"bad date: {e}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rpt_type = REPORT_ALIASES[args.rpt_type]
+    out_path = args.out or f"{rpt_type.replace(' ', '_')}_{args.end}.{args.fmt}"
+
+    main_db = DatabaseManager()
+    conn = main_db.get_connection()
+    if not conn:
+        print("Cannot reach the database, nothing exported.", file=sys.stderr)
+        return 2
+    conn.close()
+
+    written = export_report(main_db.manager_db, rpt_type, args.start, args.end, out_path, args.fmt)
+    if not written:
+        print(f"Failed to export {rpt_type}", file=sys.stderr)
+        return 1
+
+    print(f"{rpt_type} ({args.start} to {args.end}) -> {', '.join(written)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
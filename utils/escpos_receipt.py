@@ -0,0 +1,133 @@
+import os
+import socket
+
+# ESC/POS command bytes
+ESC = b'\x1b'
+GS = b'\x1d'
+INIT = ESC + b'@'
+ALIGN_LEFT = ESC + b'a\x00'
+ALIGN_CENTER = ESC + b'a\x01'
+BOLD_ON = ESC + b'E\x01'
+BOLD_OFF = ESC + b'E\x00'
+SIZE_NORMAL = GS + b'!\x00'
+SIZE_DOUBLE = GS + b'!\x11'
+FEED_AND_CUT = ESC + b'd\x04' + GS + b'V\x01'
+
+
+class EscPosReceipt:
+    """
+    Renders the same transaction_data dict as ReceiptManager, but as raw ESC/POS bytes
+    for an 80 mm thermal printer (no PDF, no viewer).
+    """
+
+    LOGO_WIDTH_DOTS = 160  # ~20 mm at 8 dots/mm
+
+    # Raster logo is built once per process (None = no logo / Pillow missing)
+    _logo_raster = None
+    _logo_loaded = False
+
+    def __init__(self, columns=48):
+        self.columns = columns
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.logo_path = os.path.join(base_path, 'assets', 'logo.png')
+
+    def get_logo_raster(self):
+        cls = type(self)
+        if not cls._logo_loaded:
+            cls._logo_raster = self._build_logo_raster()
+            cls._logo_loaded = True
+        return cls._logo_raster
+
+    def _build_logo_raster(self):
+        if not os.path.exists(self.logo_path):
+            return None
+        try:
+            from PIL import Image  # ships with reportlab
+        except ImportError:
+            return None
+
+        img = Image.open(self.logo_path).convert('RGBA')
+        # flatten transparency onto white before thresholding
+        bg = Image.new('RGBA', img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(bg, img).convert('L')
+
+        width = self.LOGO_WIDTH_DOTS
+        height = max(1, int(img.height * width / img.width))
+        img = img.resize((width, height)).point(lambda px: 255 if px < 128 else 0).convert('1')
+
+        # GS v 0: raster bit image, 1 = black dot, MSB first
+        width_bytes = (width + 7) // 8
+        header = GS + b'v0\x00' + bytes([width_bytes & 0xFF, width_bytes >> 8, height & 0xFF, height >> 8])
+        return header + img.tobytes()
+
+    # --- layout helpers ---
+
+    def _text(self, text):
+        return text.encode('ascii', 'replace') + b'\n'
+
+    def _columns(self, left, right):
+        space = max(1, self.columns - len(left) - len(right))
+        return self._text(f"{left}{' ' * space}{right}")
+
+    def _rule(self):
+        return self._text('-' * self.columns)
+
+    def render(self, transaction_data):
+        out = bytearray(INIT)
+
+        # --- 1. Header ---
+        out += ALIGN_CENTER
+        logo = self.get_logo_raster()
+        if logo:
+            out += logo
+        out += BOLD_ON + SIZE_DOUBLE + self._text("ShelfSync") + SIZE_NORMAL + BOLD_OFF
+        out += self._text("Davao City, Philippines")
+        out += self._text("Tel: (+63) 6767-6767")
+
+        # --- 2. Transaction Info ---
+        out += ALIGN_LEFT + self._rule()
+        out += self._text(f"Date: {transaction_data['date'].strftime('%Y-%m-%d %H:%M')}")
+        out += self._text(f"Cashier: {transaction_data['cashier']}")
+        out += self._text(f"Ref #: {transaction_data['sale_id']}")
+        out += self._rule()
+
+        # --- 3. Items ---
+        name_width = self.columns - 16
+        out += BOLD_ON + self._text(f"{'Item':<{name_width}}{'Qty':>5}{'Price':>11}") + BOLD_OFF
+        for item in transaction_data['items']:
+            raw_name = item['name']
+            name = raw_name[:name_width - 2] + ".." if len(raw_name) > name_width else raw_name
+            total_price = item['qty'] * item['price']
+            out += self._text(f"{name:<{name_width}}{item['qty']:>5}{total_price:>11,.2f}")
+        out += self._rule()
+
+        # --- 4. Totals ---
+        out += self._columns("Subtotal:", f"{transaction_data['subtotal']:,.2f}")
+        out += self._columns("VAT (12%):", f"{transaction_data['vat']:,.2f}")
+        out += BOLD_ON + self._columns("TOTAL:", f"{transaction_data['total']:,.2f}") + BOLD_OFF
+
+        # --- 5. Payment ---
+        pay_info = transaction_data['payment']
+        out += self._text(f"Paid via {pay_info['method']}")
+        out += self._text(f"Tendered: {pay_info['tendered']:,.2f}")
+        out += self._text(f"Change: {pay_info['change']:,.2f}")
+
+        # --- 6. Footer ---
+        out += ALIGN_CENTER + b'\n' + self._text("Thank you for shopping!")
+        out += FEED_AND_CUT
+        return bytes(out)
+
+
+def send_to_printer(data, target):
+    """
+    Writes raw printer bytes to target:
+      - 'tcp://host:port' -> network printer (or a test socket)
+      - anything else     -> device node or plain file (/dev/usb/lp0, receipt.bin, ...)
+    """
+    if target.startswith('tcp://'):
+        host, _, port = target[len('tcp://'):].partition(':')
+        with socket.create_connection((host, int(port or 9100)), timeout=5) as sock:
+            sock.sendall(data)
+    else:
+        with open(target, 'wb') as f:
+            f.write(data)
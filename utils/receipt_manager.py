@@ -1,6 +1,7 @@
 from reportlab.lib.pagesizes import A6
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
 import os
 import subprocess
 import platform
@@ -9,9 +10,17 @@ from datetime import datetime
 
 
 class ReceiptManager:
+    # Everything except the item rows (header, info, totals, payment, footer + margins)
+    FIXED_HEIGHT = 125 * mm
+    LINE_HEIGHT = 4 * mm
+
+    # Decoded once per process and shared by every receipt (None = no logo on disk)
+    _logo = None
+    _logo_loaded = False
+
     def __init__(self):
         self.width = 80 * mm  # Standard Thermal Printer Width (80mm)
-        self.height = 200 * mm  # Total height
+        self.height = self.page_height(0)  # recomputed per receipt from the item count
         self.file_name = "latest_receipt.pdf"
 
         # Determine paths for assets relative to this file
@@ -19,16 +28,35 @@ class ReceiptManager:
         self.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.logo_path = os.path.join(self.base_path, 'assets', 'logo.png')
 
+    def page_height(self, line_count):
+        # Roll paper has no fixed length, so the page grows with the basket
+        return self.FIXED_HEIGHT + line_count * self.LINE_HEIGHT
+
+    def get_logo(self):
+        """Returns the cached ImageReader for logo.png, decoding it on first use only."""
+        cls = type(self)
+        if not cls._logo_loaded:
+            cls._logo = ImageReader(self.logo_path) if os.path.exists(self.logo_path) else None
+            cls._logo_loaded = True
+        return cls._logo
+
     def generate_receipt(self, transaction_data):
-        c = canvas.Canvas(self.file_name, pagesize=(self.width, self.height))
+        self.render(transaction_data, self.file_name)
+        self.open_pdf()
+
+    def render(self, transaction_data, target):
+        """Draws the receipt into target (a file path or a binary file-like object)."""
+        self.height = self.page_height(len(transaction_data['items']))
+        c = canvas.Canvas(target, pagesize=(self.width, self.height))
 
         # --- 1. Header with Logo ---
         y = self.height - 10 * mm
 
         # Add Logo at the top center
-        if os.path.exists(self.logo_path):
+        logo = self.get_logo()
+        if logo is not None:
             logo_size = 15 * mm  # Adjusted size for 80mm receipt
-            c.drawImage(self.logo_path, (self.width - logo_size) / 2, y - 10 * mm,
+            c.drawImage(logo, (self.width - logo_size) / 2, y - 10 * mm,
                         width=logo_size, height=logo_size, preserveAspectRatio=True, mask='auto')
             y -= 18 * mm  # Push text down further to make room for logo
         else:
@@ -112,17 +140,20 @@ class ReceiptManager:
         c.drawCentredString(self.width / 2, y, "Thank you for shopping!")
 
         c.save()
-        self.open_pdf()
 
-    def open_pdf(self):
+    def open_pdf(self, path=None):
         """Automatically opens the PDF to simulate printing"""
-        current_os = platform.system()
         try:
-            if current_os == "Windows":
-                os.startfile(self.file_name)
-            elif current_os == "Darwin":  # macOS
-                subprocess.call(["open", self.file_name])
-            else:  # Linux
-                subprocess.call(["xdg-open", self.file_name])
+            self.launch_viewer(path or self.file_name)
         except Exception as e:
-            print(f"Error opening receipt: {e}")
\ No newline at end of file
+            print(f"Error opening receipt: {e}")
+
+    def launch_viewer(self, path):
+        # Popen, not call: never wait for the viewer to exit (raises if it can't start)
+        current_os = platform.system()
+        if current_os == "Windows":
+            os.startfile(path)
+        elif current_os == "Darwin":  # macOS
+            subprocess.Popen(["open", path])
+        else:  # Linux
+            subprocess.Popen(["xdg-open", path])
@@ -0,0 +1,185 @@
+import io
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from utils.escpos_receipt import EscPosReceipt, send_to_printer
+from utils.terminal_config import load_terminal_config
+
+
+class ReceiptJob:
+    def __init__(self, transaction_data=None, sale_id=None, loader=None):
+        self.data = transaction_data
+        self.sale_id = sale_id if sale_id is not None else (transaction_data or {}).get('sale_id')
+        self.loader = loader  # callable(sale_id) -> transaction_data, for reprints
+        self.attempts = 0
+        self.error = None
+        self.path = None
+
+    @property
+    def label(self):
+        return f"Sale #{self.sale_id if self.sale_id is not None else '?'}"
+
+
+class ReceiptQueue:
+    """
+    Renders and prints receipts on a background thread so checkout never waits on ReportLab
+    or the PDF viewer. Failed jobs are retried, then parked in `failed` for a manual reprint.
+    Callbacks run on the worker thread (emit a Qt signal from them, don't touch widgets).
+    """
+
+    RECENT_RENDERS = 50  # rendered receipts kept in memory for quick reprints
+    SPOOL_KEEP = 20      # PDF files kept in the receipts folder (the DB is the real archive)
+
+    def __init__(self, output_dir=None, max_retries=3, retry_delay=0.5, config=None):
+        self.config = config or load_terminal_config()
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.output_dir = output_dir or os.path.join(base_path, 'receipts')
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+        self.failed = []
+        # callback(job) lists: the queue is shared, every cashier window adds its own
+        self.on_failed = []
+        self.on_printed = []
+
+        self._recent = OrderedDict()  # sale_id -> rendered bytes
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="receipt-worker", daemon=True)
+        self._worker.start()
+
+    def submit(self, transaction_data):
+        """Queues a receipt and returns at once."""
+        job = ReceiptJob(transaction_data)
+        self._jobs.put(job)
+        return job
+
+    def reprint_sale(self, sale_id, db):
+        """
+        Queues a reprint of any past sale. Uses the cached render when the sale is recent,
+        otherwise rebuilds it from sales + sale_items (db.get_receipt_data) on the worker thread.
+        """
+        job = ReceiptJob(sale_id=sale_id, loader=db.get_receipt_data)
+        self._jobs.put(job)
+        return job
+
+    def reprint_failed(self):
+        """Re-queues every failed job. Returns how many were queued."""
+        with self._lock:
+            jobs, self.failed = self.failed, []
+        for job in jobs:
+            job.attempts = 0
+            job.error = None
+            self._jobs.put(job)
+        return len(jobs)
+
+    def pending(self):
+        return self._jobs.qsize()
+
+    def receipt_path(self, sale_id, stamp=None):
+        # One file per sale instead of overwriting latest_receipt.pdf
+        stamp = stamp or datetime.now()
+        name = f"receipt_{sale_id if sale_id is not None else 'NEW'}_{stamp.strftime('%Y%m%d_%H%M%S_%f')}.pdf"
+        return os.path.join(self.output_dir, name)
+
+    # --- worker ---
+
+    def _run(self):
+        if self.config.get('receipt_mode') == 'escpos':
+            self._renderer = EscPosReceipt(columns=int(self.config.get('printer_columns', 48)))
+            self._escpos = True
+        else:
+            # ReportLab only gets imported on terminals that actually print PDFs
+            from utils.receipt_manager import ReceiptManager
+            self._renderer = ReceiptManager()
+            self._escpos = False
+
+        while True:
+            job = self._jobs.get()
+            try:
+                self._process(job)
+            finally:
+                self._jobs.task_done()
+
+    def _render(self, job):
+        # Recent sales come straight from memory
+        with self._lock:
+            cached = self._recent.get(job.sale_id) if job.sale_id is not None else None
+            if cached is not None:
+                self._recent.move_to_end(job.sale_id)
+                return cached
+
+        if job.data is None:
+            job.data = job.loader(job.sale_id)
+            if not job.data:
+                raise LookupError(f"No sale #{job.sale_id} in the database")
+
+        if self._escpos:
+            rendered = self._renderer.render(job.data)
+        else:
+            buffer = io.BytesIO()
+            self._renderer.render(job.data, buffer)
+            rendered = buffer.getvalue()
+
+        if job.sale_id is not None:
+            with self._lock:
+                self._recent[job.sale_id] = rendered
+                while len(self._recent) > self.RECENT_RENDERS:
+                    self._recent.popitem(last=False)
+        return rendered
+
+    def _deliver(self, job, rendered):
+        if self._escpos:
+            job.path = self.config.get('printer_target')
+            send_to_printer(rendered, job.path)
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        job.path = job.path or self.receipt_path(job.sale_id)
+        with open(job.path, 'wb') as f:
+            f.write(rendered)
+        self._renderer.launch_viewer(job.path)
+        self._prune_spool()
+
+    def _prune_spool(self):
+        try:
+            files = sorted((os.path.join(self.output_dir, name) for name in os.listdir(self.output_dir)
+                            if name.startswith('receipt_') and name.endswith('.pdf')),
+                           key=os.path.getmtime)
+            for old in files[:-self.SPOOL_KEEP]:
+                os.remove(old)
+        except OSError as e:
+            print(f"Receipt spool cleanup failed: {e}")
+
+    def _process(self, job):
+        while job.attempts < self.max_retries:
+            job.attempts += 1
+            try:
+                self._deliver(job, self._render(job))
+                job.error = None
+                for callback in list(self.on_printed): callback(job)
+                return
+            except Exception as e:
+                job.error = e
+                print(f"Receipt attempt {job.attempts} failed for {job.label}: {e}")
+                if job.attempts < self.max_retries:
+                    time.sleep(self.retry_delay * job.attempts)  # no wait after the last try
+
+        with self._lock:
+            self.failed.append(job)
+        for callback in list(self.on_failed): callback(job)
+
+
+_shared_queue = None
+
+
+def get_receipt_queue():
+    """One worker per process, shared by every cashier window."""
+    global _shared_queue
+    if _shared_queue is None:
+        _shared_queue = ReceiptQueue()
+    return _shared_queue
@@ -0,0 +1,104 @@
+import os
+
+from models.report_cache import report_cache
+from utils.report_exporter import export_csv, export_xlsx
+
+# NOTE: no PyQt imports here, this module is shared by the report dialog and report_cli.py
+
+REPORT_TYPES = ["All Reports", "Sales Report", "Inventory Valuation", "Low Stock Alert", "Audit Logs"]
+
+# Which data each report is built from (decides what invalidates a cached PDF)
+REPORT_KINDS = {
+    "All Reports": ('sales', 'inventory', 'audit'),
+    "Sales Report": ('sales',),
+    "Inventory Valuation": ('inventory',),
+    "Low Stock Alert": ('inventory',),
+    "Audit Logs": ('audit',),
+}
+
+# Report -> (stream name, sheet / file suffix) for the raw CSV/XLSX exports
+REPORT_STREAMS = {
+    "All Reports": [('sales', "Sales"), ('valuation', "Valuation"), ('low_stock', "Low Stock"), ('audit', "Audit Logs")],
+    "Sales Report": [('sales', "Sales")],
+    "Inventory Valuation": [('valuation', "Valuation")],
+    "Low Stock Alert": [('low_stock', "Low Stock")],
+    "Audit Logs": [('audit', "Audit Logs")],
+}
+
+FORMATS = ['pdf', 'csv', 'xlsx']
+
+
+def build_pdf_report(db, rpt_type, start, end, file_path):
+    """
+    Writes the requested report to file_path.
+    :param db: ManagerDB (anything with the get_*_data methods)
+    :param start, end: 'yyyy-MM-dd' strings
+    :return: True if the file was written
+    """
+    if rpt_type not in REPORT_KINDS:
+        raise ValueError(f"Unknown report type: {rpt_type}")
+
+    # Same report, same range, nothing changed since -> reuse the rendered PDF
+    pdf_key = ('pdf', rpt_type, start, end)
+    cached_pdf = report_cache.get(pdf_key)
+    if cached_pdf is not None:
+        try:
+            with open(file_path, 'wb') as f:
+                f.write(cached_pdf)
+            return True
+        except OSError as e:
+            print(f"Cached report write failed, rebuilding: {e}")
+
+    # ReportLab is heavy, load it when a PDF is actually built (not at app startup)
+    from utils.pdf_generator import PDFReportGenerator
+    gen = PDFReportGenerator(file_path)
+
+    #GENERATE EVERYTHING
+    if rpt_type in ("All Reports", "Sales Report"):
+        gen.add_sales_section(db.get_sales_report_data(start, end), start, end)
+    if rpt_type in ("All Reports", "Inventory Valuation"):
+        gen.add_inventory_section(db.get_inventory_valuation_data(), "Valuation")
+    if rpt_type in ("All Reports", "Low Stock Alert"):
+        gen.add_inventory_section(db.get_low_stock_data(), "LowStock")
+    if rpt_type in ("All Reports", "Audit Logs"):
+        gen.add_audit_section(db.get_audit_log_data(start, end), start, end)
+
+    #Finalize and Write File
+    if not gen.build():
+        return False
+
+    with open(file_path, 'rb') as f:
+        report_cache.put(pdf_key, f.read(), REPORT_KINDS[rpt_type], start, end)
+    return True
+
+
+def export_report(db, rpt_type, start, end, file_path, fmt='pdf'):
+    """
+    Exports a report as 'pdf', 'csv' or 'xlsx'.
+    CSV has no sheets, so multi-section reports write one file per section (<name>_<section>.csv).
+    :return: list of the files actually written (empty if nothing was)
+    """
+    if fmt == 'pdf':
+        return [file_path] if build_pdf_report(db, rpt_type, start, end, file_path) else []
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    streams = REPORT_STREAMS[rpt_type]
+
+    if fmt == 'xlsx':
+        sheets = [(title, db.stream_report_rows(name, start, end)) for name, title in streams]
+        export_xlsx(sheets, file_path)
+        return [file_path]
+
+    # CSV
+    if len(streams) == 1:
+        export_csv(db.stream_report_rows(streams[0][0], start, end), file_path)
+        return [file_path]
+
+    stem, ext = os.path.splitext(file_path)
+    written = []
+    for name, title in streams:
+        section_path = f"{stem}_{title.replace(' ', '_')}{ext or '.csv'}"
+        export_csv(db.stream_report_rows(name, start, end), section_path)
+        written.append(section_path)
+    return written
@@ -0,0 +1,42 @@
+import csv
+
+
+def export_csv(rows, file_path):
+    """
+    Writes rows (header first, as yielded by ManagerDB.stream_report_rows) to a CSV file.
+    Rows are written one at a time, nothing is held in memory.
+    :return: number of data rows written
+    """
+    count = -1  # first row is the header
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return max(count, 0)
+
+
+def export_xlsx(sheets, file_path):
+    """
+    Writes several row streams into one workbook, one sheet each.
+    Uses openpyxl's write-only mode so rows go straight to disk.
+    :param sheets: list of (sheet title, rows) pairs
+    :return: total number of data rows written
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("Excel export needs openpyxl (pip install openpyxl)")
+
+    wb = Workbook(write_only=True)
+    total = 0
+    for title, rows in sheets:
+        ws = wb.create_sheet(title=title[:31])  # Excel caps sheet names at 31 chars
+        count = -1
+        for row in rows:
+            ws.append(list(row))
+            count += 1
+        total += max(count, 0)
+
+    wb.save(file_path)
+    return total
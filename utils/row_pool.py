@@ -0,0 +1,69 @@
+from PyQt6 import uic
+
+
+class RowPool:
+    """
+    Recycles list row widgets (item_*.ui) between refreshes instead of deleteLater() +
+    uic.loadUi() for every row. release() takes the rows out of a layout and parks them
+    hidden per .ui file; acquire() hands one back (or loads a new one) for rebinding.
+    Signals on a recycled row keep their old connections, so rebind them with reconnect().
+    """
+
+    def __init__(self, max_per_type=200):
+        self.max_per_type = max_per_type
+        self._free = {}  # ui_path -> [row widgets]
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, ui_path):
+        free = self._free.get(ui_path)
+        if free:
+            self.reused += 1
+            return free.pop()
+
+        self.created += 1
+        row = uic.loadUi(ui_path)
+        row._pool_ui = ui_path
+        return row
+
+    def add(self, layout, row, index=None):
+        """Puts a row into a layout and makes sure a recycled (hidden) row shows again."""
+        if index is None:
+            layout.addWidget(row)
+        else:
+            layout.insertWidget(index, row)
+        row.show()
+
+    def release(self, layout, keep=0):
+        """Empties the layout except its last `keep` items (a bottom spacer, usually)."""
+        while layout.count() > keep:
+            item = layout.takeAt(0)
+            row = item.widget()
+            if not row:
+                continue  # spacer etc.
+
+            ui_path = getattr(row, '_pool_ui', None)
+            free = self._free.setdefault(ui_path, []) if ui_path else None
+            if free is None or len(free) >= self.max_per_type:
+                row.deleteLater()
+                continue
+            row.hide()
+            free.append(row)
+
+    @staticmethod
+    def reconnect(signal, slot):
+        """Drops whatever a previous binding connected and connects slot."""
+        try:
+            signal.disconnect()
+        except TypeError:
+            pass  # nothing connected yet
+        signal.connect(slot)
+
+    def stats(self):
+        total = self.created + self.reused
+        return {'pooled': sum(len(rows) for rows in self._free.values()),
+                'created': self.created, 'reused': self.reused,
+                'reuse_rate': self.reused / total if total else 0.0}
+
+
+row_pool = RowPool()
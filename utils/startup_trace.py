@@ -0,0 +1,33 @@
+import os
+import time
+
+# Process start reference: import this module as early as possible (first thing in main.py)
+_T0 = time.perf_counter()
+
+
+class StartupTrace:
+    """
+    Time-to-interactive breakdown. Enable with SHELFSYNC_TRACE_STARTUP=1, then each
+    report() prints how long every phase took since the previous mark.
+    """
+
+    def __init__(self):
+        self.enabled = os.environ.get('SHELFSYNC_TRACE_STARTUP') == '1'
+        self.marks = []  # (phase, seconds since process start)
+        self._last = 0.0
+
+    def mark(self, phase):
+        if self.enabled:
+            self.marks.append((phase, time.perf_counter() - _T0))
+
+    def report(self, title="Startup"):
+        if not self.enabled or not self.marks:
+            return
+        print(f"--- {title} trace (ms) ---")
+        for phase, at in self.marks:
+            print(f"  {phase:<28}{(at - self._last) * 1000:9.1f}   @ {at * 1000:8.1f}")
+            self._last = at
+        self.marks.clear()
+
+
+trace = StartupTrace()
@@ -0,0 +1,51 @@
+import json
+import os
+import socket
+
+# Per-terminal settings. Override in terminal.json (next to main.py) or with env vars:
+#   SHELFSYNC_RECEIPT_MODE=escpos  SHELFSYNC_PRINTER=tcp://192.168.1.50:9100
+DEFAULTS = {
+    'terminal_id': socket.gethostname(),
+    'receipt_mode': 'pdf',              # 'pdf' (viewer) or 'escpos' (raw bytes to a thermal printer)
+    'printer_target': '/dev/usb/lp0',   # device path, plain file, or tcp://host:port
+    'printer_columns': 48,              # characters per line (Font A on 80 mm paper)
+    'pin_iterations': 60000,            # PBKDF2 cost for new cashier PINs (stored per hash)
+    'ledger_checkpoint_hours': 24,      # stock ledger: checkpoint when the last one is older than this
+    'ledger_keep_days': 90,             # stock ledger: movements older than this are folded into checkpoints
+    'ledger_check_minutes': 60,         # how often a running app checks whether ledger maintenance is due
+    'catalog_poll_seconds': 15,         # how often a till picks up price/stock changes from elsewhere
+    'db_pool_size': 4,                  # pooled connections for units of work (sales, product edits)
+}
+
+ENV_OVERRIDES = {
+    'SHELFSYNC_RECEIPT_MODE': 'receipt_mode',
+    'SHELFSYNC_PRINTER': 'printer_target',
+}
+
+_config = None
+
+
+def load_terminal_config(path=None, reload=False):
+    """Returns the merged terminal settings (defaults < terminal.json < env). Cached after the first call."""
+    global _config
+    if _config is not None and not reload and path is None:
+        return _config
+
+    config = dict(DEFAULTS)
+    if path is None:
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        path = os.path.join(base_path, 'terminal.json')
+
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                config.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"Error reading {path}, using defaults: {e}")
+
+    for env_name, key in ENV_OVERRIDES.items():
+        if os.environ.get(env_name):
+            config[key] = os.environ[env_name]
+
+    _config = config
+    return config
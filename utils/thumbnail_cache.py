@@ -0,0 +1,137 @@
+import hashlib
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+
+
+class ThumbnailCache(QObject):
+    """
+    Product thumbnails in two levels:
+      1. memory: LRU of ready QPixmaps (GUI thread only)
+      2. disk:   pre-scaled PNGs in thumbs/, named by a hash of path + mtime + file size +
+                 thumbnail size (one os.stat, the image itself is only read on a disk miss),
+                 so an edited or replaced image gets a new thumbnail
+    Misses are decoded and scaled on a background thread (QImage is thread safe, QPixmap
+    is not) and handed back through the `ready` signal, which Qt delivers on the GUI thread.
+    """
+
+    ready = pyqtSignal(object, QImage)  # key, image (queued to the GUI thread)
+
+    MEMORY_ENTRIES = 300
+
+    def __init__(self, cache_dir=None):
+        super().__init__()
+        base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.cache_dir = cache_dir or os.path.join(base_path, 'thumbs')
+        self.hits = 0
+        self.misses = 0
+
+        self._pixmaps = OrderedDict()  # key -> QPixmap
+        self._waiting = {}             # key -> [callback(QPixmap)] for in-flight decodes
+        self._jobs = queue.Queue()
+        self.ready.connect(self._on_ready)
+        self._worker = threading.Thread(target=self._run, name="thumbnail-worker", daemon=True)
+        self._worker.start()
+
+    @staticmethod
+    def make_key(path, size):
+        # mtime in the key: replacing the file on disk invalidates the memory entry too
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        return (path, mtime, size)
+
+    def request(self, path, size, callback):
+        """
+        Calls callback(QPixmap) with a `size` x `size` (device px) thumbnail: right away on a
+        memory hit, later (on the GUI thread) otherwise. Nothing is called if the file can't be read.
+        """
+        key = self.make_key(path, size)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            self.hits += 1
+            callback(pixmap)
+            return
+
+        self.misses += 1
+        if key in self._waiting:
+            self._waiting[key].append(callback)  # already being decoded
+            return
+        self._waiting[key] = [callback]
+        self._jobs.put(key)
+
+    def stats(self):
+        return {'entries': len(self._pixmaps), 'pending': len(self._waiting),
+                'hits': self.hits, 'misses': self.misses}
+
+    # --- GUI thread ---
+
+    def _on_ready(self, key, image):
+        callbacks = self._waiting.pop(key, [])
+        if image.isNull():
+            return
+
+        pixmap = QPixmap.fromImage(image)
+        self._pixmaps[key] = pixmap
+        while len(self._pixmaps) > self.MEMORY_ENTRIES:
+            self._pixmaps.popitem(last=False)
+
+        for callback in callbacks:
+            try:
+                callback(pixmap)
+            except RuntimeError:
+                pass  # card was deleted (grid repopulated) while we were decoding
+
+    # --- worker ---
+
+    def _run(self):
+        while True:
+            key = self._jobs.get()
+            try:
+                image = self._load(key)
+            except Exception as e:
+                print(f"Thumbnail failed for {key[0]}: {e}")
+                image = QImage()
+            self.ready.emit(key, image)
+
+    def _load(self, key):
+        path, _, size = key
+        stat = os.stat(path)
+        digest = hashlib.sha1(f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}".encode()).hexdigest()
+        thumb_path = os.path.join(self.cache_dir, f"{digest}_{size}.png")
+
+        # Disk hit: already scaled, just decode the small file
+        if os.path.exists(thumb_path):
+            image = QImage(thumb_path)
+            if not image.isNull():
+                return image
+
+        image = QImage(path)
+        if image.isNull():
+            return image
+        image = image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                             Qt.TransformationMode.SmoothTransformation)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            image.save(thumb_path, 'PNG')
+        except OSError as e:
+            print(f"Could not write thumbnail {thumb_path}: {e}")
+        return image
+
+
+_shared_cache = None
+
+
+def get_thumbnail_cache():
+    """One cache (and one decode thread) per process. Create it after the QApplication."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ThumbnailCache()
+    return _shared_cache
@@ -3,6 +3,44 @@ from PyQt6.QtWidgets import QGraphicsDropShadowEffect, QWidget, QLabel, QFrame,
 from PyQt6.QtCore import QObject, QEvent, QPropertyAnimation, QEasingCurve, QPoint, Qt, QSize
 from PyQt6.QtGui import QColor, QPainter, QBrush, QIcon, QGuiApplication, QPixmap
 import os
+from collections import OrderedDict
+
+
+# App-wide stylesheet (set once in main.py). Status badges are styled by their dynamic
+# "badge" property, so a row only sets a property instead of parsing its own CSS.
+APP_STYLESHEET = """
+QWidget#ProductCard { background-color: transparent; border: none; }
+
+QLabel[badge] { font-weight: bold; border: none; }
+QLabel#lbl_status[badge] { font-size: 11px; border-radius: 12px; }
+QLabel#lbl_action[badge] { font-size: 11px; border-radius: 13px; }
+QLabel#lbl_stock[badge] { font-size: 10px; border-radius: 4px; padding: 2px; }
+
+QLabel[badge="in_stock"] { background-color: #ECFDF5; color: #059669; }
+QLabel#lbl_stock[badge="in_stock"] { background-color: #ECFEFF; color: #0E7490; }
+QLabel[badge="low_stock"] { background-color: #FEF3C7; color: #D97706; }
+QLabel[badge="out_of_stock"] { background-color: #FEE2E2; color: #DC2626; }
+QLabel[badge="expired"] { background-color: #EF4444; color: white; }
+QLabel[badge="discount"] { background-color: #FBBF24; color: #475569; }
+QLabel[badge="check"] { background-color: #E2E8F0; color: #475569; }
+
+QPushButton[chip="true"] {
+    background-color: white; color: #64748B; border: 1px solid #E2E8F0;
+    border-radius: 14px; padding: 4px 14px; font-size: 12px; font-weight: 600;
+}
+QPushButton[chip="true"]:hover { background-color: #F8FAFC; }
+QPushButton[chip="true"]:checked { background-color: #06B6D4; color: white; border: none; }
+"""
+
+
+def set_badge(label, state):
+    """Switches a badge label to another APP_STYLESHEET state (one re-polish, only if it changed)."""
+    if label.property('badge') == state:
+        return
+    label.setProperty('badge', state)
+    style = label.style()
+    style.unpolish(label)
+    style.polish(label)
 
 
 class Overlay(QWidget):
@@ -31,51 +69,121 @@ def add_drop_shadow(widget, blur=20, y_offset=5, color_alpha=30, hex_color="#000
     widget.setGraphicsEffect(shadow)
 
 
-# --- UPDATED SET_ICON WITH COLOR SUPPORT ---
-def set_icon(widget, icon_name, size=20, color=None):
+class PixmapCache:
     """
-    Sets an icon on a QLabel or QPushButton.
-    Supports recoloring (tinting) the icon.
+    Process-wide cache of loaded, tinted and scaled icons, keyed by
+    (path, color, size, devicePixelRatio). Least recently used entries are dropped
+    past max_entries. Sidebar hovers and per-row audit icons hit this instead of
+    reading and repainting the file every time.
     """
-    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    icon_path = os.path.join(base_path, 'assets', 'icons', icon_name)
 
-    if not os.path.exists(icon_path):
-        print(f"Warning: Icon not found at {icon_path}")
-        return
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._pixmaps = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def pixmap(self, path, size=None, color=None, dpr=1.0):
+        """Returns the icon at `path`, tinted to `color` and scaled to `size` logical px (None = as is)."""
+        key = (path, color, size, dpr)
+        cached = self._pixmaps.get(key)
+        if cached is not None:
+            self._pixmaps.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        pixmap = self._render(path, size, color, dpr)
+        self._pixmaps[key] = pixmap
+        while len(self._pixmaps) > self.max_entries:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def icon(self, path, size=None, color=None, dpr=1.0):
+        if size is None and color is None:
+            # plain file: let QIcon keep the SVG scalable, but still only load it once
+            key = (path, None, 'icon', dpr)
+            cached = self._pixmaps.get(key)
+            if cached is not None:
+                self._pixmaps.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+            icon = QIcon(path)
+            self._pixmaps[key] = icon
+            while len(self._pixmaps) > self.max_entries:
+                self._pixmaps.popitem(last=False)
+            return icon
+        return QIcon(self.pixmap(path, size, color, dpr))
+
+    def stats(self):
+        return {'entries': len(self._pixmaps), 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        self._pixmaps.clear()
+
+    @staticmethod
+    def _render(path, size, color, dpr):
+        # 1. Load the original Pixmap
+        pixmap = QPixmap(path)
+
+        # 2. Apply Color Tint (if color is provided)
+        if color:
+            # Create a blank transparent pixmap of the same size
+            colored_pixmap = QPixmap(pixmap.size())
+            colored_pixmap.fill(Qt.GlobalColor.transparent)
+
+            painter = QPainter(colored_pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.drawPixmap(0, 0, pixmap)
+
+            # Change composition mode to keep alpha but change color
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+            painter.fillRect(colored_pixmap.rect(), QColor(color))
+            painter.end()
+            pixmap = colored_pixmap
+
+        # 3. Scale it smoothly to the requested size (in device pixels on HiDPI screens)
+        if size:
+            device_size = round(size * dpr)
+            pixmap = pixmap.scaled(
+                device_size, device_size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            pixmap.setDevicePixelRatio(dpr)
+        return pixmap
+
+
+icon_cache = PixmapCache()
+
+
+def icon_path(icon_name, folder='icons'):
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, 'assets', folder, icon_name)
 
-    # 1. Load the original Pixmap
-    pixmap = QPixmap(icon_path)
 
-    # 2. Apply Color Tint (if color is provided)
-    if color:
-        # Create a blank transparent pixmap of the same size
-        colored_pixmap = QPixmap(pixmap.size())
-        colored_pixmap.fill(Qt.GlobalColor.transparent)
+def cached_icon(path, size=None, color=None, widget=None):
+    """QIcon for a file path, through icon_cache."""
+    dpr = widget.devicePixelRatioF() if widget is not None else 1.0
+    return icon_cache.icon(path, size, color, dpr)
 
-        # Initialize Painter
-        painter = QPainter(colored_pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        # Draw the original icon
-        painter.drawPixmap(0, 0, pixmap)
-
-        # Change composition mode to keep alpha but change color
-        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
-        painter.fillRect(colored_pixmap.rect(), QColor(color))
-        painter.end()
+# --- UPDATED SET_ICON WITH COLOR SUPPORT ---
+def set_icon(widget, icon_name, size=20, color=None):
+    """
+    Sets an icon on a QLabel or QPushButton.
+    Supports recoloring (tinting) the icon. Rendered icons come from icon_cache.
+    """
+    path = icon_path(icon_name)
 
-        # Replace original with colored version
-        pixmap = colored_pixmap
+    if not os.path.exists(path):
+        print(f"Warning: Icon not found at {path}")
+        return
 
-    # 3. Scale it smoothly to the requested size
-    scaled_pixmap = pixmap.scaled(
-        size, size,
-        Qt.AspectRatioMode.KeepAspectRatio,
-        Qt.TransformationMode.SmoothTransformation
-    )
+    scaled_pixmap = icon_cache.pixmap(path, size, color, widget.devicePixelRatioF())
 
-    # 4. Apply to Widget
+    # Apply to Widget
     if isinstance(widget, QLabel):
         # QLabel Logic
         widget.setText("")
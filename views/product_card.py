@@ -1,9 +1,11 @@
 # views/product_card.py
-from PyQt6.QtWidgets import QWidget
+from PyQt6.QtWidgets import QWidget, QLabel
 from PyQt6 import uic
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import pyqtSignal, Qt
 import os
 
+THUMB_SIZE = 36  # logical px, the thumbnail sits left of the name
+
 
 class ProductCard(QWidget):
     # Signal that emits the product ID (int) when the card is clicked
@@ -36,9 +38,14 @@ class ProductCard(QWidget):
         if hasattr(self, 'lbl_stock'):
             self.lbl_stock.setText(f"{self.product.stock} left")
 
-            # Low stock warning (Red text)
-            if self.product.stock <= 5:
-                self.lbl_stock.setStyleSheet("color: #EF4444; font-weight: bold;")
+        # Thumbnail slot only for products that have an image (filled later, when visible)
+        if getattr(self.product, 'image_path', None) and hasattr(self, 'hbox_header'):
+            self.lbl_image = QLabel(self)
+            self.lbl_image.setObjectName("lbl_image")
+            self.lbl_image.setFixedSize(THUMB_SIZE, THUMB_SIZE)
+            self.lbl_image.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.lbl_image.setStyleSheet("background-color: #F1F5F9; border: none; border-radius: 6px;")
+            self.hbox_header.insertWidget(0, self.lbl_image)
 
         # 3. Connect the Button
         # This is the critical fix: We connect to a custom method, NOT directly to emit